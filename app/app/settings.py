@@ -46,6 +46,11 @@ RECOMMENDER_CONTENT_MODEL_PATH = os.getenv("RECOMMENDER_CONTENT_MODEL_PATH")
 
 RECOMMENDER_DATA_PATH = os.getenv("RECOMMENDER_DATA_PATH")
 RECOMMENDER_MODEL_PATH = os.path.join(BASE_DIR, "recommender/models")
+RECOMMENDER_SNAPSHOT_PATH = os.getenv(
+    "RECOMMENDER_SNAPSHOT_PATH", os.path.join(BASE_DIR, "recommender/snapshot")
+)
+# Artifacts are verified when published; set to re-hash them in every worker
+RECOMMENDER_VERIFY_ARTIFACTS = env.bool("RECOMMENDER_VERIFY_ARTIFACTS", default=False)
 
 
 # Application definition
@@ -140,6 +145,14 @@ DATABASES = {
     },
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Shared by every worker process; run createcachetable for the default
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="dbcache://recommender_cache"),
+}
+
 LOGIN_URL = "/login/"
 LOGIN_REDIRECT_URL = "/dashboard/"
 LOGOUT_REDIRECT_URL = "/login/"
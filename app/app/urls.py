@@ -40,6 +40,7 @@ urlpatterns = [
     path("api/tag/", include("tag.urls")),
     path("api/links/", include("links.urls")),
     path("api/chatbot/", include("chatbot.urls")),
+    path("api/recommendations/", include("recommender.urls")),
     path("__reload__/", include("django_browser_reload.urls")),
 ]
 
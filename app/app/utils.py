@@ -1,7 +1,7 @@
 # movies/utils.py
 import requests
 from django.conf import settings
-import pickle
+from core.registry import load_trained_models
 
 
 def fetch_movie_poster(imdb_id):
@@ -44,18 +44,10 @@ def get_openai_key():
 
 def load_models():
     """
-    Load saved models from the paths specified in settings.
+    Load saved model artifacts from the paths specified in settings.
     """
 
-    content_model_path = settings.RECOMMENDER_CONTENT_MODEL_PATH
-    collaborative_model_path = settings.RECOMMENDER_COLLABORATIVE_MODEL_PATH
-
-    # Load content-based model
-    with open(content_model_path, "rb") as f:
-        content_based_model = pickle.load(f)
-
-    # Load collaborative filtering model
-    with open(collaborative_model_path, "rb") as f:
-        collaborative_model = pickle.load(f)
-
-    return content_based_model, collaborative_model
+    return load_trained_models(
+        settings.RECOMMENDER_CONTENT_MODEL_PATH,
+        settings.RECOMMENDER_COLLABORATIVE_MODEL_PATH,
+    )
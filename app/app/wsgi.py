@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_wsgi_application()
+
+# Load the trained models before the first request, so forked
+# workers (e.g. gunicorn --preload) share them from the start.
+if os.environ.get("RECOMMENDER_PRELOAD", "").lower() in ("1", "true", "yes"):
+    from core.registry import registry
+
+    registry.get_recommender()
@@ -111,7 +111,7 @@ class ChatbotViewSet(
 
         try:
 
-            # Load the trained recommender system
+            # Trained recommender shared by this worker process
             recommender = load_trained_recommender()
 
             # Content-based recommendations
@@ -121,10 +121,9 @@ class ChatbotViewSet(
 
             # Collaborative recommendations (if user is authenticated)
             collaborative_recommendations = []
-            if user_id:
-                svd_model, _ = recommender.collaborative_filtering()
+            if user_id and recommender.svd_model is not None:
                 collaborative_recommendations = recommender.recommend_movies(
-                    user_id=user_id, svd_model=svd_model, top_n=5
+                    user_id=user_id, svd_model=recommender.svd_model, top_n=5
                 )
 
             # Create chat history
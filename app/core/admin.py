@@ -60,3 +60,4 @@ admin.site.register(models.Ratings)
 admin.site.register(models.Tags)
 admin.site.register(models.Links)
 admin.site.register(models.ChatHistory)
+admin.site.register(models.UserRecommendation)
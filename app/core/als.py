@@ -0,0 +1,205 @@
+"""
+Alternating least squares trainer for the factor model.
+
+Fits the same biased model Surprise SVD does,
+est(u, i) = global_mean + bu[u] + bi[i] + qi[i] . pu[u],
+but by alternately solving every user against fixed item
+factors and every item against fixed user factors. Each
+row solve is independent, so a half-step is split into
+row blocks across a pool of worker processes.
+
+The ratings (both CSR orientations) and the factor arrays
+live in memory-mapped .npy files in a scratch directory.
+Workers map them once, read the fixed side in place and
+write their block of the solved side straight back, so
+nothing large is pickled between processes.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.foldin import solve_vector
+from core.scoring import FactorModel
+
+ALS_FACTORS = 64
+ALS_REG = 0.05
+ALS_ITERATIONS = 10
+BLOCK_ROWS = 2048
+
+SIDES = {"user": "item", "item": "user"}
+
+# Memory-mapped arrays shared with pool workers, set once by the initializer
+_worker_arrays = None
+
+
+def solve_block(arrays, side, start, stop, global_mean, reg):
+    """
+    Solve rows start:stop of one side against the
+    current factors of the other side, in place.
+    """
+
+    other = SIDES[side]
+    indptr = arrays[f"{side}_indptr"]
+    indices = arrays[f"{side}_indices"]
+    data = arrays[f"{side}_data"]
+    fixed_factors = arrays[f"{other}_factors"]
+    fixed_bias = arrays[f"{other}_bias"]
+    factors = arrays[f"{side}_factors"]
+    bias = arrays[f"{side}_bias"]
+
+    for row in range(start, stop):
+        row_start, row_stop = indptr[row], indptr[row + 1]
+        if row_start == row_stop:
+            factors[row], bias[row] = 0.0, 0.0
+            continue
+
+        cols = indices[row_start:row_stop]
+        factors[row], bias[row] = solve_vector(
+            fixed_factors[cols], fixed_bias[cols], global_mean, data[row_start:row_stop], reg
+        )
+
+
+def _init_worker(workdir):
+    global _worker_arrays
+    _worker_arrays = {
+        name[: -len(".npy")]: np.load(os.path.join(workdir, name), mmap_mode="r+")
+        for name in os.listdir(workdir)
+    }
+
+
+def _worker_solve(task):
+    solve, args = task
+    solve(_worker_arrays, *args)
+
+
+def _memmap_arrays(arrays, workdir):
+    """
+    Copy arrays into .npy files and return them memory-mapped.
+    """
+
+    mapped = {}
+    for name, array in arrays.items():
+        path = os.path.join(workdir, f"{name}.npy")
+        mapped[name] = np.lib.format.open_memmap(
+            path, mode="w+", dtype=array.dtype, shape=array.shape
+        )
+        mapped[name][:] = array
+    return mapped
+
+
+def csr_arrays(interactions):
+    """
+    Return the user-major and item-major CSR arrays
+    of an InteractionMatrix, keyed by side.
+    """
+
+    user_matrix = interactions.matrix.astype(np.float32)
+    item_matrix = user_matrix.T.tocsr()
+    item_matrix.sort_indices()
+
+    arrays = {}
+    for side, matrix in (("user", user_matrix), ("item", item_matrix)):
+        arrays[f"{side}_indptr"] = matrix.indptr
+        arrays[f"{side}_indices"] = matrix.indices
+        arrays[f"{side}_data"] = matrix.data
+    return arrays
+
+
+def alternate(arrays, half_step_tasks, n_iters, n_jobs, outputs):
+    """
+    Run n_iters sweeps of users then items. half_step_tasks
+    (arrays, side) returns the (solve, args) tasks of one
+    half-step; each solve(arrays, *args) updates a block
+    in place. Returns copies of the named output arrays.
+    """
+
+    if n_jobs <= 1:
+        for _ in range(n_iters):
+            for side in SIDES:
+                for solve, args in half_step_tasks(arrays, side):
+                    solve(arrays, *args)
+        return {name: arrays[name] for name in outputs}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        arrays = _memmap_arrays(arrays, workdir)
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_worker, initargs=(workdir,)
+        ) as executor:
+            for _ in range(n_iters):
+                # Users must be solved before items start reading them
+                for side in SIDES:
+                    list(executor.map(_worker_solve, half_step_tasks(arrays, side)))
+
+        # Copy the solved factors out before the scratch files go
+        return {name: np.array(arrays[name]) for name in outputs}
+
+
+def row_blocks(n_rows, block_rows):
+    """
+    Split range(n_rows) into (start, stop) blocks.
+    """
+
+    return [
+        (start, min(start + block_rows, n_rows))
+        for start in range(0, n_rows, block_rows)
+    ]
+
+
+def train_als(
+    interactions,
+    n_factors=ALS_FACTORS,
+    reg=ALS_REG,
+    n_iters=ALS_ITERATIONS,
+    n_jobs=None,
+    block_rows=BLOCK_ROWS,
+    seed=0,
+    rating_scale=(1, 5),
+):
+    """
+    Fit a FactorModel to an InteractionMatrix by biased ALS,
+    solving row blocks across n_jobs worker processes.
+    """
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    rng = np.random.default_rng(seed)
+    n_users, n_items = interactions.shape
+    arrays = csr_arrays(interactions)
+    data = arrays["user_data"]
+    global_mean = float(data.mean()) if len(data) else 0.0
+
+    arrays.update(
+        {
+            "user_factors": np.zeros((n_users, n_factors), dtype=np.float32),
+            "user_bias": np.zeros(n_users, dtype=np.float32),
+            "item_factors": rng.normal(0, 0.1, (n_items, n_factors)).astype(np.float32),
+            "item_bias": np.zeros(n_items, dtype=np.float32),
+        }
+    )
+    blocks = {"user": row_blocks(n_users, block_rows), "item": row_blocks(n_items, block_rows)}
+
+    def half_step_tasks(arrays, side):
+        return [
+            (solve_block, (side, start, stop, global_mean, reg))
+            for start, stop in blocks[side]
+        ]
+
+    arrays = alternate(
+        arrays,
+        half_step_tasks,
+        n_iters,
+        n_jobs,
+        ("user_factors", "user_bias", "item_factors", "item_bias"),
+    )
+    return FactorModel(
+        interactions.users,
+        interactions.items,
+        arrays["user_factors"],
+        arrays["item_factors"],
+        arrays["user_bias"],
+        arrays["item_bias"],
+        global_mean,
+        rating_scale,
+    )
@@ -0,0 +1,150 @@
+"""
+Pickle-free, memory-mappable model artifacts.
+
+An artifact is a directory holding one .npy file per
+array plus a manifest.json describing the format
+version, the artifact kind, free-form metadata and the
+dtype, shape and SHA-256 checksum of every array.
+Arrays are opened with mmap so worker processes start
+fast and share the same pages from the OS page cache.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+import numpy as np
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def file_sha256(filename, chunk_size=1024 * 1024):
+    """
+    Return the hex SHA-256 digest of a file.
+    """
+
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_artifact(path, kind, arrays, meta=None):
+    """
+    Save a dict of NumPy arrays and JSON metadata
+    as an artifact directory at path.
+    """
+
+    os.makedirs(path, exist_ok=True)
+
+    entries = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        filename = f"{name}.npy"
+        array_path = os.path.join(path, filename)
+        np.save(array_path, array, allow_pickle=False)
+        entries[name] = {
+            "file": filename,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "sha256": file_sha256(array_path),
+        }
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "kind": kind,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "meta": meta or {},
+        "arrays": entries,
+    }
+
+    # Written last, so a readable manifest means a complete artifact
+    tmp_path = os.path.join(path, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+
+
+class Artifact:
+    """
+    A loaded artifact: its manifest and arrays.
+    """
+
+    def __init__(self, path, manifest, arrays):
+        self.path = path
+        self.manifest = manifest
+        self.arrays = arrays
+
+    @property
+    def kind(self):
+        return self.manifest["kind"]
+
+    @property
+    def meta(self):
+        return self.manifest["meta"]
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __contains__(self, name):
+        return name in self.arrays
+
+
+def read_manifest(path):
+    """
+    Read and validate the manifest of an artifact directory.
+    """
+
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No model artifact found at {path}.")
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact format version "
+            f"{manifest.get('format_version')} at {path}."
+        )
+    return manifest
+
+
+def verify_artifact(path):
+    """
+    Check every array file of an artifact directory
+    against its manifest checksum. Reads every byte,
+    so do it once at publish time, not per worker.
+    """
+
+    manifest = read_manifest(path)
+    for name, entry in manifest["arrays"].items():
+        if file_sha256(os.path.join(path, entry["file"])) != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch for '{name}' in {path}.")
+    return manifest
+
+
+def load_artifact(path, kind=None, mmap=True, verify=False):
+    """
+    Load an artifact directory. Arrays are memory-mapped
+    read-only unless mmap is False; verify checks every
+    file against its manifest checksum first.
+    """
+
+    manifest = verify_artifact(path) if verify else read_manifest(path)
+    if kind is not None and manifest["kind"] != kind:
+        raise ValueError(
+            f"Expected a '{kind}' artifact at {path}, found '{manifest['kind']}'."
+        )
+
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        array_path = os.path.join(path, entry["file"])
+        array = np.load(array_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        if array.dtype.str != entry["dtype"] or list(array.shape) != entry["shape"]:
+            raise ValueError(f"Array '{name}' in {path} does not match its manifest.")
+        arrays[name] = array
+
+    return Artifact(path, manifest, arrays)
@@ -0,0 +1,128 @@
+"""
+Batch precomputation of top-N recommendations.
+
+Every user of a factor model is scored in chunks: one
+GEMM of the chunk's user factors against all item
+factors, the chunk's rated movies masked out through the
+CSR index, and a row-wise argpartition for the top N.
+Chunks are spread over a process pool whose workers
+memory-map the model artifact once, so only the small
+per-chunk exclusion lists travel between processes.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.scoring import FactorModel
+
+BATCH_TOP_N = 100
+CHUNK_USERS = 1024
+
+# Factor model shared with pool workers, set once by the initializer
+_worker_model = None
+
+
+def score_chunk(model, user_idx, exclude_indptr, exclude_indices, top_n):
+    """
+    Return (item indices, scores) of the top_n items for
+    the given model users, best first, as 2-d arrays.
+    Rows with fewer candidates are padded with -1 / -inf.
+    """
+
+    scores = model.user_factors[user_idx] @ model.item_factors.T
+    scores += model.item_bias
+    scores += (model.global_mean + model.user_bias[user_idx])[:, None]
+    if model.rating_scale is not None:
+        np.clip(scores, *model.rating_scale, out=scores)
+
+    # Rated items of each row, from the chunk's CSR slice
+    rows = np.repeat(np.arange(len(user_idx)), np.diff(exclude_indptr))
+    scores[rows, exclude_indices] = -np.inf
+
+    top_n = min(top_n, scores.shape[1])
+    top = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    top[top_scores == -np.inf] = -1
+    return top.astype(np.int32), top_scores.astype(np.float32)
+
+
+def exclusion_lists(rated_index, rated_rows, item_map):
+    """
+    Return (indptr, indices) of the movies rated in the
+    given rows of the CSR index (-1 for unknown users),
+    mapped to model item indices through item_map.
+    """
+
+    indptr, indices = [0], []
+    for row in rated_rows:
+        items = np.empty(0, dtype=np.int64)
+        if row >= 0:
+            start, stop = rated_index.indptr[row], rated_index.indptr[row + 1]
+            items = item_map[rated_index.indices[start:stop]]
+            items = items[items >= 0]
+        indices.append(items)
+        indptr.append(indptr[-1] + len(items))
+    return np.array(indptr), np.concatenate(indices)
+
+
+def _init_worker(model_path):
+    global _worker_model
+    _worker_model = FactorModel.load(model_path)
+
+
+def _worker_score_chunk(args):
+    start, user_idx, exclude_indptr, exclude_indices, top_n = args
+    return start, score_chunk(_worker_model, user_idx, exclude_indptr, exclude_indices, top_n)
+
+
+def precompute_recommendations(
+    model_path, rated_index, top_n=BATCH_TOP_N, chunk_users=CHUNK_USERS, n_jobs=None
+):
+    """
+    Yield (user_ids, movie_ids, scores) chunks with the
+    top_n unrated movies of every user of the factor
+    model saved at model_path. movie_ids is -1 padded.
+    """
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    model = FactorModel.load(model_path)
+    n_users = len(model.users)
+    rated_rows = rated_index.users.indices(model.users.ids)
+    item_map = model.items.indices(rated_index.items.ids)
+
+    def chunks():
+        for start in range(0, n_users, chunk_users):
+            stop = min(start + chunk_users, n_users)
+            indptr, indices = exclusion_lists(rated_index, rated_rows[start:stop], item_map)
+            yield start, np.arange(start, stop), indptr, indices, top_n
+
+    def to_raw(start, top, top_scores):
+        user_ids = model.users.ids[start:start + len(top)]
+        movie_ids = np.where(top >= 0, model.items.ids[top], -1).astype(np.int32)
+        return user_ids, movie_ids, top_scores
+
+    if n_jobs <= 1:
+        for start, user_idx, indptr, indices, _ in chunks():
+            yield to_raw(start, *score_chunk(model, user_idx, indptr, indices, top_n))
+        return
+
+    # A bounded window of chunks in flight keeps memory flat
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, initializer=_init_worker, initargs=(model_path,)
+    ) as executor:
+        pending = deque()
+        for chunk in chunks():
+            pending.append(executor.submit(_worker_score_chunk, chunk))
+            if len(pending) >= 2 * n_jobs:
+                start, (top, top_scores) = pending.popleft().result()
+                yield to_raw(start, top, top_scores)
+        while pending:
+            start, (top, top_scores) = pending.popleft().result()
+            yield to_raw(start, top, top_scores)
@@ -0,0 +1,80 @@
+"""
+File-like adapters for streaming COPY FROM STDIN.
+
+copy_expert pulls its input with read(size). IteratorFile
+answers those reads from an iterator of text lines, so
+rows are produced (and converted) lazily as Postgres
+consumes them and memory stays constant whatever the
+file size; no intermediate buffer is materialised.
+"""
+
+import csv
+import io
+
+
+class Echo:
+    """
+    Pseudo-buffer whose write() hands the value back,
+    letting csv.writer format one row at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    """
+    Lazily format rows as COPY CSV lines.
+    """
+
+    writer = csv.writer(Echo(), lineterminator="\n")
+    for row in rows:
+        yield writer.writerow(row)
+
+
+class IteratorFile(io.TextIOBase):
+    """
+    Read-only text file over an iterator of strings.
+    """
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        """
+        Return up to size characters (all remaining
+        ones when size is negative or None).
+        """
+
+        if size is None or size < 0:
+            data, self._buffer = self._buffer + "".join(self._lines), ""
+            return data
+
+        parts, length = [self._buffer], len(self._buffer)
+        while length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+
+        data = "".join(parts)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size=-1):
+        """
+        Return the next line, as produced by the iterator.
+        """
+
+        if not self._buffer:
+            self._buffer = next(self._lines, "")
+        end = self._buffer.find("\n") + 1 or len(self._buffer)
+        if size is not None and 0 <= size < end:
+            end = size
+        line, self._buffer = self._buffer[:end], self._buffer[end:]
+        return line
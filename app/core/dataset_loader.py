@@ -1,14 +1,33 @@
 """
 This module contains the MovieLensDataSet class.
 It is used to load the MovieLens data into PostgreSQL.
-using bulk_create method.
+
+Ratings and tags are read in fixed-size chunks, converted
+column-wise with NumPy, deduplicated against the rows already
+in the database with int64 (user_id, movie_id) composite keys
+and streamed into their tables with COPY, so memory stays
+bounded by the chunk size plus one int64 per existing row.
+Users the files mention but the database lacks are created
+per chunk with core.stream.create_missing_users.
 """
 
-from datetime import datetime, timezone
+import tempfile
+import time
+import numpy as np
 import pandas as pd
-from core.models import Movie, Ratings, Tags, Links
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
+from core.copyio import IteratorFile
+from core.genres import genre_masks
+from core.models import Movie, Ratings, Tags, Links
+from core.stream import create_missing_users
+
+CHUNK_ROWS = 1_000_000
+
+RATINGS_DTYPES = {"userId": np.int64, "movieId": np.int64, "rating": np.float64, "timestamp": np.int64}
+TAGS_DTYPES = {"userId": np.int64, "movieId": np.int64, "tag": str, "timestamp": np.int64}
+HALF_STAR_TEXT = np.array([f"{half / 2:.1f}" for half in range(11)])
 
 
 def create_user(user_id):
@@ -30,17 +49,256 @@ def create_user(user_id):
     return user
 
 
+def composite_keys(user_ids, movie_ids):
+    """
+    Pack (user_id, movie_id) pairs into one int64 each.
+    """
+
+    return (np.asarray(user_ids, dtype=np.int64) << 32) | np.asarray(movie_ids, dtype=np.int64)
+
+
+def sorted_contains(sorted_values, values):
+    """
+    Return a mask of the values present in a sorted array.
+    The values are looked up in sorted order, which keeps
+    the binary searches cache friendly on large arrays.
+    """
+
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    order = np.argsort(values, kind="stable")
+    pos = np.searchsorted(sorted_values, values[order]).clip(max=len(sorted_values) - 1)
+    found = np.empty(len(values), dtype=bool)
+    found[order] = sorted_values[pos] == values[order]
+    return found
+
+
+def id_lookup(ids):
+    """
+    Return a boolean table indexed by id that is True
+    for the given (non-negative) ids.
+    """
+
+    ids = np.asarray(ids, dtype=np.int64)
+    table = np.zeros(ids.max() + 1 if len(ids) else 0, dtype=bool)
+    table[ids] = True
+    return table
+
+
+def with_ids(table, ids):
+    """
+    Return an id_lookup table that also has ids set,
+    grown when they lie past its end.
+    """
+
+    ids = np.asarray(ids, dtype=np.int64)
+    if len(ids) and ids.max() >= len(table):
+        table = np.concatenate([table, np.zeros(ids.max() + 1 - len(table), dtype=bool)])
+    table[ids] = True
+    return table
+
+
+def in_lookup(table, values):
+    """
+    Return a mask of the values set in an id_lookup table.
+    """
+
+    inside = (values >= 0) & (values < len(table))
+    found = np.zeros(len(values), dtype=bool)
+    found[inside] = table[values[inside]]
+    return found
+
+
+def sorted_merge(sorted_values, new_values):
+    """
+    Merge sorted new_values into a sorted array in one pass.
+    """
+
+    return np.insert(sorted_values, np.searchsorted(sorted_values, new_values), new_values)
+
+
+class SortedRuns:
+    """
+    Set of int64 keys held as sorted runs whose sizes
+    shrink from oldest to newest. Adding a run merges it
+    into every older run no larger than it, so each key
+    is merged O(log n) times instead of once per chunk
+    and at most O(log n) runs are searched.
+    """
+
+    def __init__(self, keys=()):
+        self.runs = []
+        self.add(keys)
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    def add(self, keys):
+        """
+        Add a sorted array of keys not yet in the set.
+        """
+
+        run = np.asarray(keys, dtype=np.int64)
+        if not len(run):
+            return
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = sorted_merge(self.runs.pop(), run)
+        self.runs.append(run)
+
+    def contains(self, values):
+        """
+        Return a mask of the values in the set.
+        """
+
+        found = np.zeros(len(values), dtype=bool)
+        for run in self.runs:
+            found |= sorted_contains(run, values)
+        return found
+
+
+def copy_column_values(query):
+    """
+    Stream the integer columns of query out with COPY TO
+    and return them as int64 arrays, without ORM objects.
+    """
+
+    with tempfile.TemporaryFile(mode="w+") as copy_file:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV", copy_file)
+        copy_file.seek(0)
+        if not copy_file.read(1):
+            return None
+        copy_file.seek(0)
+        values = pd.read_csv(copy_file, header=None, dtype=np.int64).to_numpy()
+    return [values[:, column] for column in range(values.shape[1])]
+
+
+def existing_ids(model):
+    """
+    Return the sorted primary keys of a model's table.
+    """
+
+    table = model._meta.db_table
+    column = model._meta.pk.column
+    values = copy_column_values(f"SELECT {column} FROM {table}")
+    if values is None:
+        return np.empty(0, dtype=np.int64)
+    return np.sort(values[0])
+
+
+def existing_pairs(model):
+    """
+    Return the sorted composite keys of the
+    (user_id, movie_id) pairs in a model's table.
+    """
+
+    values = copy_column_values(f"SELECT user_id, movie_id FROM {model._meta.db_table}")
+    if values is None:
+        return np.empty(0, dtype=np.int64)
+    return np.sort(composite_keys(*values))
+
+
+def unix_to_timestamps(seconds, default=""):
+    """
+    Convert unix seconds to ISO-8601 UTC strings, using
+    default for missing (non-positive) values; the empty
+    default is written as NULL.
+    """
+
+    seconds = np.asarray(seconds, dtype=np.int64)
+    stamps = np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s", timezone="UTC")
+    return np.where(seconds > 0, stamps, default)
+
+
+def half_star_text(ratings):
+    """
+    Format 0.5-step ratings through a lookup
+    table instead of one float repr per row.
+    """
+
+    half_stars = np.rint(np.asarray(ratings, dtype=np.float64) * 2).astype(np.int64)
+    return HALF_STAR_TEXT[half_stars.clip(0, len(HALF_STAR_TEXT) - 1)]
+
+
+def read_chunks(source, dtypes, chunk_rows):
+    """
+    Yield DataFrame chunks from a CSV path or a DataFrame.
+    """
+
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_rows):
+            yield source.iloc[start:start + chunk_rows]
+        return
+
+    yield from pd.read_csv(source, dtype=dtypes, chunksize=chunk_rows)
+
+
+def quote_csv(value):
+    """
+    Quote a free-text field for COPY CSV; None is NULL.
+    """
+
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def csv_rows(columns):
+    """
+    Lazily format equal-length columns as CSV lines,
+    several times faster than DataFrame.to_csv. Numbers
+    are formatted with str, fixed-width unicode arrays
+    (pre-formatted, delimiter-free values) are written as
+    is and object arrays are quoted as free text, so an
+    empty tag stays an empty string rather than NULL.
+    """
+
+    fields = []
+    for values in columns:
+        values = np.asarray(values)
+        if values.dtype.kind == "U":
+            fields.append(values.tolist())
+        elif values.dtype.kind in "iuf":
+            fields.append(map(str, values.tolist()))
+        else:
+            fields.append(map(quote_csv, values.tolist()))
+    for row in zip(*fields):
+        yield ",".join(row) + "\n"
+
+
+def csv_text(columns):
+    """
+    Format equal-length columns as one CSV string.
+    """
+
+    return "".join(csv_rows(columns))
+
+
+def copy_columns(cursor, table, columns):
+    """
+    Stream a dict of column name -> values into
+    table with COPY FROM, formatting lines as
+    Postgres reads them.
+    """
+
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH CSV",
+        IteratorFile(csv_rows(columns.values())),
+    )
+
+
 class MovieLensDataLoader:
     """
     The MovieLensDataLoader class loads the MovieLens dataset files
     and inserts them into Django models.
     """
 
-    def __init__(self, path=""):
+    def __init__(self, path="", chunk_rows=CHUNK_ROWS):
         """
         Initialize the path to the MovieLens dataset files.
         """
         self.path = path
+        self.chunk_rows = chunk_rows
 
     def load_data(self):
         """
@@ -48,13 +306,12 @@ class MovieLensDataLoader:
         """
         try:
             movies_df = pd.read_csv(f"{self.path}movies.csv")
-            ratings_df = pd.read_csv(f"{self.path}ratings.csv")
 
             print("Files loaded successfully!")
 
-            # Insert movies into the database
+            # Insert movies into the database, then stream the ratings
             self.load_movies(movies_df)
-            self.load_ratings(ratings_df)
+            self.load_ratings(f"{self.path}ratings.csv")
 
         except FileNotFoundError as e:
             print(f"Error: {e}")
@@ -66,97 +323,130 @@ class MovieLensDataLoader:
         Insert movies data into the database.
         """
         # Filter out movies that already exist in the database
-        existing_movies = set(Movie.objects.values_list("movie_id", flat=True))
-        movies_df = movies_df[~movies_df["movieId"].isin(existing_movies)]
+        movies_df = movies_df[~sorted_contains(existing_ids(Movie), movies_df["movieId"].to_numpy())]
 
         movie_objects = [
             Movie(
-                movie_id=row["movieId"],  # int64
-                title=row["title"],
-                genres=row["genres"]
+                movie_id=movie_id,
+                title=title,
+                genres=genres,
+                genre_mask=mask,
+            )
+            for movie_id, title, genres, mask in zip(
+                movies_df["movieId"].tolist(),
+                movies_df["title"].tolist(),
+                movies_df["genres"].tolist(),
+                genre_masks(movies_df["genres"].fillna("")).tolist(),
             )
-            for index, row in movies_df.iterrows()
         ]
 
         # Bulk insert the movies into the database
         Movie.objects.bulk_create(movie_objects, batch_size=5000)
         print(f"{len(movie_objects)} movies loaded into the database.")
 
-    @transaction.atomic
-    def load_ratings(self, ratings_df):
-        """
-        Insert ratings data into the database.
-        """
-        # Preload Movies and Users
-        movie_map = {movie.movie_id: movie for movie in Movie.objects.all()}
-        user_map = {user.id: user for user in get_user_model().objects.all()}
-
-        # Filter out ratings that already exist in the database
-        existing_ratings = set(Ratings.objects.values_list(
-          "user_id", "movie_id"))
-
-        rating_objects = []
-        for index, row in ratings_df.iterrows():
-            # Ensure no duplicates are inserted
-            if (row["userId"], row["movieId"]) not in existing_ratings:
-                # Convert timestamp to a Python datetime object
-                timestamp = datetime.fromtimestamp(
-                  row["timestamp"], timezone.utc
-                  ) if row["timestamp"] > 0 else None
-
-                rating = Ratings(
-                    user=user_map.get(row["userId"]),
-                    movie=movie_map.get(row["movieId"]),
-                    rating=row["rating"],
-                    timestamp=timestamp,
-                )
-                rating_objects.append(rating)
+    def new_rows(self, chunk, seen, known_users, known_movies):
+        """
+        Return the rows of a chunk whose user and movie are
+        set in the known_* id_lookup tables and whose (user,
+        movie) pair is not in the seen SortedRuns (nor
+        repeated within the chunk), and their sorted keys.
+        """
 
-            # Optional: Log progress for large datasets
-            if index % 10000 == 0:
-                print(f"Processed {index} ratings...")
+        users = chunk["userId"].to_numpy(np.int64)
+        movies = chunk["movieId"].to_numpy(np.int64)
+        keys = composite_keys(users, movies)
 
-        # Bulk insert the ratings
-        Ratings.objects.bulk_create(rating_objects, batch_size=5000)
-        print(f"{len(rating_objects)} ratings loaded into the database.")
+        keep = in_lookup(known_users, users) & in_lookup(known_movies, movies)
+        keep &= ~seen.contains(keys)
+        rows = np.flatnonzero(keep)
+
+        # First occurrence of every pair within the chunk
+        new_keys, first = np.unique(keys[rows], return_index=True)
+        rows = np.sort(rows[first])
+        return chunk.iloc[rows], new_keys
 
     @transaction.atomic
-    def load_tags(self, tags_df):
+    def stream_pairs(self, source, model, dtypes, to_columns):
+        """
+        Stream new (user, movie) rows of source into
+        model's table with COPY, chunk by chunk.
+        to_columns maps a chunk to the table columns.
+        """
+
+        table = model._meta.db_table
+        seen = SortedRuns(existing_pairs(model))
+        known_users = id_lookup(existing_ids(get_user_model()))
+        known_movies = id_lookup(existing_ids(Movie))
+
+        started = time.monotonic()
+        n_read = n_loaded = n_users = 0
+        with connection.cursor() as cursor:
+            for chunk in read_chunks(source, dtypes, self.chunk_rows):
+                # Users of known movies not in the database yet, in one statement
+                users = chunk["userId"].to_numpy(np.int64)
+                users = users[in_lookup(known_movies, chunk["movieId"].to_numpy(np.int64))]
+                missing = np.unique(users[~in_lookup(known_users, users)])
+                if len(missing):
+                    create_missing_users(cursor, missing.tolist())
+                    known_users = with_ids(known_users, missing)
+                    n_users += len(missing)
+
+                rows, keys = self.new_rows(chunk, seen, known_users, known_movies)
+                if len(rows):
+                    copy_columns(cursor, table, to_columns(rows))
+                seen.add(keys)
+
+                n_read += len(chunk)
+                n_loaded += len(rows)
+                elapsed = time.monotonic() - started
+                print(
+                    f"Processed {n_read} rows, loaded {n_loaded} "
+                    f"({n_read / max(elapsed, 1e-9):.0f} rows/s)..."
+                )
+
+        print(
+            f"{n_loaded} rows loaded into {table}, {n_read - n_loaded} skipped "
+            f"(unknown movies or pairs already present), {n_users} users created."
+        )
+        return n_loaded
+
+    def load_ratings(self, ratings):
         """
-        Insert tags data into the database.
+        Insert ratings data into the database, from
+        a ratings.csv path or a DataFrame. Users not in
+        the database yet are created; ratings of unknown
+        movies, and pairs already rated, are skipped.
         """
 
-        # Preload Movies and Users
-        movie_map = {movie.movie_id: movie for movie in Movie.objects.all()}
-        user_map = {user.id: user for user in get_user_model().objects.all()}
+        now = timezone.now().isoformat()
 
-        # Filter out tags that already exist in the database
-        existing_tags = set(Tags.objects.values_list(
-          "user_id", "movie_id"))
+        def to_columns(chunk):
+            return {
+                "user_id": chunk["userId"].to_numpy(),
+                "movie_id": chunk["movieId"].to_numpy(),
+                "rating": half_star_text(chunk["rating"].to_numpy()),
+                "timestamp": unix_to_timestamps(chunk["timestamp"].to_numpy(), now),
+                "created_at": np.full(len(chunk), now),
+            }
 
-        tag_objects = []
-        for index, row in tags_df.iterrows():
-            # Ensure no duplicates are inserted
-            if (row["userId"], row["movieId"]) not in existing_tags:
-                # Convert timestamp to a Python datetime object
-                timestamp = datetime.fromtimestamp(
-                  row["timestamp"], timezone.utc
-                  ) if row["timestamp"] > 0 else None
+        return self.stream_pairs(ratings, Ratings, RATINGS_DTYPES, to_columns)
 
-                tag = Tags(
-                    user=user_map.get(row["userId"]),
-                    movie=movie_map.get(row["movieId"]),
-                    tag=row["tag"],
-                    timestamp=timestamp,
-                )
-                tag_objects.append(tag)
+    def load_tags(self, tags):
+        """
+        Insert tags data into the database, from a
+        tags.csv path or a DataFrame. Only the first
+        tag of each (user, movie) pair is kept.
+        """
 
-            if index % 10000 == 0:
-                print(f"Processed {index} tags...")
+        def to_columns(chunk):
+            return {
+                "user_id": chunk["userId"].to_numpy(),
+                "movie_id": chunk["movieId"].to_numpy(),
+                "tag": chunk["tag"].fillna("").to_numpy(object),
+                "timestamp": unix_to_timestamps(chunk["timestamp"].to_numpy()),
+            }
 
-        # Bulk insert the tags
-        Tags.objects.bulk_create(tag_objects, batch_size=5000)
-        print(f"{len(tag_objects)} tags loaded into the database.")
+        return self.stream_pairs(tags, Tags, TAGS_DTYPES, to_columns)
 
     @transaction.atomic
     def load_links(self, links_df):
@@ -0,0 +1,58 @@
+"""
+EASE linear item model for the head of the catalog.
+
+EASE (Steck, 2019) learns a movie x movie weight matrix B
+with a zero diagonal that reconstructs each user's ratings
+from their other ratings, X ~ X B. It has a closed form:
+
+    P = (X^T X + reg I)^-1
+    B = -P / diag(P),  diag(B) = 0
+
+The dense Gram matrix only fits in memory for a few
+thousand movies, so the model covers the n_items most
+rated ones; ratings of other movies are ignored when
+scoring. The inverse runs in LAPACK on all BLAS threads.
+"""
+
+import numpy as np
+import scipy.linalg
+from threadpoolctl import threadpool_limits
+from core.itemmodel import ItemModel
+
+EASE_ITEMS = 10000
+EASE_REG = 500.0
+
+
+def head_items(interactions, n_items):
+    """
+    Return the column indices of the n_items most rated
+    movies, in ascending order.
+    """
+
+    popularity = np.diff(interactions.matrix.tocsc().indptr)
+    if n_items >= len(popularity):
+        return np.arange(len(popularity))
+    head = np.argpartition(-popularity, n_items - 1)[:n_items]
+    return np.sort(head)
+
+
+def build_ease(interactions, n_items=EASE_ITEMS, reg=EASE_REG, n_jobs=None):
+    """
+    Fit a dense ItemModel over the most rated movies
+    of an InteractionMatrix, on n_jobs BLAS threads
+    (all of them by default).
+    """
+
+    head = head_items(interactions, n_items)
+    ratings = interactions.matrix[:, head].astype(np.float32)
+
+    with threadpool_limits(limits=n_jobs, user_api="blas"):
+        gram = (ratings.T @ ratings).toarray()
+        gram[np.diag_indices_from(gram)] += reg
+        inverse = scipy.linalg.inv(gram, overwrite_a=True, check_finite=False)
+
+    # In place, so the weights reuse the inverse's memory
+    diagonal = np.diag(inverse).copy()
+    inverse /= -diagonal
+    np.fill_diagonal(inverse, 0)
+    return ItemModel(interactions.items.ids[head], inverse, "ease")
@@ -0,0 +1,182 @@
+"""
+Online fold-in of users into a trained factor model.
+
+A user who signs up or rates movies after training has
+no (or a stale) row in the user factors. Their latent
+vector and bias are solved by regularised least squares
+against the fixed item factors and biases:
+
+    min  sum_i (r_ui - mu - b_i - b_u - q_i . p_u)^2
+         + reg * n_u * (|p_u|^2 + b_u^2)
+
+which is one (k+1) x (k+1) linear solve per user. The
+result is cached per user until their ratings change.
+
+A rating change is recorded as the time it happened and
+only counts against models whose training data predates
+it: the high-water mark of the ratings snapshot they
+were trained on (or, training from the database, the
+version's training time). Ratings saved between the
+snapshot export and training still count as changed,
+and publishing a model trained on a newer snapshot
+retires the older flags.
+Flags and vectors live in Django's default cache, which
+settings.CACHES points at a backend shared by all worker
+processes (the database cache unless CACHE_URL says
+otherwise), so a rating saved by one worker invalidates
+the vector in all of them.
+"""
+
+import time
+from datetime import datetime, timezone
+import numpy as np
+from django.core.cache import cache
+from core.models import Ratings
+
+# ALS-WR style regularisation, scaled by the user's rating count
+FOLD_IN_REG = 0.1
+
+USER_VECTOR_KEY = "recommender:user_vector:{user_id}"
+RATINGS_CHANGED_KEY = "recommender:ratings_changed:{user_id}"
+USER_VECTOR_TIMEOUT = 60 * 60 * 24
+# Models are retrained nightly; a flag older than this is
+# covered by any model trained since
+RATINGS_CHANGED_TIMEOUT = 60 * 60 * 24 * 30
+VERSION_FORMAT = "%Y%m%d%H%M%S"
+
+
+def version_trained_at(version):
+    """
+    Return the unix time a model version was trained at,
+    or None for versions not named after their UTC time.
+    """
+
+    try:
+        trained_at = datetime.strptime(version, VERSION_FORMAT)
+    except (TypeError, ValueError):
+        return None
+    return trained_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+def solve_vector(fixed_factors, fixed_bias, global_mean, values, reg=FOLD_IN_REG):
+    """
+    Solve (factors, bias) of one row against the fixed
+    factors and biases of the columns it has values for.
+    """
+
+    residual = np.asarray(values, dtype=np.float64) - global_mean - fixed_bias
+
+    # Fixed factors plus a constant column for the bias
+    design = np.ones((len(residual), fixed_factors.shape[1] + 1))
+    design[:, :-1] = fixed_factors
+
+    gram = design.T @ design
+    gram[np.diag_indices_from(gram)] += reg * len(residual)
+    solution = np.linalg.solve(gram, design.T @ residual)
+    return solution[:-1].astype(np.float32), float(solution[-1])
+
+
+def fold_in(model, movie_ids, ratings, reg=FOLD_IN_REG):
+    """
+    Solve (factors, bias) of a user from their raw movie
+    ids and ratings. Movies unknown to the model are
+    ignored; without any known movie (None, 0.0) is
+    returned, the bias-only estimate of a new user.
+    """
+
+    item_idx = model.items.indices(movie_ids)
+    known = item_idx >= 0
+    if not known.any():
+        return None, 0.0
+
+    item_idx = item_idx[known]
+    return solve_vector(
+        model.item_factors[item_idx],
+        model.item_bias[item_idx],
+        model.global_mean,
+        np.asarray(ratings)[known],
+        reg,
+    )
+
+
+def user_ratings(user_id):
+    """
+    Return (movie_ids, ratings) of a user from the database.
+    """
+
+    rows = np.array(
+        Ratings.objects.filter(user_id=user_id).values_list("movie_id", "rating"),
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    return rows[:, 0].astype(np.int64), rows[:, 1]
+
+
+def mark_ratings_changed(user_id):
+    """
+    Drop a user's cached vector and record when their
+    ratings changed, flagging them for fold-in with any
+    model trained before now. Call after creating a
+    user or saving their ratings.
+    """
+
+    cache.set(RATINGS_CHANGED_KEY.format(user_id=user_id), time.time(), RATINGS_CHANGED_TIMEOUT)
+    cache.delete(USER_VECTOR_KEY.format(user_id=user_id))
+
+
+class FoldIn:
+    """
+    Serves user vectors for a factor model, folding in
+    users that are new or have rated since training.
+    """
+
+    def __init__(self, model, version=None, reg=FOLD_IN_REG):
+        self.model = model
+        self.version = version
+        if model.high_water_mark is not None:
+            self.trained_through = model.high_water_mark.timestamp()
+        else:
+            self.trained_through = version_trained_at(version)
+        self.reg = reg
+
+    def ratings_changed(self, user_id):
+        """
+        Return whether a user's ratings changed after
+        the ratings this model was trained on.
+        """
+
+        changed_at = cache.get(RATINGS_CHANGED_KEY.format(user_id=user_id))
+        if changed_at is None:
+            return False
+        return self.trained_through is None or changed_at > self.trained_through
+
+    def user_ratings(self, user_id):
+        """
+        Return (movie_ids, ratings) of a user from the database.
+        """
+
+        return user_ratings(user_id)
+
+    def user_vector(self, user_id):
+        """
+        Return (factors, bias, rated movie ids) of a user.
+        Rated ids are None when the trained vector is used
+        and the caller's rated-item index is up to date.
+        """
+
+        key = USER_VECTOR_KEY.format(user_id=user_id)
+        cached = cache.get(key)
+        if cached is not None and cached["version"] == self.version:
+            return cached["factors"], cached["bias"], cached["rated"]
+
+        if not self.ratings_changed(user_id) and user_id in self.model.users:
+            factors, bias = self.model.user_vector(user_id)
+            return factors, bias, None
+
+        movie_ids, ratings = self.user_ratings(user_id)
+        factors, bias = fold_in(self.model, movie_ids, ratings, self.reg)
+        cache.set(
+            key,
+            {"version": self.version, "factors": factors, "bias": bias, "rated": movie_ids},
+            USER_VECTOR_TIMEOUT,
+        )
+        return factors, bias, movie_ids
@@ -0,0 +1,162 @@
+"""
+Movie genres as uint32 bitmasks.
+
+Each MovieLens genre owns one bit, so a movie's genres
+are one integer: stored on Movie.genre_mask, where SQL
+filters with a bitwise AND (a sequential scan over one
+int column; a btree index cannot serve the predicate),
+and held as a NumPy array in memory where filtering is
+a bitwise AND and genre similarity (Jaccard) is a
+popcount of AND over a popcount of OR.
+"""
+
+import numpy as np
+from django.db.models import F
+from core.scoring import top_n_indices
+
+GENRES = (
+    "Action",
+    "Adventure",
+    "Animation",
+    "Children",
+    "Comedy",
+    "Crime",
+    "Documentary",
+    "Drama",
+    "Fantasy",
+    "Film-Noir",
+    "Horror",
+    "IMAX",
+    "Musical",
+    "Mystery",
+    "Romance",
+    "Sci-Fi",
+    "Thriller",
+    "War",
+    "Western",
+)
+GENRE_BITS = {genre.lower(): np.uint32(1 << bit) for bit, genre in enumerate(GENRES)}
+# Older MovieLens releases spell it "Children's"
+GENRE_BITS["children's"] = GENRE_BITS["children"]
+
+
+def genre_mask(genres):
+    """
+    Return the bitmask of a pipe-delimited genres string.
+    Unknown genres (and "(no genres listed)") set no bit.
+    """
+
+    mask = 0
+    for genre in (genres or "").split("|"):
+        mask |= int(GENRE_BITS.get(genre.strip().lower(), 0))
+    return mask
+
+
+def genre_masks(genres):
+    """
+    Return a uint32 array of bitmasks for
+    an iterable of genres strings.
+    """
+
+    return np.fromiter((genre_mask(value) for value in genres), dtype=np.uint32)
+
+
+def filter_genres(queryset, genres):
+    """
+    Filter a Movie queryset to the movies having every
+    genre in a pipe-delimited string; no movie matches
+    a string without known genres.
+    """
+
+    mask = genre_mask(genres)
+    if not mask:
+        return queryset.none()
+    return queryset.alias(genre_match=F("genre_mask").bitand(mask)).filter(genre_match=mask)
+
+
+def genre_names(mask):
+    """
+    Return the genre names set in a bitmask.
+    """
+
+    return [genre for bit, genre in enumerate(GENRES) if mask >> bit & 1]
+
+
+def popcount(masks):
+    """
+    Return the number of set bits of every uint32
+    (SWAR bit counting; numpy<2 has no bitwise_count).
+    """
+
+    masks = np.asarray(masks, dtype=np.uint32)
+    masks = masks - ((masks >> 1) & np.uint32(0x55555555))
+    masks = (masks & np.uint32(0x33333333)) + ((masks >> 2) & np.uint32(0x33333333))
+    masks = (masks + (masks >> 4)) & np.uint32(0x0F0F0F0F)
+    return ((masks * np.uint32(0x01010101)) >> 24).astype(np.uint8)
+
+
+def jaccard(mask, masks):
+    """
+    Return the Jaccard similarity of one
+    bitmask against an array of bitmasks.
+    """
+
+    masks = np.asarray(masks, dtype=np.uint32)
+    mask = np.uint32(mask)
+    union = popcount(masks | mask).astype(np.float32)
+    shared = popcount(masks & mask).astype(np.float32)
+    return np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+
+class GenreIndex:
+    """
+    In-memory genre bitmask of every movie,
+    aligned with an array of movie ids.
+    """
+
+    def __init__(self, movie_ids, masks):
+        self.movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        self.masks = np.asarray(masks, dtype=np.uint32)
+        self.positions = {movie_id: pos for pos, movie_id in enumerate(self.movie_ids.tolist())}
+
+    @classmethod
+    def from_movies(cls, movies):
+        """
+        Build the index from a DataFrame with 'movie_id'
+        and either 'genre_mask' or 'genres' columns.
+        """
+
+        if "genre_mask" in movies:
+            masks = movies["genre_mask"].to_numpy(np.uint32)
+        else:
+            masks = genre_masks(movies["genres"].fillna(""))
+        return cls(movies["movie_id"].to_numpy(np.int64), masks)
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    def filter(self, mask, match_all=True):
+        """
+        Return the movie ids having all (or, with
+        match_all=False, any) of the genres in mask.
+        """
+
+        mask = np.uint32(mask)
+        shared = self.masks & mask
+        keep = shared == mask if match_all else shared != 0
+        return self.movie_ids[keep]
+
+    def similar(self, movie_id, top_n=10):
+        """
+        Return (movie_ids, scores) of the top_n movies
+        with the highest genre Jaccard similarity.
+        """
+
+        pos = self.positions.get(int(movie_id))
+        if pos is None:
+            raise ValueError(f"Movie id {movie_id} is not in the genre index.")
+
+        scores = jaccard(self.masks[pos], self.masks)
+        scores[pos] = -np.inf
+        top = top_n_indices(scores, top_n)
+        return self.movie_ids[top], scores[top]
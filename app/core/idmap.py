@@ -0,0 +1,58 @@
+"""
+Mapping between raw database ids and dense array indices.
+"""
+
+import numpy as np
+
+
+class IdMap:
+    """
+    Maps raw ids (user ids, movie ids) to dense indices
+    0..n-1 and back. Lookups are vectorised binary
+    searches over a sorted view of the ids.
+    """
+
+    def __init__(self, ids):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self._order = np.argsort(self.ids, kind="stable")
+        self._sorted = self.ids[self._order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, raw_id):
+        return self.index(raw_id) >= 0
+
+    def indices(self, raw_ids):
+        """
+        Return the dense index of every raw id,
+        or -1 for ids that are not mapped.
+        """
+
+        raw_ids = np.asarray(raw_ids, dtype=np.int64)
+        if len(self._sorted) == 0:
+            return np.full(raw_ids.shape, -1, dtype=np.int64)
+
+        pos = np.searchsorted(self._sorted, raw_ids)
+        pos = np.minimum(pos, len(self._sorted) - 1)
+        found = self._sorted[pos] == raw_ids
+        return np.where(found, self._order[pos], -1)
+
+    def index(self, raw_id):
+        """
+        Return the dense index of a single raw id, or -1.
+        """
+
+        return int(self.indices([raw_id])[0])
+
+    def extend(self, raw_ids):
+        """
+        Append the raw ids that are not mapped yet, keeping
+        existing indices stable. Returns the new IdMap.
+        """
+
+        raw_ids = np.unique(np.asarray(raw_ids, dtype=np.int64))
+        missing = raw_ids[self.indices(raw_ids) < 0]
+        if len(missing) == 0:
+            return self
+        return IdMap(np.concatenate([self.ids, missing]))
@@ -0,0 +1,234 @@
+"""
+Implicit-feedback ALS recommender.
+
+Every interaction a user has with a movie counts as a
+positive signal: rating it at all, adding it to one of
+their collections, or asking the chatbot about it. The
+weighted signals r_ui give a preference p_ui = 1 with
+confidence c_ui = 1 + alpha * r_ui, and unobserved
+movies a preference of 0 with confidence 1 (Hu, Koren
+and Volinsky, 2008).
+
+Each user (and item) row is solved with a few conjugate
+gradient steps warm-started from the previous sweep,
+using the shared Gram matrix YtY so only the observed
+entries of the row are touched. Sweeps run on the same
+memory-mapped process pool as the explicit ALS trainer,
+and the result is a bias-free FactorModel served by the
+usual top-N path.
+
+Chat messages are free text, so they are matched to
+movies with the TitleResolver (case, articles, year and
+typo tolerant) rather than by exact title in SQL.
+"""
+
+import os
+import numpy as np
+from django.db import connection
+from core.als import BLOCK_ROWS, SIDES, alternate, csr_arrays, row_blocks
+from core.idmap import IdMap
+from core.interactions import InteractionMatrix
+from core.models import Movie
+from core.scoring import FactorModel
+from core.snapshot import copy_ratings
+from core.titles import TitleResolver
+
+IMPLICIT_FACTORS = 64
+IMPLICIT_REG = 0.01
+IMPLICIT_ALPHA = 40.0
+IMPLICIT_ITERATIONS = 15
+CG_STEPS = 3
+
+# Strength of each kind of interaction
+RATING_WEIGHT = 1.0
+COLLECTION_WEIGHT = 2.0
+CHAT_WEIGHT = 1.0
+
+COLLECTION_SIGNALS_SQL = """
+    SELECT c.user_id, m.movie_id
+    FROM core_usercollection c
+    JOIN core_usercollection_movies m ON m.usercollection_id = c.id
+"""
+
+# The chatbot stores the movie title it was asked about
+CHAT_MESSAGES_SQL = "SELECT user_id, message FROM core_chathistory"
+
+
+def fetch_pairs(sql):
+    """
+    Run a (user_id, movie_id) query and return both
+    columns as int64 arrays.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        rows = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 2)
+    return rows[:, 0], rows[:, 1]
+
+
+def chat_signals(messages, resolver):
+    """
+    Resolve (user_id, message) rows to movies and return
+    (user_ids, movie_ids) of the messages that matched.
+    Each distinct message is resolved once.
+    """
+
+    resolved = {}
+    users, movies = [], []
+    for user_id, message in messages:
+        if message not in resolved:
+            resolved[message] = resolver.resolve(message)
+        if resolved[message] is not None:
+            users.append(user_id)
+            movies.append(resolved[message])
+    return np.array(users, dtype=np.int64), np.array(movies, dtype=np.int64)
+
+
+def catalog_resolver():
+    """
+    Build a TitleResolver over the movie table.
+    """
+
+    movie_ids, titles = [], []
+    for movie_id, title in Movie.objects.values_list("movie_id", "title").iterator():
+        movie_ids.append(movie_id)
+        titles.append(title)
+    return TitleResolver(movie_ids, titles)
+
+
+def implicit_signals(snapshot=None, resolver=None):
+    """
+    Collect weighted (user_ids, movie_ids, weights) from
+    ratings, collections and chat history. Ratings come
+    from the snapshot when one is given; chat messages
+    are resolved with resolver, by default one built
+    over the movie table.
+    """
+
+    if snapshot is not None:
+        rating_users = snapshot.users.ids[snapshot.user_idx]
+        rating_movies = snapshot.items.ids[snapshot.item_idx]
+    else:
+        rating_users, rating_movies, _, _ = copy_ratings()
+
+    with connection.cursor() as cursor:
+        cursor.execute(CHAT_MESSAGES_SQL)
+        chat_users, chat_movies = chat_signals(cursor, resolver or catalog_resolver())
+
+    sources = [
+        (rating_users, rating_movies, RATING_WEIGHT),
+        (*fetch_pairs(COLLECTION_SIGNALS_SQL), COLLECTION_WEIGHT),
+        (chat_users, chat_movies, CHAT_WEIGHT),
+    ]
+    return (
+        np.concatenate([users for users, _, _ in sources]),
+        np.concatenate([movies for _, movies, _ in sources]),
+        np.concatenate(
+            [np.full(len(users), weight, dtype=np.float32) for users, _, weight in sources]
+        ),
+    )
+
+
+def implicit_interactions(user_ids, movie_ids, weights):
+    """
+    Build the user x movie signal matrix; repeated
+    (user, movie) signals are summed.
+    """
+
+    users = IdMap(np.unique(user_ids))
+    items = IdMap(np.unique(movie_ids))
+    return InteractionMatrix.from_arrays(
+        users, items, users.indices(user_ids), items.indices(movie_ids), weights
+    )
+
+
+def solve_implicit_block(arrays, side, start, stop, gram, reg, alpha, cg_steps):
+    """
+    Update rows start:stop of one side in place with
+    cg_steps conjugate gradient steps on
+    (YtY + reg I + Yu^T (Cu - I) Yu) x = Yu^T Cu pu.
+    """
+
+    other = SIDES[side]
+    indptr = arrays[f"{side}_indptr"]
+    indices = arrays[f"{side}_indices"]
+    data = arrays[f"{side}_data"]
+    fixed = arrays[f"{other}_factors"]
+    factors = arrays[f"{side}_factors"]
+    gram = gram + reg * np.eye(len(gram))
+
+    for row in range(start, stop):
+        row_start, row_stop = indptr[row], indptr[row + 1]
+        y = fixed[indices[row_start:row_stop]].astype(np.float64)
+        confidence = 1.0 + alpha * data[row_start:row_stop]
+        x = factors[row].astype(np.float64)
+
+        # Residual b - Ax, with b = Yu^T Cu (preferences are 1)
+        residual = y.T @ confidence - gram @ x - y.T @ ((confidence - 1) * (y @ x))
+        direction = residual.copy()
+        rs_old = residual @ residual
+        for _ in range(cg_steps):
+            if rs_old < 1e-20:
+                break
+            a_direction = gram @ direction + y.T @ ((confidence - 1) * (y @ direction))
+            step = rs_old / (direction @ a_direction)
+            x += step * direction
+            residual -= step * a_direction
+            rs_new = residual @ residual
+            direction = residual + (rs_new / rs_old) * direction
+            rs_old = rs_new
+        factors[row] = x
+
+
+def train_implicit_als(
+    interactions,
+    n_factors=IMPLICIT_FACTORS,
+    reg=IMPLICIT_REG,
+    alpha=IMPLICIT_ALPHA,
+    n_iters=IMPLICIT_ITERATIONS,
+    cg_steps=CG_STEPS,
+    n_jobs=None,
+    block_rows=BLOCK_ROWS,
+    seed=0,
+):
+    """
+    Fit an implicit FactorModel to a signal InteractionMatrix,
+    solving row blocks across n_jobs worker processes.
+    """
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    rng = np.random.default_rng(seed)
+    n_users, n_items = interactions.shape
+    arrays = csr_arrays(interactions)
+    arrays.update(
+        {
+            "user_factors": rng.normal(0, 0.01, (n_users, n_factors)).astype(np.float32),
+            "item_factors": rng.normal(0, 0.01, (n_items, n_factors)).astype(np.float32),
+        }
+    )
+    blocks = {"user": row_blocks(n_users, block_rows), "item": row_blocks(n_items, block_rows)}
+
+    def half_step_tasks(arrays, side):
+        fixed = arrays[f"{SIDES[side]}_factors"]
+        gram = fixed.T.astype(np.float64) @ fixed
+        return [
+            (solve_implicit_block, (side, start, stop, gram, reg, alpha, cg_steps))
+            for start, stop in blocks[side]
+        ]
+
+    arrays = alternate(
+        arrays, half_step_tasks, n_iters, n_jobs, ("user_factors", "item_factors")
+    )
+    return FactorModel(
+        interactions.users,
+        interactions.items,
+        arrays["user_factors"],
+        arrays["item_factors"],
+        np.zeros(n_users, dtype=np.float32),
+        np.zeros(n_items, dtype=np.float32),
+        0.0,
+        rating_scale=None,
+        implicit=True,
+    )
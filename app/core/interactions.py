@@ -0,0 +1,102 @@
+"""
+Sparse user x item interaction matrix.
+
+Ratings are held as a CSR matrix (indptr/indices/data)
+with raw id maps for both axes, so the movies a user has
+rated are a single O(1) slice of the index arrays instead
+of a boolean scan over every rating.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from core.idmap import IdMap
+
+
+class InteractionMatrix:
+    """
+    Users as rows, movies as columns, ratings as values.
+    """
+
+    def __init__(self, users, items, matrix):
+        self.users = users if isinstance(users, IdMap) else IdMap(users)
+        self.items = items if isinstance(items, IdMap) else IdMap(items)
+        self.matrix = matrix
+
+    @property
+    def indptr(self):
+        return self.matrix.indptr
+
+    @property
+    def indices(self):
+        return self.matrix.indices
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @classmethod
+    def from_arrays(cls, users, items, user_idx, item_idx, values):
+        """
+        Build the CSR matrix from parallel dense index columns.
+        """
+
+        matrix = sp.csr_matrix(
+            (
+                np.asarray(values, dtype=np.float32),
+                (np.asarray(user_idx), np.asarray(item_idx)),
+            ),
+            shape=(len(users), len(items)),
+        )
+        matrix.sort_indices()
+        return cls(users, items, matrix)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Build the matrix from a RatingsSnapshot.
+        """
+
+        return cls.from_arrays(
+            snapshot.users,
+            snapshot.items,
+            snapshot.user_idx,
+            snapshot.item_idx,
+            snapshot.ratings,
+        )
+
+    @classmethod
+    def from_dataframe(cls, ratings, user_col="user_id", item_col="movie_id", rating_col="rating"):
+        """
+        Build the matrix from a ratings DataFrame with raw ids.
+        """
+
+        users = IdMap(np.unique(ratings[user_col].to_numpy()))
+        items = IdMap(np.unique(ratings[item_col].to_numpy()))
+        return cls.from_arrays(
+            users,
+            items,
+            users.indices(ratings[user_col].to_numpy()),
+            items.indices(ratings[item_col].to_numpy()),
+            ratings[rating_col].to_numpy(dtype=np.float32),
+        )
+
+    def user_row(self, user_id):
+        """
+        Return (item indices, ratings) of a user's row,
+        empty when the user is unknown.
+        """
+
+        u = self.users.index(user_id)
+        if u < 0:
+            return self.indices[:0], self.matrix.data[:0]
+
+        start, stop = self.indptr[u], self.indptr[u + 1]
+        return self.indices[start:stop], self.matrix.data[start:stop]
+
+    def rated_items(self, user_id):
+        """
+        Return the raw movie ids a user has rated.
+        """
+
+        item_idx, _ = self.user_row(user_id)
+        return self.items.ids[item_idx]
@@ -0,0 +1,38 @@
+"""
+Item-based collaborative filtering by sparse k-nearest neighbours.
+
+Movies are compared by the ratings users gave them: the
+similarity of movies i and j is the cosine of their rating
+columns, shrunk towards zero when few users rated both,
+
+    sim(i, j) = x_i . x_j / (|x_i| |x_j| + shrinkage)
+
+The item x user matrix is multiplied by its transpose one
+row block at a time on the content index's process pool,
+and only the top-K neighbours of each movie are kept.
+"""
+
+from core.itemmodel import ItemModel
+from core.similarity import build_topk
+
+KNN_NEIGHBORS = 100
+KNN_SHRINKAGE = 10.0
+
+
+def build_item_knn(
+    interactions,
+    k=KNN_NEIGHBORS,
+    shrinkage=KNN_SHRINKAGE,
+    block_size=None,
+    n_jobs=None,
+):
+    """
+    Build a sparse top-K ItemModel from the ratings
+    of an InteractionMatrix.
+    """
+
+    item_matrix = interactions.matrix.T.tocsr()
+    neighbors, scores = build_topk(
+        item_matrix, k, block_size=block_size, n_jobs=n_jobs, shrinkage=shrinkage
+    )
+    return ItemModel.from_neighbors(interactions.items, neighbors, scores, "knn")
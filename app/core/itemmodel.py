@@ -0,0 +1,159 @@
+"""
+Item-to-item recommendation models.
+
+An item model is a movie x movie weight matrix W. A user
+is scored by their row of ratings r_u over the movies
+they rated: scores = r_u W, i.e. the sum of the rated
+movies' rows weighted by the ratings. No per-user state
+is trained, so new ratings count straight away.
+
+Sparse models (pruned to top-K neighbours) are served with
+one sparse row-vector product and only movies reached by
+a neighbour row are candidates; dense models score the
+whole (restricted) catalog with a vector-matrix product.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from core.artifacts import load_artifact, save_artifact
+from core.idmap import IdMap
+from core.scoring import top_n_indices
+
+
+class ItemModel:
+    """
+    Movie x movie weights W, held sparse (CSR) or dense,
+    with the raw movie id of every row and column.
+    """
+
+    def __init__(self, item_ids, weights, method):
+        self.items = item_ids if isinstance(item_ids, IdMap) else IdMap(item_ids)
+        self.weights = weights
+        self.method = method
+
+    @property
+    def sparse(self):
+        return sp.issparse(self.weights)
+
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def from_neighbors(cls, item_ids, neighbors, scores, method):
+        """
+        Build a sparse model from per-item top-K neighbour
+        arrays, dropping padding and non-positive weights.
+        """
+
+        n_items, k = neighbors.shape
+        keep = (neighbors >= 0) & (scores > 0)
+        rows = np.repeat(np.arange(n_items), k)[keep.ravel()]
+        weights = sp.csr_matrix(
+            (scores[keep].astype(np.float32), (rows, neighbors[keep])),
+            shape=(n_items, n_items),
+        )
+        weights.sort_indices()
+        return cls(item_ids, weights, method)
+
+    def score_items(self, movie_ids, values=None):
+        """
+        Return (item indices, scores) of the movies reached
+        from the given raw movie ids and their weights.
+        """
+
+        item_idx = self.items.indices(movie_ids)
+        known = item_idx >= 0
+        item_idx = item_idx[known]
+        if values is None:
+            values = np.ones(len(known), dtype=np.float32)
+        values = np.asarray(values, dtype=np.float32)[known]
+
+        if not self.sparse:
+            return np.arange(len(self)), values @ self.weights[item_idx]
+
+        user_row = sp.csr_matrix(
+            (values, (np.zeros(len(item_idx), dtype=np.int32), item_idx)),
+            shape=(1, len(self)),
+        )
+        scores = user_row @ self.weights
+        return scores.indices, scores.data
+
+    def recommend(self, movie_ids, values=None, exclude=None, top_n=10):
+        """
+        Return (movie_ids, scores) of the top_n movies for a
+        user who rated movie_ids with values (1 by default),
+        skipping the raw movie ids in exclude.
+        """
+
+        reached, reached_scores = self.score_items(movie_ids, values)
+        scores = np.full(len(self), -np.inf, dtype=np.float32)
+        scores[reached] = reached_scores
+
+        if exclude is not None and len(exclude):
+            excluded = self.items.indices(exclude)
+            scores[excluded[excluded >= 0]] = -np.inf
+
+        top = top_n_indices(scores, top_n)
+        return self.items.ids[top], scores[top]
+
+    def similar(self, movie_id, top_n=10):
+        """
+        Return (movie_ids, scores) of the top_n highest
+        weighted movies in a movie's row, empty when the
+        movie is not modelled. Sparse rows are O(K).
+        """
+
+        row = self.items.index(movie_id)
+        if row < 0:
+            return self.items.ids[:0], np.empty(0, dtype=np.float32)
+
+        if self.sparse:
+            start, stop = self.weights.indptr[row], self.weights.indptr[row + 1]
+            cols = self.weights.indices[start:stop]
+            weights = self.weights.data[start:stop]
+        else:
+            cols = np.arange(len(self))
+            weights = np.array(self.weights[row])
+            weights[row] = -np.inf
+
+        top = top_n_indices(weights, top_n)
+        return self.items.ids[cols[top]], weights[top]
+
+    def save(self, path):
+        """
+        Save the weights as a model artifact directory.
+        """
+
+        if self.sparse:
+            arrays = {
+                "indptr": self.weights.indptr,
+                "indices": self.weights.indices,
+                "data": self.weights.data,
+            }
+        else:
+            arrays = {"weights": self.weights}
+        arrays["item_ids"] = self.items.ids
+
+        save_artifact(
+            path,
+            "item_model",
+            arrays,
+            meta={"method": self.method, "sparse": self.sparse},
+        )
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=False):
+        """
+        Load a model saved with save(), memory-mapped by default.
+        """
+
+        artifact = load_artifact(path, "item_model", mmap=mmap, verify=verify)
+        item_ids = artifact["item_ids"]
+        if artifact.meta["sparse"]:
+            weights = sp.csr_matrix(
+                (artifact["data"], artifact["indices"], artifact["indptr"]),
+                shape=(len(item_ids), len(item_ids)),
+            )
+        else:
+            weights = artifact["weights"]
+        return cls(item_ids, weights, artifact.meta["method"])
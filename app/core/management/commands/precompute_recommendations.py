@@ -0,0 +1,100 @@
+"""
+Precompute top-N recommendations for every user.
+"""
+
+import os
+import time
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.batch import BATCH_TOP_N, CHUNK_USERS, precompute_recommendations
+from core.models import UserRecommendation
+from core.recommender import RecommenderSystem
+from core.registry import COLLABORATIVE_MODEL_ARTIFACT, latest_version
+
+
+class Command(BaseCommand):
+    help = "Precompute and store top-N recommendations for every user"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-n",
+            type=int,
+            default=BATCH_TOP_N,
+            help="Recommendations stored per user",
+        )
+        parser.add_argument(
+            "--chunk-users",
+            type=int,
+            default=CHUNK_USERS,
+            help="Users scored per matrix product",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Worker processes (default: all cores)",
+        )
+        parser.add_argument(
+            "--version",
+            default=None,
+            help="Model version to score with (default: the published one)",
+        )
+        parser.add_argument(
+            "--model-path",
+            default=settings.RECOMMENDER_MODEL_PATH,
+            help="Directory holding the versioned model artifacts",
+        )
+        parser.add_argument(
+            "--snapshot",
+            default=settings.RECOMMENDER_SNAPSHOT_PATH,
+            help="Ratings snapshot of the rated movies to skip (falls back to the database)",
+        )
+
+    def handle(self, *args, **kwargs):
+        version = kwargs["version"] or latest_version(kwargs["model_path"])
+        model_path = os.path.join(
+            kwargs["model_path"], version, COLLABORATIVE_MODEL_ARTIFACT
+        )
+        self.stdout.write(f"Precomputing recommendations with model version {version}...")
+
+        rated_index = RecommenderSystem(snapshot_path=kwargs["snapshot"]).rated_index
+        started = time.monotonic()
+        n_users = 0
+
+        for user_ids, movie_ids, scores in precompute_recommendations(
+            model_path,
+            rated_index,
+            top_n=kwargs["top_n"],
+            chunk_users=kwargs["chunk_users"],
+            n_jobs=kwargs["jobs"],
+        ):
+            rows = []
+            for user_id, user_movies, user_scores in zip(user_ids, movie_ids, scores):
+                count = int(np.count_nonzero(user_movies >= 0))
+                rows.append(
+                    UserRecommendation(
+                        user_id=int(user_id),
+                        model_version=version,
+                        movie_ids=user_movies[:count].tobytes(),
+                        scores=user_scores[:count].tobytes(),
+                    )
+                )
+            UserRecommendation.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["user"],
+                update_fields=["model_version", "movie_ids", "scores", "updated_at"],
+            )
+            n_users += len(rows)
+
+        # Users the new model no longer covers fall back to live scoring
+        stale, _ = UserRecommendation.objects.exclude(model_version=version).delete()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored recommendations for {n_users} users in {elapsed:.1f}s "
+                f"({n_users / max(elapsed, 1e-9):.0f} users/s), removed {stale} stale."
+            )
+        )
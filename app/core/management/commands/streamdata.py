@@ -9,8 +9,19 @@ from core.stream import StreamRatingToDb
 class Command(BaseCommand):
     help = 'Streams MovieLens data into the database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="Worker processes copying byte ranges of ratings.csv (0: all cores)",
+        )
+
     def handle(self, *args, **options):
         streamer = StreamRatingToDb(
           path="/home/babsdevsys/recommendation-system/app/src/ml-32m/")
-        streamer.stream_ratings_to_db()
+        if options["jobs"] == 1:
+            streamer.stream_ratings_to_db()
+        else:
+            streamer.stream_ratings_parallel(n_jobs=options["jobs"] or None)
         self.stdout.write(self.style.SUCCESS('Successfully streamed data'))
@@ -1,18 +1,174 @@
+import os
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from core.als import ALS_FACTORS
+from core.ease import EASE_ITEMS, EASE_REG
+from core.implicit import IMPLICIT_ALPHA
+from core.itemknn import KNN_NEIGHBORS, KNN_SHRINKAGE
+from core.randomwalk import RP3_ALPHA, RP3_BETA
 from core.recommender import RecommenderSystem
+from core.registry import (
+    COLLABORATIVE_MODEL_ARTIFACT,
+    CONTENT_INDEX_ARTIFACT,
+    ITEM_MODEL_ARTIFACT,
+    new_version_dir,
+    publish_version,
+)
 
 
 class Command(BaseCommand):
     help = "Train and save recommendation models"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=50,
+            help="Number of neighbours kept per movie in the content index",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Worker processes for the content index and ALS (default: all cores)",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=["svd", "als", "implicit"],
+            default="svd",
+            help="Collaborative trainer: Surprise SVD, multi-core ALS or implicit ALS",
+        )
+        parser.add_argument(
+            "--factors",
+            type=int,
+            default=ALS_FACTORS,
+            help="Latent factors per user and movie (ALS engines only)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=None,
+            help="Alternating sweeps over users and movies (ALS engines only)",
+        )
+        parser.add_argument(
+            "--reg",
+            type=float,
+            default=None,
+            help="Regularisation strength (ALS engines only)",
+        )
+        parser.add_argument(
+            "--alpha",
+            type=float,
+            default=IMPLICIT_ALPHA,
+            help="Confidence gained per unit of implicit signal (implicit only)",
+        )
+        parser.add_argument(
+            "--item-model",
+            choices=["knn", "rp3beta", "ease"],
+            default=None,
+            help="Also train an item-to-item model with this method",
+        )
+        parser.add_argument(
+            "--neighbors",
+            type=int,
+            default=KNN_NEIGHBORS,
+            help="Neighbours kept per movie (knn and rp3beta only)",
+        )
+        parser.add_argument(
+            "--shrinkage",
+            type=float,
+            default=KNN_SHRINKAGE,
+            help="Similarity shrinkage for movies with few common raters (knn only)",
+        )
+        parser.add_argument(
+            "--walk-alpha",
+            type=float,
+            default=RP3_ALPHA,
+            help="Exponent on the random-walk transition probabilities (rp3beta only)",
+        )
+        parser.add_argument(
+            "--walk-beta",
+            type=float,
+            default=RP3_BETA,
+            help="Popularity penalty exponent, 0 for P3alpha (rp3beta only)",
+        )
+        parser.add_argument(
+            "--head-items",
+            type=int,
+            default=EASE_ITEMS,
+            help="Most rated movies covered by the dense model (ease only)",
+        )
+        parser.add_argument(
+            "--ease-reg",
+            type=float,
+            default=EASE_REG,
+            help="L2 regularisation added to the Gram diagonal (ease only)",
+        )
+        parser.add_argument(
+            "--model-path",
+            default=settings.RECOMMENDER_MODEL_PATH,
+            help="Directory holding the versioned model artifacts",
+        )
+        parser.add_argument(
+            "--snapshot",
+            default=settings.RECOMMENDER_SNAPSHOT_PATH,
+            help="Ratings snapshot to train from (falls back to the database)",
+        )
+
     def handle(self, *args, **kwargs):
-        recommender = RecommenderSystem()
+        model_path = kwargs["model_path"]
+        version, version_path = new_version_dir(model_path)
+        self.stdout.write(f"Training model version {version}...")
+
+        recommender = RecommenderSystem(snapshot_path=kwargs["snapshot"])
         self.stdout.write("Training content-based model...")
-        recommender.train_and_save_content_based_model()
+        recommender.train_and_save_content_based_model(
+            os.path.join(version_path, CONTENT_INDEX_ARTIFACT),
+            k=kwargs["top_k"],
+            n_jobs=kwargs["jobs"],
+        )
         self.stdout.write(self.style.SUCCESS("Content-based model trained and saved."))
 
         self.stdout.write("Training collaborative filtering model...")
-        recommender.train_and_save_collaborative_model()
+        train_options = {}
+        if kwargs["engine"] != "svd":
+            train_options = {"n_factors": kwargs["factors"], "n_jobs": kwargs["jobs"]}
+            if kwargs["iterations"] is not None:
+                train_options["n_iters"] = kwargs["iterations"]
+            if kwargs["reg"] is not None:
+                train_options["reg"] = kwargs["reg"]
+        if kwargs["engine"] == "implicit":
+            train_options["alpha"] = kwargs["alpha"]
+
+        recommender.train_and_save_collaborative_model(
+            os.path.join(version_path, COLLABORATIVE_MODEL_ARTIFACT),
+            engine=kwargs["engine"],
+            **train_options,
+        )
         self.stdout.write(
             self.style.SUCCESS("Collaborative filtering model trained and saved.")
         )
+
+        if kwargs["item_model"]:
+            self.stdout.write(f"Training {kwargs['item_model']} item-to-item model...")
+            item_options = {"n_jobs": kwargs["jobs"]}
+            if kwargs["item_model"] == "knn":
+                item_options["k"] = kwargs["neighbors"]
+                item_options["shrinkage"] = kwargs["shrinkage"]
+            elif kwargs["item_model"] == "rp3beta":
+                item_options["k"] = kwargs["neighbors"]
+                item_options["alpha"] = kwargs["walk_alpha"]
+                item_options["beta"] = kwargs["walk_beta"]
+            else:
+                item_options["n_items"] = kwargs["head_items"]
+                item_options["reg"] = kwargs["ease_reg"]
+
+            recommender.train_and_save_item_model(
+                os.path.join(version_path, ITEM_MODEL_ARTIFACT),
+                method=kwargs["item_model"],
+                **item_options,
+            )
+            self.stdout.write(self.style.SUCCESS("Item-to-item model trained and saved."))
+
+        publish_version(model_path, version)
+        self.stdout.write(self.style.SUCCESS(f"Published model version {version}."))
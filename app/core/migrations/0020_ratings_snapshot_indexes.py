@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_chathistory'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ratings',
+            index=models.Index(fields=['timestamp'], name='core_rating_timesta_ece82a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ratings',
+            index=models.Index(fields=['created_at'], name='core_rating_created_98b5b6_idx'),
+        ),
+    ]
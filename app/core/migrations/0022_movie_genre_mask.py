@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:38
+
+from django.db import migrations, models
+from core.genres import genre_mask
+
+
+def backfill_genre_masks(apps, schema_editor):
+    """
+    Set the mask of existing movies, one UPDATE per
+    distinct genres string.
+    """
+
+    Movie = apps.get_model("core", "Movie")
+    for genres in Movie.objects.values_list("genres", flat=True).distinct():
+        Movie.objects.filter(genres=genres).update(genre_mask=genre_mask(genres))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_user_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='genre_mask',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_genre_masks, migrations.RunPython.noop),
+    ]
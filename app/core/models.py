@@ -4,6 +4,7 @@ Django Database Models.
 
 import os
 import uuid
+import numpy as np
 from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import (
@@ -13,6 +14,7 @@ from django.contrib.auth.models import (
 )
 from decimal import Decimal
 from django.core.validators import MinValueValidator, MaxValueValidator
+from core.genres import genre_mask
 
 
 def user_image_file_path(instance, filename):
@@ -88,6 +90,7 @@ class Movie(models.Model):
     movie_id = models.IntegerField(unique=True, primary_key=True)
     title = models.CharField(max_length=255)
     genres = models.CharField(max_length=255, blank=True)
+    genre_mask = models.PositiveIntegerField(default=0, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     imdb_id = models.BigIntegerField(blank=True, null=True)
     tmdb_id = models.FloatField(blank=True, null=True)
@@ -102,6 +105,17 @@ class Movie(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Keep the genre bitmask in step with genres.
+        """
+
+        self.genre_mask = genre_mask(self.genres)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "genres" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "genre_mask"}
+        super().save(*args, **kwargs)
+
     def get_movie_id(self):
         """
         Returns the movie ID value for this movie instance.
@@ -131,6 +145,11 @@ class Ratings(models.Model):
         unique_together = ("user", "movie")
         verbose_name_plural = "Ratings"
         ordering = ["-timestamp"]
+        indexes = [
+            # High-water mark lookups for incremental snapshots
+            models.Index(fields=["timestamp"]),
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.user} rated {self.movie} {self.rating}"
@@ -232,3 +251,39 @@ class ChatHistory(models.Model):
 
     def __str__(self):
         return f"{self.user.email}: {self.message}"
+
+
+class UserRecommendation(models.Model):
+    """
+    Precomputed top-N recommendations for a user.
+    movie_ids and scores are packed int32 and
+    float32 arrays, best first.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="precomputed_recommendations",
+    )
+    model_version = models.CharField(max_length=32)
+    movie_ids = models.BinaryField()
+    scores = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "User Recommendations"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.model_version}"
+
+    def get_movie_ids(self):
+        """
+        Returns the recommended movie ids as an int32 array.
+        """
+        return np.frombuffer(self.movie_ids, dtype=np.int32)
+
+    def get_scores(self):
+        """
+        Returns the recommendation scores as a float32 array.
+        """
+        return np.frombuffer(self.scores, dtype=np.float32)
@@ -8,6 +8,8 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from surprise import Dataset, Reader, SVD
 from surprise.model_selection import train_test_split
+from core.interactions import InteractionMatrix
+from core.scoring import factor_model_for
 
 
 class RecommenderSystem:
@@ -23,6 +25,7 @@ class RecommenderSystem:
         self.engine = create_engine(db_uri)
         self.movies = self.load_movies()
         self.ratings = self.load_ratings()
+        self.rated_index = None
 
     def load_movies(self):
         """
@@ -95,20 +98,16 @@ class RecommenderSystem:
         user using collaborative filtering.
         """
 
-        all_movie_ids = self.ratings["movie_id"].unique()
-        rated_movie_ids = self.ratings[self.ratings["user_id"] == user_id]["movie_id"]
-        movies_not_rated = set(all_movie_ids) - set(rated_movie_ids)
+        # O(1) slice of the user's row in the CSR index
+        if self.rated_index is None:
+            self.rated_index = InteractionMatrix.from_dataframe(self.ratings)
+        rated_movie_ids = self.rated_index.rated_items(user_id)
 
-        predictions = [
-            (movie_id, svd_model.predict(user_id, movie_id).est)
-            for movie_id in movies_not_rated
-        ]
-
-        # Sort movies by predicted rating and select the top recommendations
-        predictions.sort(key=lambda x: x[1], reverse=True)
-        recommended_movie_ids = [movie_id for movie_id, _ in predictions[:top_n]]
+        # Score every movie with one matrix-vector product
+        factor_model = factor_model_for(svd_model)
+        recommended_movie_ids, _ = factor_model.recommend(
+            user_id, exclude=rated_movie_ids, top_n=top_n
+        )
 
-        recommended_movies = self.movies[
-            self.movies["movie_id"].isin(recommended_movie_ids)
-        ]
-        return recommended_movies["title"].tolist()
+        titles = self.movies.set_index("movie_id")["title"]
+        return titles.reindex(recommended_movie_ids).tolist()
@@ -0,0 +1,242 @@
+"""
+Process-wide registry of trained recommender models.
+
+Trained artifacts live in versioned directories under
+settings.RECOMMENDER_MODEL_PATH; a LATEST file names the
+version to serve. Each worker process loads that version
+once and every request reuses the already-fitted models.
+Workers re-read LATEST at most every RELOAD_CHECK_SECONDS
+and swap in a newly published version without a restart.
+Artifacts are memory-mapped, so workers share their pages.
+Checksums are verified once when a version is published;
+workers only re-verify with RECOMMENDER_VERIFY_ARTIFACTS,
+since hashing reads every page the mmap would leave lazy.
+
+Everything request paths read besides the models (the
+rated-item index, popularity order, title resolver and
+genre index) is built at load time from the ratings
+snapshot and the movie table, so no request falls back
+to reading the whole ratings table.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+import pandas as pd
+from django.conf import settings
+from core.artifacts import MANIFEST_FILE, verify_artifact
+from core.foldin import FoldIn
+from core.interactions import InteractionMatrix
+from core.itemmodel import ItemModel
+from core.models import Movie
+from core.recommender import RecommenderSystem
+from core.scoring import FactorModel
+from core.similarity import ContentSimilarityIndex
+from core.snapshot import SnapshotStore
+
+LATEST_FILE = "LATEST"
+CONTENT_INDEX_ARTIFACT = "content_index"
+COLLABORATIVE_MODEL_ARTIFACT = "collaborative_model"
+ITEM_MODEL_ARTIFACT = "item_model"
+RELOAD_CHECK_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+
+def new_version_dir(model_path):
+    """
+    Create and return (version, path) for a new
+    model version named after the current UTC time.
+    """
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    path = os.path.join(model_path, version)
+    os.makedirs(path, exist_ok=True)
+    return version, path
+
+
+def verify_version(version_path):
+    """
+    Check the checksums of every artifact in a version
+    directory, raising ValueError on a mismatch.
+    """
+
+    for name in sorted(os.listdir(version_path)):
+        artifact_path = os.path.join(version_path, name)
+        if os.path.exists(os.path.join(artifact_path, MANIFEST_FILE)):
+            verify_artifact(artifact_path)
+
+
+def publish_version(model_path, version):
+    """
+    Verify a trained version, then atomically
+    point LATEST at it.
+    """
+
+    verify_version(os.path.join(model_path, version))
+
+    tmp_path = os.path.join(model_path, f"{LATEST_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(model_path, LATEST_FILE))
+
+
+def latest_version(model_path):
+    """
+    Return the published model version.
+    """
+
+    latest_path = os.path.join(model_path, LATEST_FILE)
+    if not os.path.exists(latest_path):
+        raise FileNotFoundError(f"No trained model version found in {model_path}.")
+
+    with open(latest_path) as f:
+        return f.read().strip()
+
+
+def load_trained_models(content_model_path, collaborative_model_path, verify=False):
+    """
+    Open the content index and collaborative factor
+    artifacts. A missing collaborative artifact is
+    returned as None, a missing content index raises.
+    """
+
+    content_index = ContentSimilarityIndex.load(content_model_path, verify=verify)
+
+    collaborative_model = None
+    if collaborative_model_path and os.path.exists(collaborative_model_path):
+        collaborative_model = FactorModel.load(collaborative_model_path, verify=verify)
+    return content_index, collaborative_model
+
+
+def load_catalog():
+    """
+    Return the movie catalog as a DataFrame with movie_id,
+    title, genres and genre_mask columns.
+    """
+
+    columns = ["movie_id", "title", "genres", "genre_mask"]
+    return pd.DataFrame.from_records(Movie.objects.values_list(*columns), columns=columns)
+
+
+class ModelRegistry:
+    """
+    Loads the latest trained models once per
+    process and shares them between requests.
+    """
+
+    def __init__(self, model_path=None, snapshot_path=None):
+        self.model_path = model_path
+        self.snapshot_path = snapshot_path
+        self.version = None
+        self._recommender = None
+        self._lock = threading.Lock()
+        self._checked_at = time.monotonic()
+
+    def get_model_path(self):
+        return self.model_path or settings.RECOMMENDER_MODEL_PATH
+
+    def get_snapshot_path(self):
+        return self.snapshot_path or settings.RECOMMENDER_SNAPSHOT_PATH
+
+    def load(self, version=None):
+        """
+        Load a model version (the latest by default)
+        into a new RecommenderSystem. Raises
+        FileNotFoundError without a ratings snapshot.
+        """
+
+        model_path = self.get_model_path()
+        version = version or latest_version(model_path)
+        version_path = os.path.join(model_path, version)
+        verify = settings.RECOMMENDER_VERIFY_ARTIFACTS
+
+        store = SnapshotStore(self.get_snapshot_path())
+        if not store.exists():
+            raise FileNotFoundError(
+                f"No ratings snapshot found at {store.path}; run export_ratings before serving."
+            )
+
+        recommender = RecommenderSystem(snapshot_path=store.path)
+        recommender.model_version = version
+        recommender.content_index, recommender.svd_model = load_trained_models(
+            os.path.join(version_path, CONTENT_INDEX_ARTIFACT),
+            os.path.join(version_path, COLLABORATIVE_MODEL_ARTIFACT),
+            verify=verify,
+        )
+
+        item_model_path = os.path.join(version_path, ITEM_MODEL_ARTIFACT)
+        if os.path.exists(item_model_path):
+            recommender.item_model = ItemModel.load(item_model_path, verify=verify)
+
+        # Least-squares fold-in assumes explicit ratings
+        if recommender.svd_model is not None and not recommender.svd_model.implicit:
+            recommender.fold_in = FoldIn(recommender.svd_model, version)
+
+        # Rated-item index and popularity order, built once per load
+        recommender.rated_index = InteractionMatrix.from_snapshot(store.load())
+        recommender.popular_movie_ids
+
+        # Catalog lookups, from the ORM rather than the recommender's engine
+        recommender.movies = load_catalog()
+        recommender.titles
+        recommender.title_resolver
+        recommender.genre_index
+        return recommender
+
+    def published_version(self):
+        """
+        Return the version LATEST names when it differs from
+        the loaded one, reading it at most every
+        RELOAD_CHECK_SECONDS; otherwise None.
+        """
+
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return None
+        self._checked_at = now
+
+        try:
+            version = latest_version(self.get_model_path())
+        except FileNotFoundError:
+            return None
+        return version if version != self.version else None
+
+    def get_recommender(self):
+        """
+        Return the shared recommender, loading it on first
+        use and reloading it once a new version is published.
+        """
+
+        if self._recommender is None:
+            with self._lock:
+                if self._recommender is None:
+                    self._recommender = self.load()
+                    self.version = self._recommender.model_version
+                    self._checked_at = time.monotonic()
+            return self._recommender
+
+        version = self.published_version()
+        if version is not None:
+            # Keep serving the loaded version if the new one cannot be loaded
+            try:
+                self.reload(version)
+            except (FileNotFoundError, ValueError):
+                logger.exception("Could not load published model version %s.", version)
+        return self._recommender
+
+    def reload(self, version=None):
+        """
+        Swap in a freshly loaded model version.
+        """
+
+        recommender = self.load(version)
+        with self._lock:
+            self._recommender = recommender
+            self.version = recommender.model_version
+        return recommender
+
+
+registry = ModelRegistry()
@@ -0,0 +1,207 @@
+"""
+Vectorised scoring for latent factor models.
+
+The user/item factors and biases of a trained Surprise
+SVD are pulled into NumPy arrays once, so scoring every
+movie for a user is a single matrix-vector product
+instead of one svd.predict() call per movie.
+"""
+
+import weakref
+from datetime import datetime
+import numpy as np
+from core.artifacts import load_artifact, save_artifact
+from core.idmap import IdMap
+
+# Surprise model -> FactorModel, converted once per trained model
+_factor_models = weakref.WeakKeyDictionary()
+
+
+def top_n_indices(scores, top_n):
+    """
+    Return the indices of the top_n highest scores,
+    best first. Entries set to -inf are never returned.
+    """
+
+    candidates = np.flatnonzero(scores > -np.inf)
+    if len(candidates) == 0 or top_n <= 0:
+        return candidates[:0]
+
+    if len(candidates) > top_n:
+        part = np.argpartition(-scores[candidates], top_n - 1)[:top_n]
+        candidates = candidates[part]
+
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order]
+
+
+class FactorModel:
+    """
+    Biased matrix factorisation model held in NumPy arrays:
+    est(u, i) = global_mean + bu[u] + bi[i] + qi[i] . pu[u]
+    Implicit models have zero biases and mean and score
+    preferences, which are not clipped to a rating scale.
+    """
+
+    def __init__(
+        self,
+        user_ids,
+        item_ids,
+        user_factors,
+        item_factors,
+        user_bias,
+        item_bias,
+        global_mean,
+        rating_scale=(1, 5),
+        implicit=False,
+        high_water_mark=None,
+    ):
+        self.users = user_ids if isinstance(user_ids, IdMap) else IdMap(user_ids)
+        self.items = item_ids if isinstance(item_ids, IdMap) else IdMap(item_ids)
+        self.user_factors = user_factors
+        self.item_factors = item_factors
+        self.user_bias = user_bias
+        self.item_bias = item_bias
+        self.global_mean = float(global_mean)
+        self.rating_scale = tuple(rating_scale) if rating_scale else None
+        self.implicit = implicit
+        # Latest rating change the training data covered
+        self.high_water_mark = high_water_mark
+
+    @classmethod
+    def from_surprise(cls, algo):
+        """
+        Extract pu, qi, bu, bi and the global mean
+        from a fitted Surprise SVD model.
+        """
+
+        trainset = algo.trainset
+        user_ids = np.empty(trainset.n_users, dtype=np.int64)
+        user_ids[list(trainset._raw2inner_id_users.values())] = list(
+            trainset._raw2inner_id_users.keys()
+        )
+        item_ids = np.empty(trainset.n_items, dtype=np.int64)
+        item_ids[list(trainset._raw2inner_id_items.values())] = list(
+            trainset._raw2inner_id_items.keys()
+        )
+
+        if algo.biased:
+            user_bias, item_bias = algo.bu, algo.bi
+            global_mean = trainset.global_mean
+        else:
+            user_bias = np.zeros(trainset.n_users)
+            item_bias = np.zeros(trainset.n_items)
+            global_mean = 0.0
+
+        return cls(
+            user_ids,
+            item_ids,
+            np.asarray(algo.pu, dtype=np.float32),
+            np.asarray(algo.qi, dtype=np.float32),
+            np.asarray(user_bias, dtype=np.float32),
+            np.asarray(item_bias, dtype=np.float32),
+            global_mean,
+            trainset.rating_scale,
+        )
+
+    def save(self, path):
+        """
+        Save the factors as a model artifact directory.
+        """
+
+        save_artifact(
+            path,
+            "factor_model",
+            {
+                "user_ids": self.users.ids,
+                "item_ids": self.items.ids,
+                "user_factors": self.user_factors,
+                "item_factors": self.item_factors,
+                "user_bias": self.user_bias,
+                "item_bias": self.item_bias,
+            },
+            meta={
+                "global_mean": self.global_mean,
+                "rating_scale": list(self.rating_scale) if self.rating_scale else None,
+                "implicit": self.implicit,
+                "high_water_mark": self.high_water_mark.isoformat() if self.high_water_mark else None,
+            },
+        )
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=False):
+        """
+        Load factors saved with save(), memory-mapped by default.
+        """
+
+        artifact = load_artifact(path, "factor_model", mmap=mmap, verify=verify)
+        high_water_mark = artifact.meta.get("high_water_mark")
+        return cls(
+            artifact["user_ids"],
+            artifact["item_ids"],
+            artifact["user_factors"],
+            artifact["item_factors"],
+            artifact["user_bias"],
+            artifact["item_bias"],
+            artifact.meta["global_mean"],
+            artifact.meta["rating_scale"],
+            artifact.meta.get("implicit", False),
+            datetime.fromisoformat(high_water_mark) if high_water_mark else None,
+        )
+
+    def user_vector(self, user_id):
+        """
+        Return (factors, bias) for a user, or
+        (None, 0.0) when the user is unknown.
+        """
+
+        idx = self.users.index(user_id)
+        if idx < 0:
+            return None, 0.0
+        return self.user_factors[idx], float(self.user_bias[idx])
+
+    def score_items(self, factors=None, bias=0.0):
+        """
+        Predicted rating of every item for a user given
+        by their latent factors (None for unknown users).
+        """
+
+        scores = self.item_bias + np.float32(self.global_mean + bias)
+        if factors is not None:
+            scores = scores + self.item_factors @ factors
+        if self.rating_scale is None:
+            return scores
+        return np.clip(scores, *self.rating_scale)
+
+    def recommend(self, user_id, exclude=None, top_n=10, vector=None):
+        """
+        Return (movie_ids, scores) of the top_n movies for
+        a user, skipping the raw movie ids in exclude. A
+        (factors, bias) vector overrides the trained one.
+        """
+
+        factors, bias = vector if vector is not None else self.user_vector(user_id)
+        scores = self.score_items(factors, bias)
+
+        if exclude is not None and len(exclude):
+            excluded = self.items.indices(exclude)
+            scores[excluded[excluded >= 0]] = -np.inf
+
+        top = top_n_indices(scores, top_n)
+        return self.items.ids[top], scores[top]
+
+
+def factor_model_for(algo):
+    """
+    Return the FactorModel for a trained model,
+    converting a Surprise model only once.
+    """
+
+    if isinstance(algo, FactorModel):
+        return algo
+
+    model = _factor_models.get(algo)
+    if model is None:
+        model = FactorModel.from_surprise(algo)
+        _factor_models[algo] = model
+    return model
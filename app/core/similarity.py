@@ -0,0 +1,288 @@
+"""
+Precomputed top-K content similarity index.
+
+The index is built offline from the movie genres and
+stores, for every movie, the ids and cosine scores of
+its K most similar movies. Queries are a single array
+lookup instead of a TF-IDF fit and an N x N matrix.
+
+Building walks the catalog in row blocks on a process
+pool; each worker only ever holds one dense block of
+similarities, so peak memory is bounded by the block
+size rather than the size of the catalog.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from core.artifacts import load_artifact, save_artifact
+from core.scoring import top_n_indices
+
+# Upper bound for the working set of one row block (per worker)
+DEFAULT_BLOCK_BYTES = 256 * 1024 * 1024
+
+# Sparse product, dense float32 copy and int64 argpartition per cell
+BYTES_PER_CELL = 24
+
+# Matrices and scalings shared with pool workers, set once by the initializer
+_worker_state = None
+
+
+def genre_tfidf_matrix(genres):
+    """
+    Build the L2-normalised TF-IDF matrix
+    (sparse CSR, float32) for a genres series.
+    """
+
+    documents = genres.fillna("").str.replace("|", " ", regex=False)
+    tfidf = TfidfVectorizer(stop_words="english", dtype=np.float32)
+    return tfidf.fit_transform(documents).tocsr()
+
+
+def topk_block(
+    matrix, start, stop, k, norms=None, shrinkage=0.0, right=None, column_scale=None
+):
+    """
+    Compute the top-k neighbours of rows [start, stop)
+    of a normalised CSR matrix against every row.
+    Given the row norms of an unnormalised matrix, the
+    dot products are divided by norm_i * norm_j + shrinkage
+    instead. A right matrix with the same rows replaces
+    matrix.T in the product, and column_scale multiplies
+    each column. Returns (neighbors, scores) with -1
+    padding when the catalog has fewer than k other movies.
+    """
+
+    right = matrix if right is None else right
+    sims = (matrix[start:stop] @ right.T).toarray()
+    if norms is not None:
+        denominator = np.outer(norms[start:stop], norms)
+        denominator += shrinkage
+        sims /= denominator
+    if column_scale is not None:
+        sims *= column_scale
+
+    # Negated so that argpartition puts the best scores first
+    np.negative(sims, out=sims)
+    rows = np.arange(stop - start)
+
+    # A movie is never its own neighbour
+    sims[rows, rows + start] = np.inf
+
+    n_cols = sims.shape[1]
+    kk = min(k, n_cols - 1)
+    neighbors = np.full((stop - start, k), -1, dtype=np.int32)
+    scores = np.zeros((stop - start, k), dtype=np.float32)
+    if kk <= 0:
+        return neighbors, scores
+
+    top = np.argpartition(sims, kk - 1, axis=1)[:, :kk]
+    top_scores = np.take_along_axis(sims, top, axis=1)
+    order = np.argsort(top_scores, axis=1, kind="stable")
+
+    neighbors[:, :kk] = np.take_along_axis(top, order, axis=1)
+    scores[:, :kk] = -np.take_along_axis(top_scores, order, axis=1)
+    return neighbors, scores
+
+
+def block_size_for(n_rows, max_block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    Number of rows whose similarity block against
+    n_rows columns fits the per-worker budget.
+    """
+
+    row_bytes = BYTES_PER_CELL * max(n_rows, 1)
+    return max(1, min(n_rows, max_block_bytes // row_bytes))
+
+
+def row_norms(matrix):
+    """
+    L2 norm of every row of a CSR matrix, as float32.
+    """
+
+    return np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1.astype(np.float32)
+
+
+def _init_worker(state):
+    global _worker_state
+    _worker_state = state
+
+
+def _worker_topk_block(args):
+    start, stop, k = args
+    return start, topk_block(start=start, stop=stop, k=k, **_worker_state)
+
+
+def build_topk(
+    matrix, k, block_size=None, n_jobs=None, shrinkage=None, right=None, column_scale=None
+):
+    """
+    Compute the top-k neighbours of every row of a
+    normalised CSR matrix, one row block at a time,
+    across a pool of n_jobs worker processes. With a
+    shrinkage the matrix may be unnormalised and the
+    cosine is shrunk towards zero for sparse overlaps.
+    right and column_scale are passed to topk_block.
+    """
+
+    n_rows = matrix.shape[0]
+    if block_size is None:
+        block_size = block_size_for(n_rows)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    state = {
+        "matrix": matrix,
+        "norms": row_norms(matrix) if shrinkage is not None else None,
+        "shrinkage": shrinkage or 0.0,
+        "right": right,
+        "column_scale": column_scale,
+    }
+    neighbors = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float32)
+    blocks = [
+        (start, min(start + block_size, n_rows), k)
+        for start in range(0, n_rows, block_size)
+    ]
+
+    if n_jobs <= 1 or len(blocks) <= 1:
+        for start, stop, _ in blocks:
+            neighbors[start:stop], scores[start:stop] = topk_block(
+                start=start, stop=stop, k=k, **state
+            )
+        return neighbors, scores
+
+    with ProcessPoolExecutor(
+        max_workers=min(n_jobs, len(blocks)),
+        initializer=_init_worker,
+        initargs=(state,),
+    ) as executor:
+        for start, (block_neighbors, block_scores) in executor.map(
+            _worker_topk_block, blocks
+        ):
+            stop = start + len(block_neighbors)
+            neighbors[start:stop] = block_neighbors
+            scores[start:stop] = block_scores
+
+    return neighbors, scores
+
+
+class ContentSimilarityIndex:
+    """
+    Persisted movie_id -> top-K neighbours index.
+    Rows are ordered by ascending movie_id so a
+    lookup is a binary search on movie_ids.
+    """
+
+    def __init__(self, movie_ids, neighbors, scores):
+        self.movie_ids = np.asarray(movie_ids)
+        self.neighbors = neighbors
+        self.scores = scores
+
+    @property
+    def k(self):
+        return self.neighbors.shape[1]
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    @classmethod
+    def build(cls, movies, k=50, block_size=None, n_jobs=None):
+        """
+        Build the index from a DataFrame with 'movie_id'
+        and 'genres' columns, covering the whole catalog.
+        """
+
+        movies = movies.sort_values("movie_id").reset_index(drop=True)
+        matrix = genre_tfidf_matrix(movies["genres"])
+        neighbors, scores = build_topk(
+            matrix, k, block_size=block_size, n_jobs=n_jobs
+        )
+        return cls(movies["movie_id"].to_numpy(np.int64), neighbors, scores)
+
+    def position(self, movie_id):
+        """
+        Return the row of a movie_id, or None
+        when the movie is not in the index.
+        """
+
+        pos = int(np.searchsorted(self.movie_ids, movie_id))
+        if pos < len(self.movie_ids) and self.movie_ids[pos] == movie_id:
+            return pos
+        return None
+
+    def similar(self, movie_id, top_n=10):
+        """
+        Return (movie_ids, scores) of the top_n
+        most similar movies to movie_id.
+        """
+
+        pos = self.position(movie_id)
+        if pos is None:
+            raise ValueError(f"Movie id {movie_id} is not in the similarity index.")
+        if top_n <= 0:
+            return self.movie_ids[:0], self.scores[pos, :0]
+
+        top_n = min(top_n, self.k)
+        rows = self.neighbors[pos, :top_n]
+        valid = rows >= 0
+        return self.movie_ids[rows[valid]], self.scores[pos, :top_n][valid]
+
+    def similar_to_many(self, movie_ids, top_n=10, weights=None):
+        """
+        Return (movie_ids, scores) of the top_n movies most
+        similar to a set of seed movies: the union of the
+        seeds' neighbour rows, scores summed per movie
+        (optionally weighted per seed), seeds removed.
+        Seeds missing from the index are ignored.
+        """
+
+        if top_n <= 0:
+            return self.movie_ids[:0], np.empty(0, dtype=np.float32)
+
+        movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        if weights is None:
+            weights = np.ones(len(movie_ids), dtype=np.float32)
+        weights = np.asarray(weights, dtype=np.float32)
+
+        pos = np.searchsorted(self.movie_ids, movie_ids).clip(max=max(len(self) - 1, 0))
+        known = (len(self) > 0) & (self.movie_ids[pos] == movie_ids)
+        pos, weights = pos[known], weights[known]
+
+        rows = np.asarray(self.neighbors[pos])
+        scores = np.asarray(self.scores[pos]) * weights[:, None]
+        keep = (rows >= 0) & ~np.isin(rows, pos)
+        if not keep.any():
+            return self.movie_ids[:0], np.empty(0, dtype=np.float32)
+
+        union, inverse = np.unique(rows[keep], return_inverse=True)
+        totals = np.bincount(inverse, weights=scores[keep]).astype(np.float32)
+
+        top = top_n_indices(totals, top_n)
+        return self.movie_ids[union[top]], totals[top]
+
+    def save(self, path):
+        """
+        Save the index as a model artifact directory.
+        """
+
+        save_artifact(
+            path,
+            "content_index",
+            {
+                "movie_ids": self.movie_ids,
+                "neighbors": self.neighbors,
+                "scores": self.scores,
+            },
+            meta={"k": self.k},
+        )
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=False):
+        """
+        Load an index saved with save(), memory-mapped by default.
+        """
+
+        artifact = load_artifact(path, "content_index", mmap=mmap, verify=verify)
+        return cls(artifact["movie_ids"], artifact["neighbors"], artifact["scores"])
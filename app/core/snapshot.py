@@ -0,0 +1,360 @@
+"""
+Columnar snapshot of the ratings table for training.
+
+core_ratings is streamed out with COPY TO, raw user and
+movie ids are remapped to dense int32 indices and ratings
+are stored as int8 half-stars (rating * 2). The result is
+saved as a memory-mappable model artifact, so training
+never materialises 32M rows of Python Decimal objects.
+
+A snapshot directory holds a full "base" segment and
+any number of "delta-NNNNN" segments. Each segment
+records the high-water mark of Ratings.timestamp and
+created_at it has seen, so a delta export only copies
+rows added or changed since the previous segment.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from django.db import connection, transaction
+from core.artifacts import MANIFEST_FILE, load_artifact, save_artifact
+from core.idmap import IdMap
+
+BASE_SEGMENT = "base"
+DELTA_PREFIX = "delta-"
+
+# Rows committed late by in-flight transactions are re-read
+# from this far behind the high-water mark; duplicates are
+# resolved when the segments are merged.
+DELTA_OVERLAP = timedelta(minutes=5)
+
+RATINGS_COPY_SQL = """
+    COPY (
+        SELECT user_id, movie_id, (rating * 2)::smallint
+        FROM core_ratings
+        {where}
+    ) TO STDOUT WITH CSV
+"""
+
+HIGH_WATER_MARK_SQL = """
+    SELECT GREATEST(MAX(timestamp), MAX(created_at))
+    FROM core_ratings
+"""
+
+CHANGED_SINCE_SQL = "WHERE timestamp > %s OR created_at > %s"
+
+
+def read_copy_chunks(copy_file, chunk_rows):
+    """
+    Parse the CSV written by COPY TO in chunks of
+    (user_ids int64, movie_ids int64, half_stars int8).
+    """
+
+    reader = pd.read_csv(
+        copy_file,
+        header=None,
+        names=["user_id", "movie_id", "half_stars"],
+        dtype={"user_id": np.int64, "movie_id": np.int64, "half_stars": np.int8},
+        chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        yield (
+            chunk["user_id"].to_numpy(),
+            chunk["movie_id"].to_numpy(),
+            chunk["half_stars"].to_numpy(),
+        )
+
+
+def copy_ratings(since=None, chunk_rows=1_000_000):
+    """
+    Stream (user_ids, movie_ids, half_stars) out of core_ratings
+    with COPY TO, optionally only rows changed after since.
+    Returns the columns and the high-water mark they cover.
+    """
+
+    user_chunks, movie_chunks, rating_chunks = [], [], []
+    with tempfile.TemporaryFile(mode="w+") as copy_file:
+        # One REPEATABLE READ transaction, so the high-water
+        # mark describes exactly the rows that were copied.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                cursor.execute(HIGH_WATER_MARK_SQL)
+                high_water_mark = cursor.fetchone()[0]
+
+                where = ""
+                if since is not None:
+                    where = cursor.mogrify(CHANGED_SINCE_SQL, [since, since])
+                    if isinstance(where, bytes):
+                        where = where.decode()
+                cursor.copy_expert(RATINGS_COPY_SQL.format(where=where), copy_file)
+        copy_file.seek(0)
+
+        for user_ids, movie_ids, half_stars in read_copy_chunks(copy_file, chunk_rows):
+            user_chunks.append(user_ids)
+            movie_chunks.append(movie_ids)
+            rating_chunks.append(half_stars)
+
+    if not user_chunks:
+        empty = np.empty(0, np.int64)
+        return empty, empty, np.empty(0, np.int8), high_water_mark
+
+    return (
+        np.concatenate(user_chunks),
+        np.concatenate(movie_chunks),
+        np.concatenate(rating_chunks),
+        high_water_mark,
+    )
+
+
+class RatingsSnapshot:
+    """
+    Ratings as parallel columns of dense user
+    indices, item indices and half-star ratings.
+    """
+
+    def __init__(self, users, items, user_idx, item_idx, half_stars, meta=None):
+        self.users = users if isinstance(users, IdMap) else IdMap(users)
+        self.items = items if isinstance(items, IdMap) else IdMap(items)
+        self.user_idx = user_idx
+        self.item_idx = item_idx
+        self.half_stars = half_stars
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.user_idx)
+
+    @property
+    def n_users(self):
+        return len(self.users)
+
+    @property
+    def n_items(self):
+        return len(self.items)
+
+    @property
+    def ratings(self):
+        """
+        Ratings on the original 0.5-5.0 scale as float32.
+        """
+
+        return self.half_stars.astype(np.float32) / 2
+
+    @property
+    def high_water_mark(self):
+        """
+        Latest Ratings.timestamp/created_at covered, or None.
+        """
+
+        value = self.meta.get("high_water_mark")
+        return datetime.fromisoformat(value) if value else None
+
+    @classmethod
+    def from_raw(cls, user_ids, movie_ids, half_stars, meta=None, users=None, items=None):
+        """
+        Build a snapshot from raw id columns. New ids are
+        appended to the given id maps (or to new ones in
+        id order) so existing dense indices never move.
+        """
+
+        users = (users or IdMap([])).extend(user_ids)
+        items = (items or IdMap([])).extend(movie_ids)
+        return cls(
+            users,
+            items,
+            users.indices(user_ids).astype(np.int32),
+            items.indices(movie_ids).astype(np.int32),
+            np.asarray(half_stars, dtype=np.int8),
+            meta,
+        )
+
+    @classmethod
+    def export(cls, since=None, users=None, items=None, chunk_rows=1_000_000):
+        """
+        Stream core_ratings out of PostgreSQL with COPY TO and
+        build a snapshot of every row, or only of the rows
+        added or changed after since.
+        """
+
+        user_ids, movie_ids, half_stars, high_water_mark = copy_ratings(
+            since, chunk_rows
+        )
+        meta = {
+            "high_water_mark": high_water_mark.isoformat() if high_water_mark else None,
+            "since": since.isoformat() if since else None,
+        }
+        return cls.from_raw(user_ids, movie_ids, half_stars, meta, users, items)
+
+    @classmethod
+    def merge(cls, segments):
+        """
+        Concatenate segments in order. The id maps of the
+        last segment cover every earlier one; for ratings
+        present in several segments the last one wins.
+        """
+
+        if len(segments) == 1:
+            return segments[0]
+
+        last = segments[-1]
+        user_idx = np.concatenate([s.user_idx for s in segments])
+        item_idx = np.concatenate([s.item_idx for s in segments])
+        half_stars = np.concatenate([s.half_stars for s in segments])
+
+        # Compact int64 (user, item) keys; unique on the reversed
+        # columns keeps the last occurrence of every pair
+        keys = user_idx.astype(np.int64) * last.n_items + item_idx
+        _, first_reversed = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(len(keys) - 1 - first_reversed)
+
+        return cls(
+            last.users,
+            last.items,
+            user_idx[keep],
+            item_idx[keep],
+            half_stars[keep],
+            {"high_water_mark": last.meta.get("high_water_mark")},
+        )
+
+    def to_dataframe(self):
+        """
+        Return (user_id, movie_id, rating) with raw ids,
+        as expected by Surprise's Dataset.load_from_df.
+        """
+
+        return pd.DataFrame(
+            {
+                "user_id": self.users.ids[self.user_idx],
+                "movie_id": self.items.ids[self.item_idx],
+                "rating": self.ratings,
+            }
+        )
+
+    def save(self, path):
+        """
+        Save the snapshot as a model artifact directory.
+        """
+
+        save_artifact(
+            path,
+            "ratings_snapshot",
+            {
+                "user_ids": self.users.ids,
+                "movie_ids": self.items.ids,
+                "user_idx": self.user_idx,
+                "item_idx": self.item_idx,
+                "half_stars": self.half_stars,
+            },
+            meta={
+                **self.meta,
+                "n_users": self.n_users,
+                "n_items": self.n_items,
+                "n_ratings": len(self),
+            },
+        )
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a snapshot saved with save(), memory-mapped by default.
+        """
+
+        artifact = load_artifact(path, "ratings_snapshot", mmap=mmap)
+        return cls(
+            artifact["user_ids"],
+            artifact["movie_ids"],
+            artifact["user_idx"],
+            artifact["item_idx"],
+            artifact["half_stars"],
+            artifact.meta,
+        )
+
+
+class SnapshotStore:
+    """
+    A snapshot directory made of a base segment
+    followed by incremental delta segments.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(os.path.join(self.path, BASE_SEGMENT, MANIFEST_FILE))
+
+    def segment_paths(self):
+        """
+        Return the complete segments, base first.
+        """
+
+        if not self.exists():
+            return []
+
+        deltas = sorted(
+            name
+            for name in os.listdir(self.path)
+            if name.startswith(DELTA_PREFIX)
+            and os.path.exists(os.path.join(self.path, name, MANIFEST_FILE))
+        )
+        return [os.path.join(self.path, name) for name in [BASE_SEGMENT] + deltas]
+
+    def load(self, mmap=True):
+        """
+        Load every segment and merge them into one snapshot.
+        """
+
+        paths = self.segment_paths()
+        if not paths:
+            raise FileNotFoundError(f"No ratings snapshot found at {self.path}.")
+        return RatingsSnapshot.merge([RatingsSnapshot.load(p, mmap) for p in paths])
+
+    def export_full(self, chunk_rows=1_000_000):
+        """
+        Export every rating into a new base segment,
+        replacing the previous base and its deltas.
+        """
+
+        os.makedirs(self.path, exist_ok=True)
+        snapshot = RatingsSnapshot.export(chunk_rows=chunk_rows)
+
+        new_base = os.path.join(self.path, f"{BASE_SEGMENT}.new")
+        old_base = os.path.join(self.path, f"{BASE_SEGMENT}.old")
+        shutil.rmtree(new_base, ignore_errors=True)
+        snapshot.save(new_base)
+
+        stale = self.segment_paths()
+        if stale:
+            os.replace(stale[0], old_base)
+        os.replace(new_base, os.path.join(self.path, BASE_SEGMENT))
+        for path in [old_base] + stale[1:]:
+            shutil.rmtree(path, ignore_errors=True)
+        return snapshot
+
+    def export_delta(self, chunk_rows=1_000_000, overlap=DELTA_OVERLAP):
+        """
+        Append a delta segment holding only the ratings added
+        or changed since the last segment's high-water mark.
+        Deleted ratings are only dropped by a full export.
+        """
+
+        paths = self.segment_paths()
+        if not paths:
+            return self.export_full(chunk_rows)
+
+        last = RatingsSnapshot.load(paths[-1])
+        since = last.high_water_mark
+        if since is not None:
+            since -= overlap
+
+        delta = RatingsSnapshot.export(
+            since, users=last.users, items=last.items, chunk_rows=chunk_rows
+        )
+        if len(delta) == 0:
+            return delta
+
+        delta.save(os.path.join(self.path, f"{DELTA_PREFIX}{len(paths):05d}"))
+        return delta
@@ -2,31 +2,163 @@
 This Module streams the ratings
 data directly into the PostgreSQL
 database using the COPY command.
+
+The parallel mode splits ratings.csv into newline-aligned
+byte ranges; each worker process opens its own database
+connection and converts and copies its range concurrently.
 """
 
 import csv
-import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from django.db import connection
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import connection, connections
 from django.contrib.auth import get_user_model
+from core.copyio import IteratorFile, csv_lines
+
+# One statement per chunk: users missing from the table are
+# created with a placeholder email and an unusable password
+# (no hashing), then the id sequence is moved past them.
+CREATE_USERS_SQL = """
+    INSERT INTO {table} (id, password, is_superuser, email, name, is_active, is_staff)
+    SELECT ids.id, %s || md5(random()::text), false,
+           'user_' || ids.id || '@example.com', '', true, false
+    FROM unnest(%s::bigint[]) AS ids(id)
+    ON CONFLICT DO NOTHING
+"""
 
+SYNC_USER_SEQUENCE_SQL = """
+    SELECT setval(
+        pg_get_serial_sequence('{table}', 'id'),
+        GREATEST((SELECT MAX(id) FROM {table}), 1)
+    )
+"""
 
-class StreamRatingToDb:
-    def __init__(self, path=""):
-        self.path = path
 
-    def create_user(self, user_id):
-        """
-        Create a new user in the database.
+def create_missing_users(cursor, user_ids):
+    """
+    Create every user id not in the user table yet,
+    in one set-based INSERT ... ON CONFLICT DO NOTHING.
+    """
+
+    table = get_user_model()._meta.db_table
+    cursor.execute(
+        CREATE_USERS_SQL.format(table=table),
+        [UNUSABLE_PASSWORD_PREFIX, sorted(set(user_ids))],
+    )
+    cursor.execute(SYNC_USER_SEQUENCE_SQL.format(table=table))
+
+
+def copy_rating_chunk(cursor, chunk):
+    """
+    Create the chunk's missing users, convert its unix
+    timestamps and COPY the rows into core_ratings.
+    """
+
+    # Missing users of the chunk, in one statement
+    create_missing_users(cursor, [int(row[0]) for row in chunk])
+
+    # Timestamps are converted lazily as COPY reads the rows
+    created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = (
+        [
+            user_id,
+            movie_id,
+            rating,
+            datetime.utcfromtimestamp(int(timestamp)).strftime('%Y-%m-%d %H:%M:%S'),
+            created_at,
+        ]
+        for user_id, movie_id, rating, timestamp in chunk
+    )
+
+    # Stream the converted chunk to the database
+    cursor.copy_expert(
         """
+        COPY core_ratings
+        (user_id, movie_id, rating, timestamp, created_at)
+        FROM STDIN WITH CSV
+        """,
+        IteratorFile(csv_lines(rows)),
+    )
+
+
+def line_ranges(file_path, n_parts):
+    """
+    Split a CSV file after its header into at most
+    n_parts (start, stop) byte ranges that each begin
+    and end on a line boundary.
+    """
+
+    with open(file_path, "rb") as f:
+        start = len(f.readline())
+        size = os.fstat(f.fileno()).st_size
+
+        bounds = [start]
+        for part in range(1, n_parts):
+            # Step back one byte so a range already ending
+            # on a newline keeps its boundary
+            f.seek(max(start + (size - start) * part // n_parts - 1, bounds[-1]))
+            f.readline()
+            bounds.append(max(f.tell(), bounds[-1]))
+        bounds.append(size)
+
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+
+
+def read_range(file_path, start, stop):
+    """
+    Yield the decoded lines of a file between two
+    line-aligned byte offsets.
+    """
+
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < stop:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode()
+
+
+def copy_ratings_range(task):
+    """
+    Worker: COPY the ratings in one byte range of
+    ratings.csv over this process's own connection
+    and report its throughput.
+    """
+
+    file_path, start, stop, chunk_size = task
+    started = time.monotonic()
+    n_rows = 0
+
+    try:
+        with connection.cursor() as cursor:
+            lines = read_range(file_path, start, stop)
+            while True:
+                chunk = list(csv.reader(itertools.islice(lines, chunk_size)))
+                if not chunk:
+                    break
+                copy_rating_chunk(cursor, chunk)
+                n_rows += len(chunk)
+    finally:
+        connection.close()
+
+    elapsed = time.monotonic() - started
+    print(
+        f"Worker {os.getpid()} [{start}, {stop}): {n_rows} rows in "
+        f"{elapsed:.1f}s ({n_rows / max(elapsed, 1e-9):.0f} rows/s)"
+    )
+    return n_rows, elapsed
+
 
-        User = get_user_model()
-        email = f"user_{user_id}@example.com"
-        user = User.objects.create_user(
-            id=user_id,
-            email=email,
-        )
-        return user
+class StreamRatingToDb:
+    def __init__(self, path=""):
+        self.path = path
 
     def check_rating_exists(self, user_id, movie_id):
         """
@@ -70,41 +202,7 @@ class StreamRatingToDb:
                         if not chunk:
                             break
 
-                        # Convert timestamps and write to in-memory file
-                        csv_buffer = io.StringIO()
-                        writer = csv.writer(csv_buffer)
-
-                        # Write header
-                        writer.writerow(
-                          ['user_id',
-                           'movie_id',
-                           'rating',
-                           'timestamp',
-                           'created_at'])
-
-                        for row in chunk:
-                            user_id = int(row[0])
-                            self.create_user(user_id)
-                            row[3] = datetime.utcfromtimestamp(
-                              int(row[3])).strftime('%Y-%m-%d %H:%M:%S')
-                            created_at = datetime.now().strftime(
-                              '%Y-%m-%d %H:%M:%S')
-                            row.append(created_at)
-
-                            writer.writerow(row)
-
-                        # Move to the beginning of the in-memory file
-                        csv_buffer.seek(0)
-
-                        # Stream the modified chunk to the database
-                        cursor.copy_expert(
-                            """
-                            COPY core_ratings
-                            (user_id, movie_id, rating, timestamp, created_at)
-                            FROM STDIN WITH CSV HEADER
-                            """,
-                            csv_buffer
-                        )
+                        copy_rating_chunk(cursor, chunk)
 
                         print(f"Inserted {len(chunk)} rows...")
 
@@ -112,3 +210,36 @@ class StreamRatingToDb:
 
         except Exception as e:
             print(f"An error occurred: {e}")
+
+    def stream_ratings_parallel(self, n_jobs=None, chunk_size=10000):
+        """
+        Stream ratings with n_jobs worker processes (default:
+        all cores), each copying its own newline-aligned byte
+        range of ratings.csv over its own connection.
+        """
+
+        file_path = f"{self.path}/ratings.csv"
+        n_jobs = n_jobs or os.cpu_count() or 1
+
+        try:
+            tasks = [
+                (file_path, start, stop, chunk_size)
+                for start, stop in line_ranges(file_path, n_jobs)
+            ]
+
+            # Forked workers must open their own connections
+            connections.close_all()
+
+            started = time.monotonic()
+            with ProcessPoolExecutor(max_workers=max(len(tasks), 1)) as executor:
+                results = list(executor.map(copy_ratings_range, tasks))
+
+            n_rows = sum(rows for rows, _ in results)
+            elapsed = time.monotonic() - started
+            print(
+                f"Ratings streamed successfully with {len(tasks)} workers: "
+                f"{n_rows} rows in {elapsed:.1f}s ({n_rows / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
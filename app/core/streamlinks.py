@@ -3,8 +3,8 @@ Stream links data into the PostgreSQL database
 """
 
 import csv
-import io
 from django.db import connection
+from core.copyio import IteratorFile, csv_lines
 
 
 class StreamLinksToDb:
@@ -24,25 +24,19 @@ class StreamLinksToDb:
                 with open(file_path, "r") as f:
                     reader = csv.reader(f)
                     next(reader)
-                    buffer = io.StringIO()
-                    writer = csv.writer(buffer)
-
-                    for row in reader:
-                        movie_id = int(row[0])
-                        imdb_id = int(row[1])
-                        tmdb_id = float(row[2])
-
-                        # Write to buffer in proper format
-                        writer.writerow([movie_id, imdb_id, tmdb_id])
-
-                    buffer.seek(0)
-                    cursor.copy_from(
-                        buffer,
-                        "core_links",
-                        columns=("movie_id", "imdb_id", "tmdb_id"),
-                        sep=",",
+
+                    # Rows are converted lazily as COPY reads them
+                    rows = (
+                        [int(movie_id), int(imdb_id), float(tmdb_id)]
+                        for movie_id, imdb_id, tmdb_id in reader
+                    )
+                    cursor.copy_expert(
+                        """
+                        COPY core_links (movie_id, imdb_id, tmdb_id)
+                        FROM STDIN WITH CSV
+                        """,
+                        IteratorFile(csv_lines(rows)),
                     )
-                    buffer.truncate(0)
 
                 print("Links data streamed successfully!")
 
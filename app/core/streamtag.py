@@ -1,55 +1,49 @@
 """
 Stream tags data directly into the PostgreSQL database
 with on-the-fly timestamp conversion using the COPY command.
+
+tags.csv is copied as is into an unlogged staging table,
+then moved into core_tags with one INSERT ... SELECT that
+converts the unix timestamps, skips unknown movies and
+leaves existing (user, movie) tags untouched, so loading
+is a handful of set-based statements.
 """
 
-import csv
-import io
-from datetime import datetime, timezone
-from django.db import connection
-from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from core.stream import create_missing_users
 
+STAGING_TABLE = "core_tags_staging"
 
-class StreamTagToDb:
-    def __init__(self, path=""):
-        self.path = path
+CREATE_STAGING_SQL = f"""
+    CREATE UNLOGGED TABLE {STAGING_TABLE} (
+        user_id bigint NOT NULL,
+        movie_id bigint NOT NULL,
+        tag text,
+        timestamp bigint
+    )
+"""
 
-    def create_user(self, user_id):
-        """
-        Create a new user in the database.
-        """
-        User = get_user_model()
-        email = f"user_{user_id}@example.com"
-        user, created = User.objects.get_or_create(
-            id=user_id,
-            email=email,
-        )
-        return user
-
-    def check_tag_exists(self, user_id, movie_id):
-        """
-        Check if a tag already exists in the database.
-        """
+COPY_STAGING_SQL = f"COPY {STAGING_TABLE} FROM STDIN WITH CSV HEADER"
 
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT id
-                FROM core_tags
-                WHERE user_id = %s
-                AND movie_id = %s
-                """,
-                [user_id, movie_id],
-            )
-            return cursor.fetchone()
+STAGED_USERS_SQL = f"SELECT DISTINCT user_id FROM {STAGING_TABLE}"
 
-    def convert_unix_timestamp(self, unix_timestamp):
-        """
-        Convert Unix timestamp to Python datetime object.
-        """
-        return datetime.fromtimestamp(int(unix_timestamp), timezone.utc)
+INSERT_TAGS_SQL = f"""
+    INSERT INTO core_tags (user_id, movie_id, tag, timestamp)
+    SELECT s.user_id, s.movie_id, COALESCE(s.tag, ''),
+           CASE WHEN s.timestamp > 0 THEN to_timestamp(s.timestamp) END
+    FROM {STAGING_TABLE} s
+    JOIN core_movie m ON m.movie_id = s.movie_id
+    ON CONFLICT (user_id, movie_id) DO NOTHING
+"""
 
-    def stream_tags_to_db(self, chunk_size=10000):
+DROP_STAGING_SQL = f"DROP TABLE IF EXISTS {STAGING_TABLE}"
+
+
+class StreamTagToDb:
+    def __init__(self, path=""):
+        self.path = path
+
+    def stream_tags_to_db(self):
         """
         Stream tags data directly into the PostgreSQL database
         with on-the-fly timestamp conversion using the COPY command.
@@ -57,48 +51,29 @@ class StreamTagToDb:
         file_path = f"{self.path}/tags.csv"
 
         try:
-            with connection.cursor() as cursor:
-                with open(file_path, "r") as f:
-                    reader = csv.reader(f, quotechar='"', delimiter=",")
-                    next(reader)
-                    buffer = io.StringIO()
-                    writer = csv.writer(buffer)
-
-                    for i, row in enumerate(reader):
-                        user_id = int(row[0])
-                        movie_id = int(row[1])
-                        tag = row[2]
-                        unix_timestamp = int(row[3])
-
-                        tag_exists = self.check_tag_exists(user_id, movie_id)
-
-                        if tag_exists:
-                            print(
-                                f"Tag already exist for:"
-                                f"{user_id}, movie_id: {movie_id}"
-                            )
-                            continue
-
-                        # Create user if not already exists
-                        user = self.create_user(user_id)
-
-                        # Convert timestamp
-                        timestamp = self.convert_unix_timestamp(unix_timestamp)
-
-                        # Write to buffer in proper format
-                        writer.writerow([user.id, movie_id, tag, timestamp])
-
-                    # Use an INSERT statement instead of COPY
-                    cursor.execute(
-                        """
-                        INSERT INTO core_tags (user_id,
-                        movie_id, tag, timestamp)
-                        VALUES (%s, %s, %s, %s)
-                        """,
-                        [user.id, movie_id, tag, timestamp],
-                    )
-
-                print("Tags data streamed successfully!")
+            with open(file_path, "r") as f, transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(DROP_STAGING_SQL)
+                    cursor.execute(CREATE_STAGING_SQL)
+
+                    # Raw file straight into the staging table
+                    cursor.copy_expert(COPY_STAGING_SQL, f)
+                    staged = cursor.rowcount
+
+                    # Missing users, in one statement
+                    cursor.execute(STAGED_USERS_SQL)
+                    create_missing_users(cursor, [row[0] for row in cursor.fetchall()])
+
+                    cursor.execute(INSERT_TAGS_SQL)
+                    inserted = cursor.rowcount
+
+                    cursor.execute(DROP_STAGING_SQL)
+
+            print(
+                f"Tags data streamed successfully! {inserted} of {staged} "
+                "tags inserted, existing tags and unknown movies skipped."
+            )
+            return inserted
 
         except FileNotFoundError as e:
             print(f"Error: {e}")
@@ -0,0 +1,66 @@
+"""
+Tests for the alternating least squares trainer.
+"""
+
+import numpy as np
+from django.test import SimpleTestCase
+from core.als import train_als
+from core.interactions import InteractionMatrix
+
+
+def low_rank_interactions(n_users=60, n_items=40, seed=0):
+    """
+    Helper function to sample ratings from a rank-3 model.
+    """
+
+    rng = np.random.default_rng(seed)
+    users, items = np.nonzero(rng.random((n_users, n_items)) < 0.4)
+    user_factors = rng.normal(size=(n_users, 3))
+    item_factors = rng.normal(size=(n_items, 3))
+    ratings = np.clip(
+        3 + 0.4 * (user_factors[users] * item_factors[items]).sum(axis=1), 1, 5
+    )
+    return InteractionMatrix.from_arrays(
+        np.arange(1, n_users + 1), np.arange(100, 100 + n_items), users, items, ratings
+    )
+
+
+class TrainALSTests(SimpleTestCase):
+    """
+    Test fitting factors by alternating least squares.
+    """
+
+    def test_fit_reconstructs_ratings(self):
+        """
+        Test that the trained model predicts its
+        training ratings far better than the mean.
+        """
+
+        interactions = low_rank_interactions()
+        model = train_als(interactions, n_factors=6, n_iters=8, n_jobs=1)
+
+        rows = np.repeat(np.arange(interactions.shape[0]), np.diff(interactions.indptr))
+        cols = interactions.indices
+        predicted = (
+            model.global_mean
+            + model.user_bias[rows]
+            + model.item_bias[cols]
+            + (model.user_factors[rows] * model.item_factors[cols]).sum(axis=1)
+        )
+        error = np.sqrt(np.mean((predicted - interactions.matrix.data) ** 2))
+
+        self.assertLess(error, 0.5 * interactions.matrix.data.std())
+        self.assertEqual(model.users.ids.tolist(), interactions.users.ids.tolist())
+
+    def test_worker_pool_matches_serial(self):
+        """
+        Test that solving blocks on a process pool
+        gives the same factors as a single process.
+        """
+
+        interactions = low_rank_interactions()
+        serial = train_als(interactions, n_factors=4, n_iters=3, n_jobs=1)
+        pooled = train_als(interactions, n_factors=4, n_iters=3, n_jobs=2, block_rows=16)
+
+        np.testing.assert_allclose(pooled.item_factors, serial.item_factors, atol=1e-5)
+        np.testing.assert_allclose(pooled.user_bias, serial.user_bias, atol=1e-5)
@@ -0,0 +1,91 @@
+"""
+Tests for the model artifact format.
+"""
+
+import json
+import os
+import tempfile
+import numpy as np
+from django.test import SimpleTestCase
+from core.artifacts import MANIFEST_FILE, load_artifact, save_artifact
+
+
+class ArtifactTests(SimpleTestCase):
+    """
+    Test saving and memory-mapping model artifacts.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "artifact")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_is_memory_mapped(self):
+        """
+        Test that arrays and metadata load back,
+        memory-mapped and read-only.
+        """
+
+        ids = np.arange(5, dtype=np.int64)
+        save_artifact(self.path, "example", {"ids": ids}, meta={"k": 3})
+
+        artifact = load_artifact(self.path, "example", verify=True)
+
+        self.assertEqual(artifact.meta, {"k": 3})
+        self.assertEqual(artifact["ids"].tolist(), ids.tolist())
+        self.assertIsInstance(artifact["ids"], np.memmap)
+        self.assertFalse(artifact["ids"].flags.writeable)
+
+    def test_manifest_records_checksums(self):
+        """
+        Test that the manifest describes every array.
+        """
+
+        save_artifact(self.path, "example", {"scores": np.zeros((2, 3), np.float32)})
+
+        with open(os.path.join(self.path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        entry = manifest["arrays"]["scores"]
+        self.assertEqual(entry["shape"], [2, 3])
+        self.assertEqual(entry["dtype"], "<f4")
+        self.assertEqual(len(entry["sha256"]), 64)
+
+    def test_checksum_mismatch(self):
+        """
+        Test that a modified array fails verification.
+        """
+
+        save_artifact(self.path, "example", {"ids": np.arange(5)})
+        np.save(os.path.join(self.path, "ids.npy"), np.arange(1, 6))
+
+        with self.assertRaises(ValueError):
+            load_artifact(self.path, verify=True)
+
+    def test_wrong_kind(self):
+        """
+        Test that loading an artifact of another kind fails.
+        """
+
+        save_artifact(self.path, "example", {"ids": np.arange(5)})
+
+        with self.assertRaises(ValueError):
+            load_artifact(self.path, "factor_model")
+
+    def test_object_arrays_are_rejected(self):
+        """
+        Test that arrays needing pickle cannot be saved.
+        """
+
+        with self.assertRaises(ValueError):
+            save_artifact(self.path, "example", {"titles": np.array([{}], dtype=object)})
+
+    def test_missing_artifact(self):
+        """
+        Test that a missing artifact raises FileNotFoundError.
+        """
+
+        with self.assertRaises(FileNotFoundError):
+            load_artifact(self.path)
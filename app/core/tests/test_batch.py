@@ -0,0 +1,66 @@
+"""
+Tests for batch precomputation of recommendations.
+"""
+
+import os
+import tempfile
+import numpy as np
+from django.test import SimpleTestCase
+from core.batch import precompute_recommendations
+from core.interactions import InteractionMatrix
+from core.scoring import FactorModel
+from core.tests.test_scoring import train_svd
+
+
+class PrecomputeRecommendationsTests(SimpleTestCase):
+    """
+    Test chunked, pooled top-N scoring of every user.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        svd, ratings = train_svd()
+        self.model = FactorModel.from_surprise(svd)
+        self.model_path = os.path.join(self.tmpdir.name, "collaborative_model")
+        self.model.save(self.model_path)
+        self.rated_index = InteractionMatrix.from_dataframe(ratings)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_matches_live_recommendations(self):
+        """
+        Test that every user gets the same top-N as the
+        live vectorised path, for serial and pooled runs.
+        """
+
+        for n_jobs in (1, 2):
+            chunks = list(
+                precompute_recommendations(
+                    self.model_path, self.rated_index, top_n=5, chunk_users=7, n_jobs=n_jobs
+                )
+            )
+            user_ids = np.concatenate([user_ids for user_ids, _, _ in chunks])
+            movie_ids = np.concatenate([movie_ids for _, movie_ids, _ in chunks])
+
+            self.assertEqual(user_ids.tolist(), self.model.users.ids.tolist())
+            for user_id, top in zip(user_ids, movie_ids):
+                expected, _ = self.model.recommend(
+                    user_id, exclude=self.rated_index.rated_items(user_id), top_n=5
+                )
+                self.assertEqual(top.tolist(), expected.tolist())
+
+    def test_pads_when_few_movies_left(self):
+        """
+        Test that users with fewer unrated movies than
+        top_n get -1 padding.
+        """
+
+        chunks = list(
+            precompute_recommendations(self.model_path, self.rated_index, top_n=60, n_jobs=1)
+        )
+        _, movie_ids, scores = chunks[0]
+
+        self.assertEqual(movie_ids.shape[1], len(self.model.items))
+        self.assertTrue((movie_ids == -1).any())
+        self.assertTrue(np.all(np.isneginf(scores[movie_ids == -1])))
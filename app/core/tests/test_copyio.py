@@ -0,0 +1,48 @@
+"""
+Tests for the COPY file adapters.
+"""
+
+from django.test import SimpleTestCase
+from core.copyio import IteratorFile, csv_lines
+
+
+class IteratorFileTests(SimpleTestCase):
+    """
+    Test reading lazily produced lines like a file.
+    """
+
+    def test_sized_reads_return_every_character(self):
+        """
+        Test that reads of any size (as copy_expert
+        makes them) return the lines in order.
+        """
+
+        lines = [f"{i},{'x' * i}\n" for i in range(50)]
+
+        for size in (1, 7, 8192):
+            stream = IteratorFile(iter(lines))
+            chunks = iter(lambda: stream.read(size), "")
+            self.assertEqual("".join(chunks), "".join(lines))
+
+        stream = IteratorFile(iter(lines))
+        self.assertEqual(stream.read(3), "0,\n")
+        self.assertEqual(stream.readline(), "1,x\n")
+        self.assertEqual(stream.read(), "".join(lines[2:]))
+
+    def test_lines_are_produced_lazily(self):
+        """
+        Test that only the rows needed for a read
+        are pulled from the source.
+        """
+
+        pulled = []
+
+        def rows():
+            for i in range(1000):
+                pulled.append(i)
+                yield [i, f'say "{i}", ok']
+
+        stream = IteratorFile(csv_lines(rows()))
+
+        self.assertEqual(stream.read(18), '0,"say ""0"", ok"\n')
+        self.assertLess(len(pulled), 3)
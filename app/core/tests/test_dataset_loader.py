@@ -0,0 +1,99 @@
+"""
+Tests for the vectorized MovieLens loader helpers.
+"""
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from core.dataset_loader import (
+    MovieLensDataLoader,
+    SortedRuns,
+    composite_keys,
+    csv_text,
+    half_star_text,
+    id_lookup,
+    sorted_merge,
+    unix_to_timestamps,
+    with_ids,
+)
+
+
+class DatasetLoaderTests(SimpleTestCase):
+    """
+    Test deduplication and COPY formatting without a database.
+    """
+
+    def test_new_rows_skips_known_pairs_and_ids(self):
+        """
+        Test that unknown users or movies, pairs already
+        seen and repeats within a chunk are dropped.
+        """
+
+        chunk = pd.DataFrame(
+            {
+                "userId": [1, 1, 2, 2, 3, 1],
+                "movieId": [10, 11, 10, 12, 10, 11],
+            }
+        )
+        seen = SortedRuns(np.sort(composite_keys([2], [10])))
+
+        rows, keys = MovieLensDataLoader().new_rows(
+            chunk, seen, id_lookup([1, 2]), id_lookup([10, 11])
+        )
+
+        self.assertEqual(rows.index.tolist(), [0, 1])
+        self.assertEqual(keys.tolist(), composite_keys([1, 1], [10, 11]).tolist())
+        self.assertEqual(
+            sorted_merge(seen.runs[0], keys).tolist(), np.sort(composite_keys([1, 1, 2], [10, 11, 10])).tolist()
+        )
+
+    def test_with_ids_grows_lookup(self):
+        """
+        Test that created users join the lookup table,
+        growing it past its end when needed.
+        """
+
+        table = with_ids(id_lookup([1, 2]), np.array([2, 5]))
+
+        self.assertEqual(np.flatnonzero(table).tolist(), [1, 2, 5])
+
+    def test_sorted_runs(self):
+        """
+        Test that added runs are found and merged
+        into a logarithmic number of sorted runs.
+        """
+
+        seen = SortedRuns(np.arange(0, 1000, 2))
+        for start in range(1, 64, 2):
+            seen.add(np.array([start, start + 1000]))
+
+        self.assertEqual(len(seen), 564)
+        self.assertLessEqual(len(seen.runs), 7)
+        for run in seen.runs:
+            self.assertTrue(np.all(np.diff(run) > 0))
+        self.assertEqual(
+            seen.contains(np.array([0, 1, 3, 5, 1001, 1063, 1065, 999])).tolist(),
+            [True, True, True, True, True, True, False, False],
+        )
+
+    def test_csv_text(self):
+        """
+        Test numbers, pre-formatted values, NULLs
+        and quoted free text in the COPY CSV.
+        """
+
+        text = csv_text(
+            [
+                np.array([1, 2]),
+                half_star_text([3.5, 4.0]),
+                unix_to_timestamps([1425941529, 0]),
+                np.array(['say "hi", ok', None], dtype=object),
+            ]
+        )
+
+        self.assertEqual(
+            text,
+            '1,3.5,2015-03-09T22:52:09Z,"say ""hi"", ok"\n'
+            "2,4.0,,\n",
+        )
+        self.assertEqual(csv_text([np.array([], dtype=np.int64)]), "")
@@ -0,0 +1,70 @@
+"""
+Tests for the closed-form EASE item model.
+"""
+
+import os
+import tempfile
+import numpy as np
+from django.test import SimpleTestCase
+from core.ease import build_ease, head_items
+from core.itemmodel import ItemModel
+from core.tests.test_itemknn import sample_interactions
+
+
+class EASETests(SimpleTestCase):
+    """
+    Test fitting and serving the dense head model.
+    """
+
+    def test_weights_solve_closed_form(self):
+        """
+        Test that B minimises |X - XB|^2 + reg |B|^2
+        with a zero diagonal, via the Lagrangian form.
+        """
+
+        interactions = sample_interactions()
+        model = build_ease(interactions, reg=10.0, n_jobs=1)
+        ratings = interactions.matrix.toarray()
+        gram = ratings.T @ ratings + 10.0 * np.eye(ratings.shape[1])
+
+        # (X^T X + reg I) B - X^T X must be diagonal
+        residual = gram @ model.weights - ratings.T @ ratings
+        np.fill_diagonal(residual, 0)
+
+        np.testing.assert_allclose(residual, 0, atol=1e-2)
+        np.testing.assert_array_equal(np.diag(model.weights), 0)
+        self.assertFalse(model.sparse)
+
+    def test_head_covers_most_rated_movies(self):
+        """
+        Test that only the most rated movies are modelled
+        and other ratings are ignored when scoring.
+        """
+
+        interactions = sample_interactions()
+        popularity = np.diff(interactions.matrix.tocsc().indptr)
+        head = head_items(interactions, 10)
+
+        model = build_ease(interactions, n_items=10, n_jobs=1)
+        tail = interactions.items.ids[np.argmin(popularity)]
+
+        self.assertEqual(len(model), 10)
+        self.assertGreaterEqual(popularity[head].min(), np.sort(popularity)[-10])
+        self.assertNotIn(tail, model.recommend([tail, model.items.ids[0]], top_n=20)[0])
+
+    def test_save_and_load(self):
+        """
+        Test that the dense weights load back memory-mapped.
+        """
+
+        model = build_ease(sample_interactions(), n_items=10, n_jobs=1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "item_model")
+            model.save(path)
+            loaded = ItemModel.load(path, verify=True)
+
+            self.assertIsInstance(loaded.weights, np.memmap)
+            np.testing.assert_allclose(
+                loaded.recommend([model.items.ids[0]])[1],
+                model.recommend([model.items.ids[0]])[1],
+            )
@@ -0,0 +1,121 @@
+"""
+Tests for folding users into a trained factor model.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from core.foldin import FoldIn, fold_in, mark_ratings_changed
+from core.scoring import FactorModel
+
+
+def sample_model(n_items=20, n_factors=4, seed=0):
+    """
+    Helper function to build a factor model with random factors.
+    """
+
+    rng = np.random.default_rng(seed)
+    return FactorModel(
+        [1, 2],
+        np.arange(100, 100 + n_items),
+        rng.normal(size=(2, n_factors)).astype(np.float32),
+        rng.normal(size=(n_items, n_factors)).astype(np.float32),
+        np.zeros(2, dtype=np.float32),
+        rng.normal(scale=0.3, size=n_items).astype(np.float32),
+        3.5,
+        rating_scale=(-100, 100),
+    )
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class FoldInTests(SimpleTestCase):
+    """
+    Test least-squares fold-in and vector caching.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fold_in_recovers_user_vector(self):
+        """
+        Test that ratings generated by a known vector
+        and bias are solved back to them.
+        """
+
+        model = sample_model()
+        factors = np.array([0.5, -1.0, 0.25, 2.0])
+        ratings = model.global_mean + 0.3 + model.item_bias + model.item_factors @ factors
+
+        solved, bias = fold_in(model, model.items.ids, ratings, reg=1e-9)
+
+        np.testing.assert_allclose(solved, factors, atol=1e-4)
+        self.assertAlmostEqual(bias, 0.3, places=4)
+
+    def test_unknown_movies_ignored(self):
+        """
+        Test that a user with only unknown movies gets
+        the bias-only estimate.
+        """
+
+        factors, bias = fold_in(sample_model(), [1, 2], [4.0, 5.0])
+
+        self.assertIsNone(factors)
+        self.assertEqual(bias, 0.0)
+
+    @patch.object(FoldIn, "user_ratings")
+    def test_changed_user_folded_in_and_cached(self, patched_ratings):
+        """
+        Test that the trained vector is served until the
+        user's ratings change, and the fold-in is cached.
+        """
+
+        model = sample_model()
+        engine = FoldIn(model, version="v1")
+        patched_ratings.return_value = (np.array([100, 101]), np.array([5.0, 1.0]))
+
+        factors, _, rated = engine.user_vector(1)
+        np.testing.assert_array_equal(factors, model.user_factors[0])
+        self.assertIsNone(rated)
+
+        mark_ratings_changed(1)
+        engine.user_vector(1)
+        factors, _, rated = engine.user_vector(1)
+
+        self.assertEqual(patched_ratings.call_count, 1)
+        self.assertEqual(rated.tolist(), [100, 101])
+        self.assertFalse(np.allclose(factors, model.user_factors[0]))
+
+    def test_retrained_version_retires_flag(self):
+        """
+        Test that a change made before a version was
+        trained no longer forces a fold-in.
+        """
+
+        model = sample_model()
+        mark_ratings_changed(1)
+
+        self.assertTrue(FoldIn(model, version="20000101000000").ratings_changed(1))
+        self.assertFalse(FoldIn(model, version="29990101000000").ratings_changed(1))
+        self.assertFalse(FoldIn(model, version="v1").ratings_changed(2))
+
+    def test_rating_between_export_and_training(self):
+        """
+        Test that a rating saved after the training snapshot
+        was exported, but before training started, still
+        counts as changed; later snapshots retire it.
+        """
+
+        exported = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        rated = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+        model = sample_model()
+        model.high_water_mark = exported
+        with patch("core.foldin.time") as patched_time:
+            patched_time.time.return_value = rated.timestamp()
+            mark_ratings_changed(1)
+
+        self.assertTrue(FoldIn(model, version="20240101130000").ratings_changed(1))
+
+        model.high_water_mark = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        self.assertFalse(FoldIn(model, version="20240102010000").ratings_changed(1))
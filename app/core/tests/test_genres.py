@@ -0,0 +1,74 @@
+"""
+Tests for the genre bitmasks.
+"""
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from core.genres import GenreIndex, genre_mask, genre_masks, genre_names, jaccard, popcount
+
+
+def sample_movies():
+    """
+    Helper function to create a small movie catalog.
+    """
+
+    return pd.DataFrame(
+        {
+            "movie_id": [1, 2, 3, 4],
+            "genres": [
+                "Animation|Children's|Comedy",
+                "Animation|Children|Comedy",
+                "Comedy|Romance",
+                "(no genres listed)",
+            ],
+        }
+    )
+
+
+class GenreMaskTests(SimpleTestCase):
+    """
+    Test encoding genres and comparing bitmasks.
+    """
+
+    def test_genre_mask_round_trip(self):
+        """
+        Test that known genres set one bit each,
+        case-insensitively, and unknown ones none.
+        """
+
+        mask = genre_mask("Comedy|sci-fi|Children's|Unknown")
+
+        self.assertEqual(genre_names(mask), ["Children", "Comedy", "Sci-Fi"])
+        self.assertEqual(genre_mask("(no genres listed)"), 0)
+        self.assertEqual(genre_mask(None), 0)
+
+    def test_popcount_and_jaccard(self):
+        """
+        Test bit counts against Python and Jaccard
+        against the set definition.
+        """
+
+        masks = np.random.default_rng(0).integers(0, 2**32, size=100, dtype=np.uint32)
+        self.assertEqual(popcount(masks).tolist(), [bin(int(mask)).count("1") for mask in masks])
+
+        masks = genre_masks(sample_movies()["genres"])
+        np.testing.assert_allclose(jaccard(masks[0], masks), [1.0, 1.0, 1 / 4, 0.0])
+
+    def test_index_filter_and_similar(self):
+        """
+        Test filtering by all or any genres and ranking
+        movies by genre similarity, without the movie.
+        """
+
+        index = GenreIndex.from_movies(sample_movies())
+        comedy_romance = genre_mask("Comedy|Romance")
+
+        self.assertEqual(index.filter(comedy_romance).tolist(), [3])
+        self.assertEqual(index.filter(comedy_romance, match_all=False).tolist(), [1, 2, 3])
+
+        movie_ids, scores = index.similar(1, top_n=2)
+        self.assertEqual(movie_ids.tolist(), [2, 3])
+        np.testing.assert_allclose(scores, [1.0, 0.25])
+        with self.assertRaises(ValueError):
+            index.similar(99)
@@ -0,0 +1,84 @@
+"""
+Tests for the implicit-feedback ALS recommender.
+"""
+
+import numpy as np
+from django.test import SimpleTestCase
+from core.implicit import chat_signals, implicit_interactions, train_implicit_als
+from core.tests.test_titles import sample_resolver
+
+
+def two_group_signals(seed=0):
+    """
+    Helper function to sample signals of two user groups,
+    each interacting with its own half of the catalog.
+    """
+
+    rng = np.random.default_rng(seed)
+    users, movies = [], []
+    for user_id in range(1, 41):
+        group = 0 if user_id <= 20 else 1
+        picked = rng.choice(10, size=6, replace=False) + 100 + 10 * group
+        users.extend([user_id] * len(picked))
+        movies.extend(picked)
+    return np.array(users), np.array(movies), np.ones(len(users), dtype=np.float32)
+
+
+class ImplicitALSTests(SimpleTestCase):
+    """
+    Test confidence-weighted ALS with CG row solves.
+    """
+
+    def test_signals_summed_per_pair(self):
+        """
+        Test that repeated signals for a movie add up.
+        """
+
+        interactions = implicit_interactions(
+            np.array([1, 1, 2]), np.array([10, 10, 20]), np.array([1.0, 2.0, 1.0])
+        )
+
+        self.assertEqual(interactions.user_row(1)[1].tolist(), [3.0])
+        self.assertEqual(interactions.shape, (2, 2))
+
+    def test_chat_messages_resolved_to_movies(self):
+        """
+        Test that chat messages match movies through the
+        title resolver and unknown titles are dropped.
+        """
+
+        users, movies = chat_signals(
+            [(1, "the matrix"), (2, "Toy Storyy"), (2, "Jumanji"), (3, "The Matrix (1999)")],
+            sample_resolver(),
+        )
+
+        self.assertEqual(users.tolist(), [1, 2, 3])
+        self.assertEqual(movies.tolist(), [2, 1, 2])
+
+    def test_recommends_movies_of_users_group(self):
+        """
+        Test that the top recommendations are unseen
+        movies from the user's own group.
+        """
+
+        interactions = implicit_interactions(*two_group_signals())
+        model = train_implicit_als(interactions, n_factors=4, n_iters=10, n_jobs=1)
+        movie_ids, _ = model.recommend(
+            1, exclude=interactions.rated_items(1), top_n=2
+        )
+
+        self.assertTrue(model.implicit)
+        self.assertTrue(all(100 <= movie_id < 110 for movie_id in movie_ids))
+
+    def test_worker_pool_matches_serial(self):
+        """
+        Test that the process pool gives the same factors.
+        """
+
+        interactions = implicit_interactions(*two_group_signals())
+        serial = train_implicit_als(interactions, n_factors=4, n_iters=3, n_jobs=1)
+        pooled = train_implicit_als(
+            interactions, n_factors=4, n_iters=3, n_jobs=2, block_rows=8
+        )
+
+        np.testing.assert_allclose(pooled.user_factors, serial.user_factors, atol=1e-5)
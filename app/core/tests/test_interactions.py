@@ -0,0 +1,56 @@
+"""
+Tests for the sparse user x item interaction matrix.
+"""
+
+import pandas as pd
+from django.test import SimpleTestCase
+from core.interactions import InteractionMatrix
+from core.snapshot import RatingsSnapshot
+
+
+class InteractionMatrixTests(SimpleTestCase):
+    """
+    Test CSR construction and per-user slices.
+    """
+
+    def test_rated_items_from_dataframe(self):
+        """
+        Test that a user's rated movies come from their CSR row.
+        """
+
+        ratings = pd.DataFrame(
+            {
+                "user_id": [7, 3, 7, 7],
+                "movie_id": [10, 10, 2, 5],
+                "rating": [4.0, 5.0, 1.5, 3.0],
+            }
+        )
+
+        matrix = InteractionMatrix.from_dataframe(ratings)
+
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertEqual(sorted(matrix.rated_items(7).tolist()), [2, 5, 10])
+        self.assertEqual(matrix.rated_items(3).tolist(), [10])
+
+    def test_unknown_user_has_no_items(self):
+        """
+        Test that an unknown user gets an empty slice.
+        """
+
+        matrix = InteractionMatrix.from_dataframe(
+            pd.DataFrame({"user_id": [1], "movie_id": [1], "rating": [3.0]})
+        )
+
+        self.assertEqual(len(matrix.rated_items(99)), 0)
+
+    def test_from_snapshot(self):
+        """
+        Test building the matrix from a ratings snapshot.
+        """
+
+        snapshot = RatingsSnapshot.from_raw([7, 3, 7], [10, 10, 2], [8, 10, 3])
+        matrix = InteractionMatrix.from_snapshot(snapshot)
+        item_idx, ratings = matrix.user_row(7)
+
+        self.assertEqual(matrix.items.ids[item_idx].tolist(), [2, 10])
+        self.assertEqual(ratings.tolist(), [1.5, 4.0])
@@ -0,0 +1,112 @@
+"""
+Tests for the item-based KNN model.
+"""
+
+import os
+import tempfile
+import numpy as np
+from django.test import SimpleTestCase
+from core.interactions import InteractionMatrix
+from core.itemknn import build_item_knn
+from core.itemmodel import ItemModel
+from core.recommender import RecommenderSystem
+from core.similarity import ContentSimilarityIndex
+from core.tests.test_similarity import sample_movies
+
+
+def sample_interactions(n_users=50, n_items=30, seed=0):
+    """
+    Helper function to build random sparse ratings.
+    """
+
+    rng = np.random.default_rng(seed)
+    users, items = np.nonzero(rng.random((n_users, n_items)) < 0.2)
+    return InteractionMatrix.from_arrays(
+        np.arange(1, n_users + 1),
+        np.arange(100, 100 + n_items),
+        users,
+        items,
+        rng.integers(1, 6, size=len(users)),
+    )
+
+
+class ItemKNNTests(SimpleTestCase):
+    """
+    Test building and serving the item-item model.
+    """
+
+    def test_neighbors_match_brute_force(self):
+        """
+        Test that every movie keeps its top-k shrunk
+        cosine neighbours, in block and pooled builds.
+        """
+
+        interactions = sample_interactions()
+        dense = interactions.matrix.toarray().T
+        norms = np.linalg.norm(dense, axis=1)
+        expected = (dense @ dense.T) / (np.outer(norms, norms) + 5.0)
+        np.fill_diagonal(expected, -np.inf)
+
+        model = build_item_knn(interactions, k=4, shrinkage=5.0, block_size=7, n_jobs=2)
+        weights = model.weights.toarray()
+
+        for item in range(len(model)):
+            top = np.sort(expected[item])[-4:]
+            np.testing.assert_allclose(np.sort(weights[item][weights[item] > 0]), top, rtol=1e-5)
+
+    def test_recommend_sums_neighbor_rows(self):
+        """
+        Test that scores are the rating-weighted sum of
+        the rated movies' rows, excluding rated movies.
+        """
+
+        model = build_item_knn(sample_interactions(), k=5, n_jobs=1)
+        weights = model.weights.toarray()
+        expected = 4 * weights[0] + 2 * weights[3]
+        expected[[0, 3]] = 0
+
+        movie_ids, scores = model.recommend(
+            [100, 103], [4, 2], exclude=[100, 103], top_n=3
+        )
+
+        np.testing.assert_allclose(scores, np.sort(expected)[::-1][:3], rtol=1e-5)
+        self.assertNotIn(100, movie_ids)
+
+    def test_save_and_load(self):
+        """
+        Test that a saved model recommends like the original.
+        """
+
+        model = build_item_knn(sample_interactions(), k=5, n_jobs=1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "item_model")
+            model.save(path)
+            loaded = ItemModel.load(path, verify=True)
+
+            self.assertEqual(loaded.method, "knn")
+            self.assertEqual(
+                loaded.recommend([100, 101])[0].tolist(),
+                model.recommend([100, 101])[0].tolist(),
+            )
+
+    def test_similar_reads_one_row(self):
+        """
+        Test that a movie's neighbours are its row,
+        best first, and blending unions both indexes.
+        """
+
+        model = build_item_knn(sample_interactions(), k=5, n_jobs=1)
+        weights = model.weights.toarray()[0]
+        movie_ids, scores = model.similar(100, top_n=3)
+
+        np.testing.assert_allclose(scores, np.sort(weights)[::-1][:3])
+        self.assertEqual(len(model.similar(999)[0]), 0)
+
+        recommender = RecommenderSystem()
+        recommender.item_model = model
+        recommender.content_index = ContentSimilarityIndex.build(sample_movies(), k=3, n_jobs=1)
+        blended_ids, _ = recommender.similar_movies(100, top_n=3, source="blended")
+
+        self.assertEqual(blended_ids.tolist(), movie_ids.tolist())
+        with self.assertRaises(ValueError):
+            recommender.similar_movies(100, source="random")
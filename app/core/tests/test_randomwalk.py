@@ -0,0 +1,60 @@
+"""
+Tests for the P3alpha/RP3beta random-walk model.
+"""
+
+import numpy as np
+from django.test import SimpleTestCase
+from core.randomwalk import build_rp3beta
+from core.tests.test_itemknn import sample_interactions
+
+
+def dense_rp3beta(interactions, alpha, beta):
+    """
+    Helper function computing the unpruned transition
+    matrix with dense arrays.
+    """
+
+    adjacency = (interactions.matrix.toarray() > 0).astype(float)
+    user_to_item = (adjacency / adjacency.sum(axis=1, keepdims=True)) ** alpha
+    item_to_user = (adjacency.T / adjacency.sum(axis=0)[:, None]) ** alpha
+    weights = item_to_user @ user_to_item / adjacency.sum(axis=0) ** beta
+    np.fill_diagonal(weights, 0)
+    return weights
+
+
+class RP3betaTests(SimpleTestCase):
+    """
+    Test the pruned, popularity-penalised walk.
+    """
+
+    def test_rows_keep_top_k_transitions(self):
+        """
+        Test that each row keeps its k largest
+        transitions, renormalised to sum to one.
+        """
+
+        interactions = sample_interactions()
+        expected = dense_rp3beta(interactions, alpha=0.8, beta=0.4)
+
+        model = build_rp3beta(
+            interactions, k=5, alpha=0.8, beta=0.4, block_size=8, n_jobs=2
+        )
+        weights = model.weights.toarray()
+
+        for item in range(len(model)):
+            top = np.argsort(expected[item])[-5:]
+            np.testing.assert_allclose(
+                weights[item, top], expected[item, top] / expected[item, top].sum(), rtol=1e-4
+            )
+        np.testing.assert_allclose(weights.sum(axis=1), 1, rtol=1e-5)
+        self.assertEqual(model.method, "rp3beta")
+
+    def test_zero_beta_is_p3alpha(self):
+        """
+        Test that beta=0 builds a P3alpha model.
+        """
+
+        model = build_rp3beta(sample_interactions(), k=5, beta=0, n_jobs=1)
+
+        self.assertEqual(model.method, "p3alpha")
+        self.assertEqual(len(model.recommend([100], top_n=3)[0]), 3)
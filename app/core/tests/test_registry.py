@@ -0,0 +1,160 @@
+"""
+Tests for the process-wide model registry.
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+from django.test import SimpleTestCase
+from core.registry import (
+    CONTENT_INDEX_ARTIFACT,
+    ModelRegistry,
+    latest_version,
+    new_version_dir,
+    publish_version,
+)
+from core.similarity import ContentSimilarityIndex
+from core.snapshot import SnapshotStore
+from core.tests.test_similarity import sample_movies
+
+
+class ModelRegistryTests(SimpleTestCase):
+    """
+    Test versioned artifacts and one-time loading.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmpdir.name, "models")
+        self.snapshot_path = os.path.join(self.tmpdir.name, "snapshot")
+
+        catalog = patch("core.registry.load_catalog", return_value=sample_movies())
+        catalog.start()
+        self.addCleanup(catalog.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def export_snapshot(self):
+        """
+        Helper function to export a small ratings snapshot.
+        """
+
+        with patch("core.snapshot.copy_ratings") as patched_copy:
+            patched_copy.return_value = (
+                np.array([7, 7, 8]), np.array([1, 2, 2]), np.array([8, 10, 6]), None
+            )
+            SnapshotStore(self.snapshot_path).export_full()
+
+    def publish_content_index(self, version=None):
+        """
+        Helper function to publish a version holding a content index.
+        """
+
+        if version is None:
+            version, version_path = new_version_dir(self.model_path)
+        else:
+            version_path = os.path.join(self.model_path, version)
+        index = ContentSimilarityIndex.build(sample_movies(), k=3)
+        index.save(os.path.join(version_path, CONTENT_INDEX_ARTIFACT))
+        publish_version(self.model_path, version)
+        return version
+
+    def test_latest_version_missing(self):
+        """
+        Test that an unpublished model path raises FileNotFoundError.
+        """
+
+        with self.assertRaises(FileNotFoundError):
+            latest_version(self.tmpdir.name)
+
+    def test_publish_rejects_corrupt_artifact(self):
+        """
+        Test that a version whose arrays no longer match
+        their checksums is never published.
+        """
+
+        version = self.publish_content_index()
+        version_path = os.path.join(self.model_path, version)
+        artifact_path = os.path.join(version_path, CONTENT_INDEX_ARTIFACT)
+        array_file = sorted(name for name in os.listdir(artifact_path) if name.endswith(".npy"))[0]
+        with open(os.path.join(artifact_path, array_file), "ab") as f:
+            f.write(b"corrupt")
+
+        with self.assertRaises(ValueError):
+            publish_version(self.model_path, version)
+
+    def test_missing_snapshot_fails_at_load(self):
+        """
+        Test that loading without a ratings snapshot raises
+        instead of deferring to a full ratings query.
+        """
+
+        self.publish_content_index()
+
+        with self.assertRaises(FileNotFoundError):
+            ModelRegistry(self.model_path, self.snapshot_path).load()
+
+    def test_recommender_loaded_once(self):
+        """
+        Test that every call shares the same loaded recommender.
+        """
+
+        self.export_snapshot()
+        version = self.publish_content_index()
+        registry = ModelRegistry(self.model_path, self.snapshot_path)
+
+        recommender = registry.get_recommender()
+
+        self.assertIs(registry.get_recommender(), recommender)
+        self.assertEqual(registry.version, version)
+        self.assertEqual(len(recommender.content_index), 5)
+        self.assertIsNone(recommender.svd_model)
+
+    def test_reload_swaps_recommender(self):
+        """
+        Test that reload() replaces the shared recommender.
+        """
+
+        self.export_snapshot()
+        self.publish_content_index()
+        registry = ModelRegistry(self.model_path, self.snapshot_path)
+        first = registry.get_recommender()
+
+        self.assertIsNot(registry.reload(), first)
+        self.assertIsNot(registry.get_recommender(), first)
+
+    def test_published_version_picked_up(self):
+        """
+        Test that a version published after loading is
+        served once LATEST is checked again.
+        """
+
+        self.export_snapshot()
+        self.publish_content_index("20240101000000")
+        registry = ModelRegistry(self.model_path, self.snapshot_path)
+        first = registry.get_recommender()
+        self.publish_content_index("20240102000000")
+
+        self.assertIs(registry.get_recommender(), first)
+        with patch("core.registry.RELOAD_CHECK_SECONDS", 0):
+            self.assertEqual(registry.get_recommender().model_version, "20240102000000")
+        self.assertEqual(registry.version, "20240102000000")
+
+    def test_lookups_built_at_load(self):
+        """
+        Test that the rated-item index, popularity order
+        and title resolver are built at load time.
+        """
+
+        self.export_snapshot()
+        self.publish_content_index()
+
+        with patch("core.recommender.RecommenderSystem.load_ratings") as patched_ratings:
+            recommender = ModelRegistry(self.model_path, self.snapshot_path).load()
+
+            self.assertEqual(recommender.rated_index.rated_items(7).tolist(), [1, 2])
+            self.assertEqual(recommender.popular_movie_ids.tolist(), [2, 1])
+            self.assertEqual(recommender.title_resolver.resolve("B"), 2)
+            patched_ratings.assert_not_called()
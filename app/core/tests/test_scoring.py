@@ -0,0 +1,136 @@
+"""
+Tests for the vectorised factor model scoring.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from surprise import Dataset, Reader, SVD
+from core.idmap import IdMap
+from core.scoring import FactorModel, factor_model_for, top_n_indices
+
+
+def train_svd(n_users=30, n_items=40, seed=0):
+    """
+    Helper function to fit a small Surprise SVD model.
+    """
+
+    rng = np.random.default_rng(seed)
+    users = rng.integers(1, n_users + 1, size=600)
+    items = rng.integers(100, 100 + n_items, size=600)
+    ratings = pd.DataFrame(
+        {"user_id": users, "movie_id": items, "rating": rng.integers(1, 6, size=600)}
+    ).drop_duplicates(["user_id", "movie_id"])
+
+    data = Dataset.load_from_df(ratings, Reader(rating_scale=(1, 5)))
+    svd = SVD(n_factors=8, n_epochs=5, random_state=seed)
+    svd.fit(data.build_full_trainset())
+    return svd, ratings
+
+
+class IdMapTests(SimpleTestCase):
+    """
+    Test raw id <-> dense index mapping.
+    """
+
+    def test_indices_and_missing_ids(self):
+        """
+        Test that known ids map to their position
+        and unknown ids map to -1.
+        """
+
+        ids = IdMap([40, 10, 30])
+
+        self.assertEqual(ids.indices([10, 30, 40, 20]).tolist(), [1, 2, 0, -1])
+        self.assertIn(30, ids)
+        self.assertNotIn(20, ids)
+
+    def test_extend_keeps_existing_indices(self):
+        """
+        Test that extending appends only new ids.
+        """
+
+        ids = IdMap([40, 10]).extend([10, 5, 5])
+
+        self.assertEqual(ids.ids.tolist(), [40, 10, 5])
+
+
+class FactorModelTests(SimpleTestCase):
+    """
+    Test that vectorised scores match Surprise predictions.
+    """
+
+    def test_scores_match_surprise_predict(self):
+        """
+        Test scoring all items against svd.predict().
+        """
+
+        svd, _ = train_svd()
+        model = FactorModel.from_surprise(svd)
+        factors, bias = model.user_vector(1)
+        scores = model.score_items(factors, bias)
+
+        expected = [svd.predict(1, movie_id).est for movie_id in model.items.ids]
+        np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+    def test_unknown_user_scores_match_surprise_predict(self):
+        """
+        Test that unknown users get the bias-only estimate.
+        """
+
+        svd, _ = train_svd()
+        model = FactorModel.from_surprise(svd)
+        factors, bias = model.user_vector(999)
+        scores = model.score_items(factors, bias)
+
+        expected = [svd.predict(999, movie_id).est for movie_id in model.items.ids]
+        np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+    def test_recommend_excludes_rated_movies(self):
+        """
+        Test that rated movies are never recommended
+        and results are ordered by score.
+        """
+
+        svd, ratings = train_svd()
+        model = factor_model_for(svd)
+        rated = ratings.loc[ratings["user_id"] == 1, "movie_id"].to_numpy()
+        movie_ids, scores = model.recommend(1, exclude=rated, top_n=5)
+
+        self.assertEqual(len(movie_ids), 5)
+        self.assertFalse(set(movie_ids) & set(rated))
+        self.assertTrue(all(scores[:-1] >= scores[1:]))
+        self.assertIs(factor_model_for(svd), model)
+
+    def test_top_n_indices_skips_masked_scores(self):
+        """
+        Test that -inf scores are never selected.
+        """
+
+        scores = np.array([0.5, -np.inf, 2.0, 1.0])
+
+        self.assertEqual(top_n_indices(scores, 2).tolist(), [2, 3])
+        self.assertEqual(top_n_indices(scores, 10).tolist(), [2, 3, 0])
+
+    def test_save_and_load(self):
+        """
+        Test that saved factors score like the original model.
+        """
+
+        svd, _ = train_svd()
+        model = FactorModel.from_surprise(svd)
+        model.high_water_mark = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "collaborative_model")
+            model.save(path)
+            loaded = FactorModel.load(path, verify=True)
+
+            np.testing.assert_allclose(
+                loaded.score_items(*loaded.user_vector(1)),
+                model.score_items(*model.user_vector(1)),
+            )
+            self.assertEqual(loaded.rating_scale, model.rating_scale)
+            self.assertEqual(loaded.high_water_mark, model.high_water_mark)
@@ -0,0 +1,131 @@
+"""
+Tests for the content similarity index.
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from core.similarity import ContentSimilarityIndex
+
+
+def sample_movies():
+    """
+    Helper function to create a small movie catalog.
+    """
+
+    return pd.DataFrame(
+        {
+            "movie_id": [3, 1, 2, 4, 5],
+            "title": ["C", "A", "B", "D", "E"],
+            "genres": [
+                "Comedy|Romance",
+                "Animation|Comedy",
+                "Animation|Comedy",
+                "Horror",
+                "Comedy",
+            ],
+        }
+    )
+
+
+class ContentSimilarityIndexTests(SimpleTestCase):
+    """
+    Test building, querying and persisting the index.
+    """
+
+    def test_build_orders_rows_by_movie_id(self):
+        """
+        Test that index rows are sorted by movie_id.
+        """
+
+        index = ContentSimilarityIndex.build(sample_movies(), k=3)
+
+        self.assertEqual(index.movie_ids.tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(index.neighbors.shape, (5, 3))
+
+    def test_similar_returns_closest_movies(self):
+        """
+        Test that neighbours are ranked by
+        similarity and exclude the movie itself.
+        """
+
+        index = ContentSimilarityIndex.build(sample_movies(), k=3)
+        ids, scores = index.similar(1, top_n=2)
+
+        self.assertEqual(ids[0], 2)
+        self.assertAlmostEqual(float(scores[0]), 1.0, places=5)
+        self.assertNotIn(1, ids)
+        self.assertTrue(all(scores[:-1] >= scores[1:]))
+        self.assertEqual(len(index.similar(1, top_n=-1)[0]), 0)
+        self.assertEqual(len(index.similar_to_many([1], top_n=0)[0]), 0)
+
+    def test_similar_pads_small_catalogs(self):
+        """
+        Test that k larger than the catalog
+        only returns real neighbours.
+        """
+
+        index = ContentSimilarityIndex.build(sample_movies(), k=10)
+        ids, _ = index.similar(4, top_n=10)
+
+        self.assertEqual(len(ids), 4)
+
+    def test_similar_unknown_movie(self):
+        """
+        Test that an unknown movie id raises ValueError.
+        """
+
+        index = ContentSimilarityIndex.build(sample_movies(), k=3)
+
+        with self.assertRaises(ValueError):
+            index.similar(99)
+
+    def test_similar_to_many_sums_seed_rows(self):
+        """
+        Test that seed neighbour scores are summed per
+        movie, seeds and unknown ids are dropped.
+        """
+
+        index = ContentSimilarityIndex.build(sample_movies(), k=4)
+        ids, scores = index.similar_to_many([1, 3, 99], top_n=10)
+
+        expected = {}
+        for seed in (1, 3):
+            for movie_id, score in zip(*index.similar(seed, top_n=4)):
+                expected[movie_id] = expected.get(movie_id, 0) + score
+        for seed in (1, 3):
+            expected.pop(seed, None)
+
+        self.assertEqual(set(ids.tolist()), set(expected))
+        np.testing.assert_allclose(scores, [expected[movie_id] for movie_id in ids], rtol=1e-5)
+        self.assertTrue(all(scores[:-1] >= scores[1:]))
+        self.assertEqual(len(index.similar_to_many([99])[0]), 0)
+
+    def test_save_and_load(self):
+        """
+        Test that a saved index loads back unchanged.
+        """
+
+        index = ContentSimilarityIndex.build(sample_movies(), k=3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "content_index")
+            index.save(filename)
+            loaded = ContentSimilarityIndex.load(filename)
+
+        self.assertEqual(loaded.movie_ids.tolist(), index.movie_ids.tolist())
+        self.assertEqual(loaded.neighbors.tolist(), index.neighbors.tolist())
+
+    def test_pool_build_matches_serial_build(self):
+        """
+        Test that the blocked process-pool builder
+        gives the same index as a single block.
+        """
+
+        movies = sample_movies()
+        serial = ContentSimilarityIndex.build(movies, k=3, n_jobs=1)
+        pooled = ContentSimilarityIndex.build(movies, k=3, block_size=2, n_jobs=2)
+
+        self.assertEqual(pooled.neighbors.tolist(), serial.neighbors.tolist())
+        self.assertEqual(pooled.scores.tolist(), serial.scores.tolist())
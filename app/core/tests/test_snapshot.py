@@ -0,0 +1,157 @@
+"""
+Tests for the columnar ratings snapshot.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timezone
+from unittest.mock import patch
+import numpy as np
+from django.test import SimpleTestCase
+from core.snapshot import RatingsSnapshot, SnapshotStore
+
+HIGH_WATER_MARK = datetime(2024, 12, 1, 18, 32, tzinfo=timezone.utc)
+
+COPY_OUTPUT = "7,10,8\n3,10,10\n7,2,3\n"
+
+
+def fake_copy_expert(sql, copy_file):
+    """
+    Helper function writing rows like COPY TO STDOUT.
+    """
+
+    copy_file.write(COPY_OUTPUT)
+
+
+class RatingsSnapshotTests(SimpleTestCase):
+    """
+    Test building, exporting and persisting snapshots.
+    """
+
+    def test_from_raw_assigns_dense_indices(self):
+        """
+        Test that raw ids map to dense int32 indices.
+        """
+
+        snapshot = RatingsSnapshot.from_raw([7, 3, 7], [10, 10, 2], [8, 10, 3])
+
+        self.assertEqual(snapshot.users.ids.tolist(), [3, 7])
+        self.assertEqual(snapshot.items.ids.tolist(), [2, 10])
+        self.assertEqual(snapshot.user_idx.tolist(), [1, 0, 1])
+        self.assertEqual(snapshot.item_idx.tolist(), [1, 1, 0])
+        self.assertEqual(snapshot.user_idx.dtype, np.int32)
+        self.assertEqual(snapshot.ratings.tolist(), [4.0, 5.0, 1.5])
+
+    @patch("core.snapshot.transaction")
+    @patch("core.snapshot.connection")
+    def test_export_streams_copy_output(self, patched_connection, patched_transaction):
+        """
+        Test that export parses the COPY TO stream in chunks
+        and records the high-water mark.
+        """
+
+        cursor = patched_connection.cursor.return_value.__enter__.return_value
+        cursor.copy_expert.side_effect = fake_copy_expert
+        cursor.fetchone.return_value = (HIGH_WATER_MARK,)
+
+        snapshot = RatingsSnapshot.export(chunk_rows=2)
+
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(snapshot.high_water_mark, HIGH_WATER_MARK)
+        self.assertNotIn("WHERE", cursor.copy_expert.call_args[0][0])
+        self.assertEqual(
+            snapshot.to_dataframe().values.tolist(),
+            [[7, 10, 4.0], [3, 10, 5.0], [7, 2, 1.5]],
+        )
+
+    def test_save_and_load(self):
+        """
+        Test that a saved snapshot loads back memory-mapped.
+        """
+
+        snapshot = RatingsSnapshot.from_raw([7, 3, 7], [10, 10, 2], [8, 10, 3])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "snapshot")
+            snapshot.save(path)
+            loaded = RatingsSnapshot.load(path)
+
+            self.assertEqual(loaded.meta["n_ratings"], 3)
+            self.assertIsInstance(loaded.item_idx, np.memmap)
+            self.assertEqual(
+                loaded.to_dataframe().values.tolist(),
+                snapshot.to_dataframe().values.tolist(),
+            )
+
+    def test_merge_keeps_latest_rating(self):
+        """
+        Test that a delta segment overrides changed
+        ratings and extends the id maps.
+        """
+
+        base = RatingsSnapshot.from_raw([7, 3], [10, 10], [8, 10])
+        delta = RatingsSnapshot.from_raw(
+            [3, 9], [10, 2], [4, 6], users=base.users, items=base.items
+        )
+
+        merged = RatingsSnapshot.merge([base, delta])
+        ratings = merged.to_dataframe().sort_values(["user_id", "movie_id"])
+
+        self.assertEqual(
+            ratings.values.tolist(), [[3, 10, 2.0], [7, 10, 4.0], [9, 2, 3.0]]
+        )
+        self.assertEqual(merged.users.ids.tolist(), [3, 7, 9])
+
+
+class SnapshotStoreTests(SimpleTestCase):
+    """
+    Test base and delta segments on disk.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.tmpdir.name, "snapshot"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @patch("core.snapshot.copy_ratings")
+    def test_delta_copies_only_changed_rows(self, patched_copy):
+        """
+        Test that a delta export asks only for rows changed
+        since the base high-water mark, minus the overlap.
+        """
+
+        patched_copy.return_value = (
+            np.array([7, 3]), np.array([10, 10]), np.array([8, 10]), HIGH_WATER_MARK
+        )
+        self.store.export_full()
+
+        later = HIGH_WATER_MARK.replace(year=2025)
+        patched_copy.return_value = (
+            np.array([3]), np.array([2]), np.array([6]), later
+        )
+        self.store.export_delta()
+
+        since = patched_copy.call_args[0][0]
+        self.assertLess(since, HIGH_WATER_MARK)
+        self.assertEqual(len(self.store.segment_paths()), 2)
+
+        merged = self.store.load()
+        self.assertEqual(len(merged), 3)
+        self.assertEqual(merged.high_water_mark, later)
+
+    @patch("core.snapshot.copy_ratings")
+    def test_full_export_replaces_deltas(self, patched_copy):
+        """
+        Test that a full export drops the previous segments.
+        """
+
+        patched_copy.return_value = (
+            np.array([7]), np.array([10]), np.array([8]), HIGH_WATER_MARK
+        )
+        self.store.export_full()
+        self.store.export_delta()
+        self.store.export_full()
+
+        self.assertEqual(len(self.store.segment_paths()), 1)
+        self.assertEqual(len(self.store.load()), 1)
@@ -0,0 +1,81 @@
+"""
+Tests for streaming ratings with COPY.
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+from django.test import SimpleTestCase
+from core.stream import StreamRatingToDb, copy_ratings_range, line_ranges, read_range
+
+RATINGS_CSV = (
+    "userId,movieId,rating,timestamp\n"
+    "1,17,4.0,944249077\n"
+    "1,25,1.0,944250228\n"
+    "2,17,3.5,943230976\n"
+)
+
+
+class StreamRatingToDbTests(SimpleTestCase):
+    """
+    Test the ratings COPY streamer against a mocked cursor.
+    """
+
+    @patch("core.stream.connection")
+    def test_creates_missing_users_once_per_chunk(self, patched_connection):
+        """
+        Test that each chunk creates its distinct users in
+        one statement, before the chunk is copied.
+        """
+
+        cursor = patched_connection.cursor.return_value.__enter__.return_value
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "ratings.csv"), "w") as f:
+                f.write(RATINGS_CSV)
+            StreamRatingToDb(path=tmpdir).stream_ratings_to_db(chunk_size=2)
+
+        inserts = [
+            call for call in cursor.execute.call_args_list if "INSERT" in call[0][0]
+        ]
+        self.assertEqual([call[0][1][1] for call in inserts], [[1], [2]])
+        self.assertTrue(inserts[0][0][1][0].startswith("!"))
+        self.assertEqual(cursor.copy_expert.call_count, 2)
+
+    def test_line_ranges_cover_every_row_once(self):
+        """
+        Test that byte ranges are newline aligned and
+        together hold every data row exactly once.
+        """
+
+        rows = "".join(f"{user},{user * 7},4.0,944249077\n" for user in range(1, 200))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "ratings.csv")
+            with open(file_path, "w") as f:
+                f.write("userId,movieId,rating,timestamp\n" + rows)
+
+            for n_parts in (1, 3, 7, 500):
+                ranges = line_ranges(file_path, n_parts)
+                lines = [line for start, stop in ranges for line in read_range(file_path, start, stop)]
+
+                self.assertLessEqual(len(ranges), n_parts)
+                self.assertEqual("".join(lines), rows)
+
+    @patch("core.stream.connection")
+    def test_worker_copies_its_range(self, patched_connection):
+        """
+        Test that a worker copies only its range
+        and closes its own connection.
+        """
+
+        cursor = patched_connection.cursor.return_value.__enter__.return_value
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "ratings.csv")
+            with open(file_path, "w") as f:
+                f.write(RATINGS_CSV)
+            (first, _), (second, stop) = line_ranges(file_path, 2)
+
+            n_rows, _ = copy_ratings_range((file_path, second, stop, 10))
+
+        self.assertEqual(n_rows, 1)
+        self.assertEqual(cursor.copy_expert.call_count, 1)
+        patched_connection.close.assert_called_once()
@@ -0,0 +1,47 @@
+"""
+Tests for the staging-table tags loader.
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+from django.test import SimpleTestCase
+from core.streamtag import StreamTagToDb
+
+TAGS_CSV = (
+    "userId,movieId,tag,timestamp\n"
+    '22,26479,"Kevin Kline, again",1583038886\n'
+    "22,79592,misogyny,1581476297\n"
+)
+
+
+class StreamTagToDbTests(SimpleTestCase):
+    """
+    Test the tags loader against a mocked cursor.
+    """
+
+    @patch("core.streamtag.transaction")
+    @patch("core.streamtag.connection")
+    def test_copies_into_staging_then_upserts(self, patched_connection, patched_transaction):
+        """
+        Test that the raw file is copied into the staging
+        table and moved over with one set-based insert.
+        """
+
+        cursor = patched_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [(22,)]
+        cursor.rowcount = 2
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "tags.csv"), "w") as f:
+                f.write(TAGS_CSV)
+            inserted = StreamTagToDb(path=tmpdir).stream_tags_to_db()
+
+        statements = [call[0][0] for call in cursor.execute.call_args_list]
+        self.assertEqual(inserted, 2)
+        self.assertIn("CREATE UNLOGGED TABLE", statements[1])
+        self.assertIn("COPY core_tags_staging", cursor.copy_expert.call_args[0][0])
+        self.assertTrue(cursor.copy_expert.call_args[0][1].name.endswith("tags.csv"))
+        self.assertEqual(sum("INSERT INTO core_tags" in sql for sql in statements), 1)
+        self.assertIn("ON CONFLICT (user_id, movie_id) DO NOTHING", statements[-2])
+        self.assertIn("DROP TABLE", statements[-1])
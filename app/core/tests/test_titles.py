@@ -0,0 +1,67 @@
+"""
+Tests for the movie title resolver.
+"""
+
+from django.test import SimpleTestCase
+from core.titles import TitleResolver, edit_distance, normalize_title, parse_title
+
+
+def sample_resolver():
+    """
+    Helper function to build a resolver over a small catalog.
+    """
+
+    return TitleResolver(
+        [1, 2, 3, 4, 5],
+        [
+            "Toy Story (1995)",
+            "Matrix, The (1999)",
+            "Heat (1995)",
+            "Heat (1986)",
+            "Amélie (2001)",
+        ],
+    )
+
+
+class TitleResolverTests(SimpleTestCase):
+    """
+    Test parsing, normalising and resolving titles.
+    """
+
+    def test_parse_and_normalize(self):
+        """
+        Test that the year is split off and names
+        are folded to one lookup key.
+        """
+
+        self.assertEqual(parse_title("Toy Story (1995)"), ("Toy Story", 1995))
+        self.assertEqual(parse_title("Toy Story"), ("Toy Story", None))
+        self.assertEqual(normalize_title("Matrix, The"), "the matrix")
+        self.assertEqual(normalize_title("  AMÉLIE! "), "amelie")
+
+    def test_resolve_exact_and_year(self):
+        """
+        Test exact lookups, with the year
+        choosing between same-named movies.
+        """
+
+        resolver = sample_resolver()
+
+        self.assertEqual(resolver.resolve("toy story"), 1)
+        self.assertEqual(resolver.resolve("The Matrix (1999)"), 2)
+        self.assertEqual(resolver.resolve("Heat (1986)"), 4)
+        self.assertEqual(resolver.resolve("Heat"), 3)
+        self.assertEqual(resolver.resolve("Amelie"), 5)
+
+    def test_resolve_misspelled_title(self):
+        """
+        Test the bounded edit-distance fallback.
+        """
+
+        resolver = sample_resolver()
+
+        self.assertEqual(resolver.resolve("Toy Storyy"), 1)
+        self.assertEqual(resolver.resolve("The Matirx"), 2)
+        self.assertIsNone(resolver.resolve("Jumanji"))
+        self.assertEqual(edit_distance("kitten", "sitting", 5), 3)
+        self.assertEqual(edit_distance("kitten", "sitting", 1), 2)
@@ -0,0 +1,167 @@
+"""
+In-memory movie title resolver.
+
+Titles are normalised once (case, accents, punctuation,
+MovieLens trailing articles such as "Matrix, The") into
+a hash map from name to movie ids, so an exact lookup
+is one dict probe. "Title (1995)" is parsed so the year
+can pick between remakes. Misspelled titles fall back to
+an edit distance over a bounded candidate set: the names
+sharing the most character trigrams with the query.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+YEAR_PATTERN = re.compile(r"^(.*?)\s*\((\d{4})(?:[-–]\d{0,4})?\)\s*$")
+TRAILING_ARTICLE_PATTERN = re.compile(r"^(.*), (the|a|an|les|la|le|l'|il|el|der|die|das)$")
+MAX_EDIT_DISTANCE = 3
+MAX_CANDIDATES = 50
+
+
+def parse_title(title):
+    """
+    Split "Title (1995)" into ("Title", 1995);
+    titles without a year give (title, None).
+    """
+
+    title = title.strip()
+    match = YEAR_PATTERN.match(title)
+    if match is None:
+        return title, None
+    return match.group(1), int(match.group(2))
+
+
+def normalize_title(title):
+    """
+    Return the lookup key of a title without its year.
+    """
+
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(char for char in title if not unicodedata.combining(char))
+    title = title.lower().strip()
+
+    # "Matrix, The" -> "the matrix"
+    match = TRAILING_ARTICLE_PATTERN.match(title)
+    if match is not None:
+        title = f"{match.group(2)} {match.group(1)}"
+
+    title = re.sub(r"[^\w\s]", " ", title)
+    return " ".join(title.split())
+
+
+def trigrams(name):
+    """
+    Return the set of character trigrams of a padded name.
+    """
+
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """
+    Levenshtein distance between a and b, or limit + 1
+    as soon as it is known to exceed limit.
+    """
+
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class TitleResolver:
+    """
+    Resolves free-text titles to movie ids.
+    Build it once per loaded catalog.
+    """
+
+    def __init__(self, movie_ids, titles):
+        self.names = defaultdict(list)
+        self.years = {}
+        self.trigram_index = defaultdict(list)
+
+        for movie_id, title in zip(movie_ids, titles):
+            if not isinstance(title, str):
+                continue
+            name, year = parse_title(title)
+            key = normalize_title(name)
+            movie_id = int(movie_id)
+            self.names[key].append(movie_id)
+            self.years[movie_id] = year
+
+        for key in self.names:
+            for gram in trigrams(key):
+                self.trigram_index[gram].append(key)
+
+    @classmethod
+    def from_movies(cls, movies):
+        """
+        Build a resolver from a DataFrame with
+        'movie_id' and 'title' columns.
+        """
+
+        return cls(movies["movie_id"].tolist(), movies["title"].tolist())
+
+    def __len__(self):
+        return len(self.years)
+
+    def pick(self, movie_ids, year):
+        """
+        Return the movie released in year, falling
+        back to the first listed when none matches.
+        """
+
+        for movie_id in movie_ids:
+            if self.years[movie_id] == year:
+                return movie_id
+        return movie_ids[0]
+
+    def candidates(self, key):
+        """
+        Return the names sharing the most trigrams
+        with key, at most MAX_CANDIDATES of them.
+        """
+
+        counts = Counter()
+        for gram in trigrams(key):
+            counts.update(self.trigram_index.get(gram, ()))
+        return [name for name, _ in counts.most_common(MAX_CANDIDATES)]
+
+    def resolve(self, title, max_distance=MAX_EDIT_DISTANCE):
+        """
+        Return the movie id best matching title, or None.
+        Exact normalised names win; otherwise the closest
+        candidate within max_distance edits (scaled down
+        for short titles) is used.
+        """
+
+        name, year = parse_title(title)
+        key = normalize_title(name)
+
+        if key in self.names:
+            return self.pick(self.names[key], year)
+
+        limit = min(max_distance, len(key) // 4)
+        best, best_distance = None, limit + 1
+        for candidate in self.candidates(key):
+            distance = edit_distance(key, candidate, limit)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        return None if best is None else self.pick(self.names[best], year)
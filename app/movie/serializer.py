@@ -27,6 +27,20 @@ class MovieDetailSerializer(MovieSerializer):
         read_only_fields = ("id",)
 
 
+class SimilarMovieSerializer(MovieSerializer):
+    """
+    Serialize a neighbouring movie with its similarity score
+    """
+
+    score = serializers.SerializerMethodField()
+
+    class Meta(MovieSerializer.Meta):
+        fields = MovieSerializer.Meta.fields + ("score",)
+
+    def get_score(self, obj):
+        return self.context["scores"].get(obj.movie_id)
+
+
 class UserCollectionSerializer(serializers.ModelSerializer):
     """
     Serializer for user collection objects
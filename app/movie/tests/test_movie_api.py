@@ -3,12 +3,16 @@ This Module contains the test
 cases for the movie api
 """
 
+from unittest.mock import patch
+import pandas as pd
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from core.models import Movie
+from core.recommender import RecommenderSystem
+from core.similarity import ContentSimilarityIndex
 from movie.serializer import (
     MovieSerializer,
     MovieDetailSerializer,
@@ -25,6 +29,17 @@ def detail_url(movie_id):
     return reverse("movie:movie-detail", args=[movie_id])
 
 
+def similar_url(movie_id):
+    """
+    Return similar movies URL.
+    """
+
+    return reverse("movie:movie-similar", args=[movie_id])
+
+
+SIMILAR_TO_MANY_URL = reverse("movie:movie-similar-to-many")
+
+
 def create_movie(user, **params):
     """
     Helper function to create a new movie.
@@ -271,3 +286,109 @@ class privateMovieApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertTrue("next" in res.data or "previous" in res.data)
         self.assertTrue(len(res.data["results"]) <= 10)
+
+    @patch("movie.views.registry")
+    def test_similar_movies(self, patched_registry):
+        """
+        Test listing the nearest neighbours of a movie
+        from the content index.
+        """
+
+        create_movie(user=self.user, movie_id=1, title="Toy Story", genres="Animation|Comedy")
+        create_movie(user=self.user, movie_id=2, title="Shrek", genres="Animation|Comedy")
+        create_movie(user=self.user, movie_id=3, title="Heat", genres="Crime|Thriller")
+        movies = pd.DataFrame(Movie.objects.values("movie_id", "genres"))
+
+        recommender = RecommenderSystem()
+        recommender.content_index = ContentSimilarityIndex.build(movies, k=2, n_jobs=1)
+        patched_registry.get_recommender.return_value = recommender
+
+        res = self.client.get(similar_url(1), {"top_n": 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["source"], "content")
+        self.assertEqual([movie["title"] for movie in res.data["results"]], ["Shrek"])
+        self.assertAlmostEqual(res.data["results"][0]["score"], 1.0, places=5)
+
+    @patch("movie.views.registry")
+    def test_similar_movies_of_another_users_movie(self, patched_registry):
+        """
+        Test that similar movies are served for catalog
+        movies the requesting user does not own.
+        """
+
+        owner = get_user_model().objects.create_user(
+            email="owner@example.com", password="testpass123"
+        )
+        create_movie(user=owner, movie_id=1, title="Toy Story", genres="Animation|Comedy")
+        create_movie(user=owner, movie_id=2, title="Shrek", genres="Animation|Comedy")
+        create_movie(user=owner, movie_id=3, title="Heat", genres="Crime|Thriller")
+        movies = pd.DataFrame(Movie.objects.values("movie_id", "genres"))
+
+        recommender = RecommenderSystem()
+        recommender.content_index = ContentSimilarityIndex.build(movies, k=2, n_jobs=1)
+        patched_registry.get_recommender.return_value = recommender
+
+        res = self.client.get(similar_url(1), {"top_n": 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([movie["title"] for movie in res.data["results"]], ["Shrek"])
+        self.assertEqual(self.client.get(similar_url(99)).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_similar_movies_invalid_source(self):
+        """
+        Test that an unknown similarity source is rejected.
+        """
+
+        movie = create_movie(user=self.user)
+        res = self.client.get(similar_url(movie.movie_id), {"source": "random"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for top_n in (0, -3, 51):
+            res = self.client.get(similar_url(movie.movie_id), {"top_n": top_n})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch("movie.views.registry")
+    def test_similar_to_many_movies(self, patched_registry):
+        """
+        Test one ranked list for several seed
+        movies, without the seeds themselves.
+        """
+
+        create_movie(user=self.user, movie_id=1, title="Toy Story", genres="Animation|Comedy")
+        create_movie(user=self.user, movie_id=2, title="Shrek", genres="Animation|Comedy")
+        create_movie(user=self.user, movie_id=3, title="Heat", genres="Crime|Thriller")
+        create_movie(user=self.user, movie_id=4, title="Ronin", genres="Crime|Thriller")
+        movies = pd.DataFrame(Movie.objects.values("movie_id", "genres"))
+
+        recommender = RecommenderSystem()
+        recommender.content_index = ContentSimilarityIndex.build(movies, k=3, n_jobs=1)
+        patched_registry.get_recommender.return_value = recommender
+
+        res = self.client.get(SIMILAR_TO_MANY_URL, {"movie_ids": "1,3", "top_n": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["movie_ids"], [1, 3])
+        self.assertEqual(
+            sorted(movie["title"] for movie in res.data["results"]), ["Ronin", "Shrek"]
+        )
+
+    def test_similar_to_many_requires_movie_ids(self):
+        """
+        Test that seed movie ids must be integers.
+        """
+
+        res = self.client.get(SIMILAR_TO_MANY_URL, {"movie_ids": "1,x"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch("movie.views.registry")
+    def test_similar_to_many_rejects_out_of_range_ids(self, patched_registry):
+        """
+        Test that seed ids outside the movie_id range are
+        rejected before they reach the similarity index.
+        """
+
+        for movie_ids in ("1,99999999999999999999", "2147483648", "0", "-1"):
+            res = self.client.get(SIMILAR_TO_MANY_URL, {"movie_ids": movie_ids})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        patched_registry.get_recommender.assert_not_called()
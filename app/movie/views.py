@@ -2,15 +2,26 @@
 Views for the movies app.
 """
 
+from django.shortcuts import get_object_or_404
 from rest_framework import filters
 from rest_framework import viewsets, mixins
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from core.genres import filter_genres
 from core.models import Movie
+from core.registry import registry
 from movie import serializer
 
+SIMILAR_SOURCES = ("content", "collaborative", "blended", "genre")
+MAX_SIMILAR = 50
+MAX_SEEDS = 500
+# Movie.movie_id is a 32-bit IntegerField
+MAX_MOVIE_ID = 2**31 - 1
+
 
 class MoviePagination(PageNumberPagination):
     page_size = 10
@@ -47,7 +58,7 @@ class MovieViewSet(
         queryset = self.queryset.filter(user=self.request.user).order_by("-movie_id")
 
         if genre:
-            queryset = queryset.filter(genres__regex=rf"(^|[|]){genre}([|]|$)")
+            queryset = filter_genres(queryset, genre)
 
         return queryset
 
@@ -58,6 +69,8 @@ class MovieViewSet(
 
         if self.action == "retrieve":
             return serializer.MovieSerializer
+        if self.action in ("similar", "similar_to_many"):
+            return serializer.SimilarMovieSerializer
         return self.serializer_class
 
     def perform_create(self, serializer):
@@ -87,3 +100,115 @@ class MovieViewSet(
         if instance.user != request.user:
             raise PermissionDenied("You do not have permission to edit this movie.")
         return super().partial_update(request, *args, **kwargs)
+
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None):
+        """
+        Return the movies most similar to this one from the
+        persisted neighbour index: ?source=content (default),
+        collaborative, blended or genre, and ?top_n (default 10).
+        The seed, like its neighbours, is looked up in the
+        whole shared catalog, not only the user's movies.
+        """
+
+        movie = get_object_or_404(Movie, pk=pk)
+        source = request.query_params.get("source", "content")
+        if source not in SIMILAR_SOURCES:
+            raise ValidationError({"source": f"Must be one of {', '.join(SIMILAR_SOURCES)}."})
+        top_n = self.get_top_n()
+
+        recommender = self.get_recommender()
+        if isinstance(recommender, Response):
+            return recommender
+
+        try:
+            movie_ids, scores = recommender.similar_movies(movie.movie_id, top_n, source)
+        except ValueError as e:
+            raise ValidationError({"source": str(e)})
+
+        return Response(
+            {
+                "movie_id": movie.movie_id,
+                "source": source,
+                "model_version": recommender.model_version,
+                "results": self.scored_movies(movie_ids, scores),
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="similar")
+    def similar_to_many(self, request):
+        """
+        Return one ranked list of the movies most similar to
+        several seed movies, ?movie_ids=1,2,3, from the
+        content neighbour index. Seeds are left out.
+        """
+
+        try:
+            seeds = [
+                int(movie_id)
+                for movie_id in request.query_params.get("movie_ids", "").split(",")
+                if movie_id.strip()
+            ]
+        except ValueError:
+            raise ValidationError({"movie_ids": "Must be a comma separated list of integers."})
+        if not all(1 <= seed <= MAX_MOVIE_ID for seed in seeds):
+            raise ValidationError({"movie_ids": f"Movie ids must be between 1 and {MAX_MOVIE_ID}."})
+        if not 1 <= len(seeds) <= MAX_SEEDS:
+            raise ValidationError({"movie_ids": f"Give between 1 and {MAX_SEEDS} movie ids."})
+        top_n = self.get_top_n()
+
+        recommender = self.get_recommender()
+        if isinstance(recommender, Response):
+            return recommender
+
+        try:
+            movie_ids, scores = recommender.content_recommendations(seeds, top_n)
+        except ValueError as e:
+            raise ValidationError({"movie_ids": str(e)})
+
+        return Response(
+            {
+                "movie_ids": seeds,
+                "source": "content",
+                "model_version": recommender.model_version,
+                "results": self.scored_movies(movie_ids, scores),
+            }
+        )
+
+    def get_top_n(self):
+        """
+        Return the requested number of similar movies.
+        """
+
+        try:
+            top_n = int(self.request.query_params.get("top_n", 10))
+        except ValueError:
+            raise ValidationError({"top_n": "Must be an integer."})
+        if not 1 <= top_n <= MAX_SIMILAR:
+            raise ValidationError({"top_n": f"Must be between 1 and {MAX_SIMILAR}."})
+        return top_n
+
+    def get_recommender(self):
+        """
+        Return the shared recommender, or an error
+        response when no trained model is published.
+        """
+
+        try:
+            return registry.get_recommender()
+        except FileNotFoundError as e:
+            return Response(
+                {"error": f"An error occurred loading the trained models: {str(e)}"},
+                status=500,
+            )
+
+    def scored_movies(self, movie_ids, scores):
+        """
+        Serialize ranked movie ids with their scores.
+        """
+
+        scores = dict(zip(movie_ids.tolist(), scores.tolist()))
+        movies = Movie.objects.in_bulk(list(scores))
+        neighbors = [movies[movie_id] for movie_id in scores if movie_id in movies]
+        context = {**self.get_serializer_context(), "scores": scores}
+        return self.get_serializer(neighbors, many=True, context=context).data
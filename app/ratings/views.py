@@ -7,6 +7,7 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
+from core.foldin import mark_ratings_changed
 from core.models import Ratings
 from ratings import serializer
 
@@ -60,6 +61,23 @@ class RatingViewSet(
         """
 
         serializer.save(user=self.request.user)
+        mark_ratings_changed(self.request.user.id)
+
+    def perform_update(self, serializer):
+        """
+        Update a rating and refresh the user's vector.
+        """
+
+        serializer.save()
+        mark_ratings_changed(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        """
+        Delete a rating and refresh the user's vector.
+        """
+
+        instance.delete()
+        mark_ratings_changed(self.request.user.id)
 
     def update(self, request, *args, **kwargs):
         """
@@ -0,0 +1,27 @@
+"""
+This module contains recommendation serializers.
+"""
+
+from rest_framework import serializers
+
+
+class RecommendedMovieSerializer(serializers.Serializer):
+    """
+    Serializer for one recommended movie
+    """
+
+    movie_id = serializers.IntegerField()
+    title = serializers.CharField(allow_null=True)
+    score = serializers.FloatField(allow_null=True)
+
+
+class RecommendationsSerializer(serializers.Serializer):
+    """
+    Serializer for a user's recommendations, the stage
+    that produced them and the time spent per stage
+    """
+
+    source = serializers.ChoiceField(choices=["precomputed", "live", "item", "popular"])
+    model_version = serializers.CharField(allow_null=True)
+    recommendations = RecommendedMovieSerializer(many=True)
+    timing_ms = serializers.DictField(child=serializers.FloatField())
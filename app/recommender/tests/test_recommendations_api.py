@@ -0,0 +1,201 @@
+"""
+This module tests the recommendations API.
+"""
+
+from unittest.mock import MagicMock, patch
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.itemmodel import ItemModel
+from core.models import Movie, Ratings, UserRecommendation
+from core.recommender import RecommenderSystem
+
+
+RECOMMENDATIONS_URL = reverse("recommender:recommendations-list")
+
+
+def create_movie(user, **params):
+    """
+    Helper function to create a new movie.
+    """
+    defaults = {
+        "movie_id": 1,
+        "title": "Toy Story",
+        "genres": "Animation|Children's|Comedy",
+    }
+    defaults.update(params)
+    return Movie.objects.create(user=user, **defaults)
+
+
+def store_recommendations(user, movie_ids, scores, version="20240101000000"):
+    """
+    Helper function to store precomputed recommendations.
+    """
+    return UserRecommendation.objects.create(
+        user=user,
+        model_version=version,
+        movie_ids=np.array(movie_ids, dtype=np.int32).tobytes(),
+        scores=np.array(scores, dtype=np.float32).tobytes(),
+    )
+
+
+class PublicRecommendationApiTests(TestCase):
+    """
+    Test the public recommendations API.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """
+        Test that authentication is
+        required for recommendations.
+        """
+
+        res = self.client.get(RECOMMENDATIONS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateRecommendationApiTests(TestCase):
+    """
+    Test the private recommendations API.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="viewer@example.com", password="testpass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.movie1 = create_movie(user=self.user, movie_id=101, title="Toy Story")
+        self.movie2 = create_movie(user=self.user, movie_id=202, title="Jumanji")
+        self.movie3 = create_movie(user=self.user, movie_id=303, title="Heat")
+
+    def test_precomputed_recommendations(self):
+        """
+        Test that stored recommendations are returned
+        in order with their model version and timing.
+        """
+
+        store_recommendations(self.user, [202, 101], [4.5, 4.0])
+
+        res = self.client.get(RECOMMENDATIONS_URL, {"top_n": 5})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["source"], "precomputed")
+        self.assertEqual(res.data["model_version"], "20240101000000")
+        self.assertEqual(
+            [movie["title"] for movie in res.data["recommendations"]],
+            ["Jumanji", "Toy Story"],
+        )
+        self.assertIn("total", res.data["timing_ms"])
+
+    def test_precomputed_skips_movies_rated_before_store(self):
+        """
+        Test that a movie rated before the list was stored,
+        but after the snapshot it was computed from, is
+        dropped from the precomputed list.
+        """
+
+        Ratings.objects.create(user=self.user, movie=self.movie2, rating=5)
+        store_recommendations(self.user, [202, 101, 303], [4.5, 4.0, 3.5])
+
+        res = self.client.get(RECOMMENDATIONS_URL, {"top_n": 2})
+
+        self.assertEqual(res.data["source"], "precomputed")
+        self.assertEqual(
+            [movie["movie_id"] for movie in res.data["recommendations"]], [101, 303]
+        )
+
+    @patch("recommender.views.registry")
+    def test_stale_precomputed_falls_back_to_popular(self, patched_registry):
+        """
+        Test that a rating newer than the stored list skips
+        it, and without a trained model the most rated
+        unrated movies are returned.
+        """
+
+        patched_registry.get_recommender.side_effect = FileNotFoundError
+        store_recommendations(self.user, [202], [4.5])
+        other = get_user_model().objects.create_user(
+            email="other@example.com", password="testpass123"
+        )
+        Ratings.objects.create(user=other, movie=self.movie3, rating=4)
+        Ratings.objects.create(user=other, movie=self.movie2, rating=4)
+        Ratings.objects.create(user=self.user, movie=self.movie2, rating=5)
+
+        res = self.client.get(RECOMMENDATIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["source"], "popular")
+        self.assertEqual(
+            [movie["movie_id"] for movie in res.data["recommendations"]], [303]
+        )
+        self.assertIn("popular", res.data["timing_ms"])
+
+    @patch("recommender.views.registry")
+    def test_popular_excludes_ratings_newer_than_model(self, patched_registry):
+        """
+        Test that with a trained model the popular list
+        still skips movies rated after its snapshot.
+        """
+
+        patched_registry.get_recommender.return_value = MagicMock(
+            svd_model=None,
+            model_version="20240101000000",
+            popular_movie_ids=np.array([202, 303, 101], dtype=np.int64),
+        )
+        Ratings.objects.create(user=self.user, movie=self.movie2, rating=5)
+
+        res = self.client.get(RECOMMENDATIONS_URL)
+
+        self.assertEqual(res.data["source"], "popular")
+        self.assertEqual(res.data["model_version"], "20240101000000")
+        self.assertEqual(
+            [movie["movie_id"] for movie in res.data["recommendations"]], [303, 101]
+        )
+
+    @patch("recommender.views.registry")
+    def test_item_source_uses_current_ratings(self, patched_registry):
+        """
+        Test that source=item scores the item model from
+        the user's ratings in the database, rated excluded.
+        """
+
+        recommender = RecommenderSystem()
+        recommender.model_version = "20240101000000"
+        recommender.item_model = ItemModel(
+            [101, 202, 303],
+            np.array([[0, 0.2, 0.9], [0.2, 0, 0.1], [0.9, 0.1, 0]], dtype=np.float32),
+            "knn",
+        )
+        patched_registry.get_recommender.return_value = recommender
+        Ratings.objects.create(user=self.user, movie=self.movie1, rating=5)
+
+        res = self.client.get(RECOMMENDATIONS_URL, {"source": "item"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["source"], "item")
+        self.assertEqual(
+            [movie["movie_id"] for movie in res.data["recommendations"]], [303, 202]
+        )
+
+    def test_invalid_source(self):
+        """
+        Test that an unknown source is rejected.
+        """
+
+        res = self.client.get(RECOMMENDATIONS_URL, {"source": "magic"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_top_n(self):
+        """
+        Test that an out of range top_n is rejected.
+        """
+
+        res = self.client.get(RECOMMENDATIONS_URL, {"top_n": 0})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,16 @@
+"""
+Recommendation URL patterns.
+"""
+
+from django.urls import include, path
+from rest_framework.routers import SimpleRouter
+from recommender import views
+
+router = SimpleRouter()
+router.register("", views.RecommendationViewSet, basename="recommendations")
+
+app_name = "recommender"
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
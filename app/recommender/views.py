@@ -1,3 +1,246 @@
-from django.shortcuts import render
+"""
+This module contains the recommendation views.
+"""
 
-# Create your views here.
+import time
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count
+from rest_framework import viewsets
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.models import Movie, Ratings, UserRecommendation
+from core.registry import registry
+from core.scoring import factor_model_for
+from recommender import serializer
+
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 100
+POPULAR_KEY = "recommender:popular_movie_ids"
+POPULAR_TIMEOUT = 60 * 60
+POPULAR_CANDIDATES = 1000
+SOURCES = ("auto", "item")
+
+
+def most_rated_movie_ids():
+    """
+    Return the POPULAR_CANDIDATES most rated movie ids,
+    cached for POPULAR_TIMEOUT so the rating counts are
+    not aggregated on every request.
+    """
+
+    return cache.get_or_set(
+        POPULAR_KEY,
+        lambda: list(
+            Ratings.objects.values("movie_id")
+            .annotate(count=Count("id"))
+            .order_by("-count")
+            .values_list("movie_id", flat=True)[:POPULAR_CANDIDATES]
+        ),
+        POPULAR_TIMEOUT,
+    )
+
+
+def rated_movie_ids(user):
+    """
+    Return the ids of the movies a user has rated, read
+    from the database so ratings newer than any snapshot
+    or precomputed list are included.
+    """
+
+    return np.fromiter(
+        Ratings.objects.filter(user=user).values_list("movie_id", flat=True), dtype=np.int64
+    )
+
+
+def timed(timing, stage, func, *args):
+    """
+    Call func(*args) and record its duration
+    in milliseconds under timing[stage].
+    """
+
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        timing[stage] = round((time.perf_counter() - started) * 1000, 3)
+
+
+class RecommendationViewSet(viewsets.ViewSet):
+    """
+    Personalised top-N recommendations for the authenticated
+    user: precomputed when fresh, otherwise scored live,
+    otherwise the most rated movies. source=item scores
+    with the item-to-item model instead.
+    """
+
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    serializer_class = serializer.RecommendationsSerializer
+
+    def get_top_n(self):
+        """
+        Return the requested number of recommendations.
+        """
+
+        top_n = self.request.query_params.get("top_n", DEFAULT_TOP_N)
+        try:
+            top_n = int(top_n)
+        except (TypeError, ValueError):
+            raise ValidationError({"top_n": "Must be an integer."})
+        if not 1 <= top_n <= MAX_TOP_N:
+            raise ValidationError({"top_n": f"Must be between 1 and {MAX_TOP_N}."})
+        return top_n
+
+    def get_source(self):
+        """
+        Return the requested source: "auto" runs the
+        precomputed, live and popular stages in turn,
+        "item" scores with the item-to-item model.
+        """
+
+        source = self.request.query_params.get("source", "auto")
+        if source not in SOURCES:
+            raise ValidationError({"source": f"Must be one of {', '.join(SOURCES)}."})
+        return source
+
+    def get_recommender(self):
+        """
+        Return the shared recommender, or None
+        when no trained model is published.
+        """
+
+        try:
+            return registry.get_recommender()
+        except FileNotFoundError:
+            return None
+
+    def precomputed(self, user, top_n):
+        """
+        Return (movie_ids, scores, version) from the
+        precomputed store, or None when the user has
+        none or has rated movies since they were stored.
+        Movies rated after the snapshot the list was
+        computed from are dropped before slicing.
+        """
+
+        stored = UserRecommendation.objects.filter(user=user).first()
+        if stored is None:
+            return None
+        if Ratings.objects.filter(user=user, timestamp__gt=stored.updated_at).exists():
+            return None
+
+        movie_ids, scores = stored.get_movie_ids(), stored.get_scores()
+        keep = ~np.isin(movie_ids, rated_movie_ids(user))
+        return movie_ids[keep][:top_n], scores[keep][:top_n], stored.model_version
+
+    def live(self, recommender, user, top_n):
+        """
+        Return (movie_ids, scores, version) scored with the
+        collaborative model, or None for users it has no
+        vector for.
+        """
+
+        if recommender is None or recommender.svd_model is None:
+            return None
+
+        factor_model = factor_model_for(recommender.svd_model)
+        factors, bias, rated_movie_ids = recommender.user_vector(user.id, factor_model)
+        if factors is None:
+            return None
+
+        movie_ids, scores = factor_model.recommend(
+            user.id, exclude=rated_movie_ids, top_n=top_n, vector=(factors, bias)
+        )
+        return movie_ids, scores, recommender.model_version
+
+    def item(self, recommender, user, top_n):
+        """
+        Return (movie_ids, scores, version) from the item-to-item
+        model and the user's current ratings, or None without
+        an item model or ratings.
+        """
+
+        if recommender is None or recommender.item_model is None:
+            return None
+
+        movie_ids, scores = recommender.item_recommendations(user.id, top_n)
+        if not len(movie_ids):
+            return None
+        return movie_ids, scores, recommender.model_version
+
+    def popular(self, recommender, user, top_n):
+        """
+        Return (movie_ids, None, version) of the most rated
+        movies the user has not rated yet. Ratings saved
+        since the model snapshot are excluded too, as the
+        user's rated ids are read from the database.
+        """
+
+        rated = rated_movie_ids(user)
+        if recommender is None:
+            movie_ids, version = np.array(most_rated_movie_ids(), dtype=np.int64), None
+        else:
+            movie_ids, version = recommender.popular_movie_ids, recommender.model_version
+
+        movie_ids = movie_ids[: top_n + len(rated)]
+        movie_ids = movie_ids[~np.isin(movie_ids, rated)][:top_n]
+        return movie_ids, None, version
+
+    def list(self, request):
+        """
+        Return the user's recommendations with
+        the model version and per-stage timing.
+        """
+
+        top_n = self.get_top_n()
+        requested = self.get_source()
+        user = request.user
+        timing = {}
+        started = time.perf_counter()
+
+        if requested == "item":
+            recommender = timed(timing, "model", self.get_recommender)
+
+            source = "item"
+            result = timed(timing, "item", self.item, recommender, user, top_n)
+        else:
+            recommender = None
+
+            source = "precomputed"
+            result = timed(timing, "precomputed", self.precomputed, user, top_n)
+            if result is None:
+                recommender = timed(timing, "model", self.get_recommender)
+
+                source = "live"
+                result = timed(timing, "live", self.live, recommender, user, top_n)
+
+        if result is None:
+            source = "popular"
+            result = timed(timing, "popular", self.popular, recommender, user, top_n)
+
+        movie_ids, scores, version = result
+        movies = timed(
+            timing, "titles", Movie.objects.in_bulk, [int(movie_id) for movie_id in movie_ids]
+        )
+        timing["total"] = round((time.perf_counter() - started) * 1000, 3)
+
+        recommendations = [
+            {
+                "movie_id": int(movie_id),
+                "title": movies[movie_id].title if movie_id in movies else None,
+                "score": None if scores is None else float(scores[rank]),
+            }
+            for rank, movie_id in enumerate(movie_ids.tolist())
+        ]
+        data = self.serializer_class(
+            {
+                "source": source,
+                "model_version": version,
+                "recommendations": recommendations,
+                "timing_ms": timing,
+            }
+        ).data
+        return Response(data)
@@ -10,6 +10,7 @@ from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.http import Http404, JsonResponse
 from django.shortcuts import redirect, render
 import requests
+from core.genres import filter_genres
 from core.models import Movie
 from .forms import UserRegistrationForm, LoginForm
 from django.contrib.auth import authenticate, login
@@ -136,9 +137,8 @@ def movies_by_genre(request, genre):
     or render HTML for a specific genre.
     """
 
-    movies = Movie.objects.filter(
-        genres__icontains=genre,  # Case-insensitive search
-        poster_url__isnull=False,
+    movies = filter_genres(
+        Movie.objects.filter(poster_url__isnull=False), genre
     ).order_by("-created_at")[
         :8
     ]  # Limit to 8 movies
@@ -172,9 +172,8 @@ def genre_movies_full_page(request, genre):
     """
     Fetch all movies by genre for a full-page display with pagination.
     """
-    movies = Movie.objects.filter(
-        genres__icontains=genre,
-        poster_url__isnull=False,
+    movies = filter_genres(
+        Movie.objects.filter(poster_url__isnull=False), genre
     ).order_by("-created_at")
 
     # Handle JSON requests for API
@@ -1,12 +1,14 @@
 import os
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from surprise import Dataset, Reader, SVD
 from surprise.model_selection import train_test_split
 import matplotlib.pyplot as plt
 from surprise import accuracy
-import pickle
+from core.genres import GenreIndex
+from core.interactions import InteractionMatrix
+from core.scoring import FactorModel, factor_model_for
+from core.similarity import ContentSimilarityIndex
+from core.titles import TitleResolver
 
 plt.style.use("dark_background")
 
@@ -23,6 +25,12 @@ class RecommenderSystem:
         self.model_path = model_path
         self.movies = self.load_movies()
         self.ratings = self.load_ratings()
+        self.title_resolver = None
+        self.genre_index = None
+        if not self.movies.empty:
+            self.title_resolver = TitleResolver.from_movies(self.movies)
+            self.genre_index = GenreIndex.from_movies(self.movies)
+        self.rated_index = None
         self.svd_model = None
         os.makedirs(self.model_path, exist_ok=True)
 
@@ -63,31 +71,13 @@ class RecommenderSystem:
             raise ValueError("Genres column contains no valid data.")
 
         # Validate input movie title
-        matched_movies = self.movies[
-            self.movies["title"].str.contains(movie_title, na=False, case=False)
-        ]
-        if matched_movies.empty or len(matched_movies) > 1:
-            raise ValueError(
-                f"Movie title '{movie_title}' not uniquely matched or not found."
-            )
-        idx = matched_movies.index[0]
-
-        # Create TF-IDF matrix
-        tfidf = TfidfVectorizer(stop_words="english")
-        tfidf_matrix = tfidf.fit_transform(self.movies["genres"].fillna(""))
-        if tfidf_matrix.shape[0] == 0:
-            raise ValueError("TF-IDF matrix is empty; cannot compute recommendations.")
-
-        # Compute cosine similarity
-        cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
-
-        # Get similarity scores for all movies
-        sim_scores = list(enumerate(cosine_sim[idx]))
-        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-
-        # Get top-n recommendations
-        movie_indices = [i[0] for i in sim_scores[1 : top_n + 1]]  # noqa: E203
-        return self.movies["title"].iloc[movie_indices]
+        movie_id = self.title_resolver.resolve(movie_title)
+        if movie_id is None:
+            raise ValueError(f"Movie title '{movie_title}' not found.")
+
+        # Genre Jaccard over the bitmask of every movie
+        movie_ids, _ = self.genre_index.similar(movie_id, top_n=top_n)
+        return self.movies.set_index("movie_id")["title"].reindex(movie_ids)
 
     def collaborative_filtering(self):
         """
@@ -119,23 +109,19 @@ class RecommenderSystem:
         user using collaborative filtering.
         """
 
-        all_movie_ids = self.ratings["movie_id"].unique()
-        rated_movie_ids = self.ratings[self.ratings["user_id"] == user_id]["movie_id"]
-        movies_not_rated = set(all_movie_ids) - set(rated_movie_ids)
-
-        predictions = [
-            (movie_id, svd_model.predict(user_id, movie_id).est)
-            for movie_id in movies_not_rated
-        ]
+        # O(1) slice of the user's row in the CSR index
+        if self.rated_index is None:
+            self.rated_index = InteractionMatrix.from_dataframe(self.ratings)
+        rated_movie_ids = self.rated_index.rated_items(user_id)
 
-        # Sort movies by predicted rating and select the top recommendations
-        predictions.sort(key=lambda x: x[1], reverse=True)
-        recommended_movie_ids = [movie_id for movie_id, _ in predictions[:top_n]]
+        # Score every movie with one matrix-vector product
+        factor_model = factor_model_for(svd_model)
+        recommended_movie_ids, _ = factor_model.recommend(
+            user_id, exclude=rated_movie_ids, top_n=top_n
+        )
 
-        recommended_movies = self.movies[
-            self.movies["movie_id"].isin(recommended_movie_ids)
-        ]
-        return recommended_movies["title"].tolist()
+        titles = self.movies.set_index("movie_id")["title"]
+        return titles.reindex(recommended_movie_ids).tolist()
 
     def evaluate_content_filtering(self, sample_movies, top_n=10):
         results = {}
@@ -166,22 +152,18 @@ class RecommenderSystem:
 
     def save_models(self):
         """
-        Save the trained models to disk.
+        Save the trained models to disk as
+        memory-mappable model artifacts.
         """
 
-        content_model_path = os.path.join(self.model_path, "content_based_model.pkl")
+        content_model_path = os.path.join(self.model_path, "content_index")
+        collaborative_model_path = os.path.join(self.model_path, "collaborative_model")
 
-        collaborative_model_path = os.path.join(
-            self.model_path, "collaborative_model.pkl"
-        )
-
-        # Save content-based filtering model (e.g., TF-IDF matrix or similar)
-        with open(content_model_path, "wb") as f:
-            pickle.dump(self, f)
+        # Save content-based filtering model (top-K similarity index)
+        ContentSimilarityIndex.build(self.movies).save(content_model_path)
 
-        # Save collaborative filtering model
-        with open(collaborative_model_path, "wb") as f:
-            pickle.dump(self.svd_model, f)
+        # Save collaborative filtering model (latent factors only)
+        factor_model_for(self.svd_model).save(collaborative_model_path)
 
         print(f"Models saved at {self.model_path}")
 
@@ -190,18 +172,14 @@ class RecommenderSystem:
         Load the trained models from disk.
         """
         # Paths for loading models
-        content_model_path = os.path.join(self.model_path, "content_based_model.pkl")
-        collaborative_model_path = os.path.join(
-            self.model_path, "collaborative_model.pkl"
-        )
+        content_model_path = os.path.join(self.model_path, "content_index")
+        collaborative_model_path = os.path.join(self.model_path, "collaborative_model")
 
         # Load content-based model
-        with open(content_model_path, "rb") as f:
-            content_based_model = pickle.load(f)
+        content_based_model = ContentSimilarityIndex.load(content_model_path)
 
         # Load collaborative filtering model
-        with open(collaborative_model_path, "rb") as f:
-            self.svd_model = pickle.load(f)
+        self.svd_model = FactorModel.load(collaborative_model_path)
 
         print("Models loaded successfully.")
         return content_based_model, self.svd_model
@@ -11,6 +11,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.authtoken.models import Token
+from core.foldin import mark_ratings_changed
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -20,6 +21,15 @@ class CreateUserView(generics.CreateAPIView):
 
     serializer_class = UserSerializer
 
+    def perform_create(self, serializer):
+        """
+        Create the user and flag them for fold-in,
+        so they get recommendations before retraining.
+        """
+
+        user = serializer.save()
+        mark_ratings_changed(user.id)
+
 
 class CreateTokenView(ObtainAuthToken):
     """